@@ -56,13 +56,18 @@ export default function Dashboard() {
     loadData();
   }, []);
 
+  // One round trip for all four dashboard panels
   const fetchAllData = async () => {
-    await Promise.all([
-      fetchDashboard(),
-      fetchHealthScore(),
-      fetchIncidentSummary(),
-      fetchRecentIncidents(),
-    ]);
+    try {
+      const res = await api.get("/api/dashboard-bundle/?days=7");
+      setSummary(res.data.dashboard_data);
+      setHealthScore(res.data.health_score);
+      setIncidentSummary(formatIncidentSummary(res.data.incident_summary));
+      setRecentIncidents(Array.isArray(res.data.recent_incidents) ? res.data.recent_incidents : []);
+    } catch (err) {
+      console.error("Dashboard fetch error", err);
+      setRecentIncidents([]);
+    }
   };
   
 
@@ -99,49 +104,21 @@ export default function Dashboard() {
 
   const isNoDB = !summary || !summary.data_overview || Object.keys(summary.data_overview).length === 0;
 
-  const fetchDashboard = async () => {
-    try {
-      const res = await api.get("/api/dashboard-data/");
-      setSummary(res.data);
-      
-      
-    } catch (err) {
-      console.error("Dashboard fetch error", err);
-    }
-  };
-
-  const fetchHealthScore = async () => {
-    try {
-      const res = await api.get("/api/health-score/");
-      setHealthScore(res.data);
-    } catch (err) {
-      console.error("Health fetch error", err);
-    }
-  };
+  const formatIncidentSummary = (data) =>
+    Object.entries(data || {}).map(([type, count]) => ({
+      type: normalize(type),
+      count,
+    }));
 
   const fetchIncidentSummary = async () => {
     try {
       const res = await api.get("/api/incident-summary/");
-      const formatted = Object.entries(res.data).map(([type, count]) => ({
-        type: normalize(type),
-        count,
-      }));
-      setIncidentSummary(formatted);
+      setIncidentSummary(formatIncidentSummary(res.data));
     } catch (err) {
       console.error("Summary fetch error", err);
     }
   };
 
-  const fetchRecentIncidents = async () => {
-    try {
-      const res = await api.get("/api/recent-incidents/?days=7");
-      setRecentIncidents(Array.isArray(res.data) ? res.data : []);
-    } catch (err) {
-      console.error("Incidents fetch error", err);
-      setRecentIncidents([]);
-    }
-  };
-
   const getCount = (type) => {
     const found = incidentSummary.find((entry) => normalize(entry.type) === normalize(type));
     return found?.count || 0;
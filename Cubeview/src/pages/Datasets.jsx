@@ -7,11 +7,31 @@ import { Link } from "react-router-dom";
 
 const Datasets = () => {
   const [tables, setTables] = useState([]);
+  const [query, setQuery] = useState("");
+  const [searchResults, setSearchResults] = useState([]);
 
   useEffect(() => {
     fetchTables();
   }, []);
 
+  // Server-side catalog search over tables, columns, tags and docs
+  useEffect(() => {
+    if (!query.trim()) {
+      setSearchResults([]);
+      return;
+    }
+    const timeout = setTimeout(async () => {
+      try {
+        const res = await api.get("/api/search/", { params: { q: query } });
+        setSearchResults(res.data?.results || []);
+      } catch (err) {
+        console.error("❌ Search failed", err);
+        setSearchResults([]);
+      }
+    }, 250);
+    return () => clearTimeout(timeout);
+  }, [query]);
+
   const fetchTables = async () => {
     try {
       const res = await api.get("/api/user-tables/");
@@ -25,7 +45,36 @@ const Datasets = () => {
   return (
     <div className="p-6">
       <h1 className="text-2xl font-semibold mb-4">Connected Tables</h1>
-      {tables.length === 0 ? (
+      <input
+        type="text"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        placeholder="Search tables, columns, tags and docs..."
+        className="w-full mb-4 px-3 py-2 border rounded-md text-sm"
+      />
+      {query.trim() ? (
+        searchResults.length === 0 ? (
+          <p className="text-gray-500">No matches.</p>
+        ) : (
+          <div className="space-y-2">
+            {searchResults.map((hit) => (
+              <Link key={`${hit.kind}-${hit.column_id || hit.table_id}`} to={`/table/${hit.table_id}`}>
+                <Card>
+                  <CardContent className="p-3">
+                    <p className="font-medium">
+                      {hit.kind === "column" ? `${hit.table}.${hit.name}` : hit.name}
+                    </p>
+                    <p className="text-xs text-gray-500">
+                      {hit.kind === "column" ? `Column · ${hit.data_type}` : "Table"}
+                      {hit.tags ? ` · ${hit.tags}` : ""}
+                    </p>
+                  </CardContent>
+                </Card>
+              </Link>
+            ))}
+          </div>
+        )
+      ) : tables.length === 0 ? (
         <p className="text-gray-500">No tables found.</p>
       ) : (
         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4">
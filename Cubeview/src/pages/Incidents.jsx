@@ -22,9 +22,12 @@ const Incidents = () => {
   const [loading, setLoading] = useState(true);
   const [summary, setSummary] = useState({ total: 0, resolved: 0, ongoing: 0 });
 
-  // Pagination
+  // Cursor pagination: the API hands back opaque next/previous cursors
   const [page, setPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
+  const [cursor, setCursor] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [prevCursor, setPrevCursor] = useState(null);
   const pageSize = 10;
 
   const navigate = useNavigate();
@@ -48,13 +51,19 @@ const Incidents = () => {
     };
   }, []);
 
+  // New filters start again from the first page
+  useEffect(() => {
+    setCursor(null);
+    setPage(1);
+  }, [filters]);
+
   // Fetch incidents when filters or page changes
   useEffect(() => {
     const timeout = setTimeout(() => {
       fetchIncidents();
     }, 200);
     return () => clearTimeout(timeout);
-  }, [filters, page]);
+  }, [filters, cursor]);
 
   const fetchIncidents = async () => {
     setLoading(true);
@@ -63,19 +72,26 @@ const Incidents = () => {
       if (filters.status) params.append("status", filters.status);
       if (filters.table) params.append("table", filters.table);
       if (filters.type) params.append("type", filters.type);
-      params.append("page", page);
+      if (cursor) params.append("cursor", cursor);
       params.append("page_size", pageSize);
 
       const res = await api.get(`/api/incidents/?${params.toString()}`);
       const results = res.data?.results || [];
-      const count = res.data?.count || results.length;
-
       setIncidents(results);
-      setTotalPages(Math.max(1, Math.ceil(count / pageSize)));
+      setNextCursor(res.data?.next_cursor || null);
+      setPrevCursor(res.data?.previous_cursor || null);
 
       const resolved = results.filter((i) => i.status === "resolved").length;
       const ongoing = results.filter((i) => i.status === "ongoing").length;
-      setSummary({ total: count, resolved, ongoing });
+
+      // The total is only counted on the first page; keep it while paging
+      const count = res.data?.count;
+      if (count !== null && count !== undefined) {
+        setTotalPages(Math.max(1, Math.ceil(count / pageSize)));
+        setSummary({ total: count, resolved, ongoing });
+      } else {
+        setSummary((prev) => ({ ...prev, resolved, ongoing }));
+      }
     } catch (err) {
       console.error("Failed to fetch incidents", err);
       setIncidents([]);
@@ -269,15 +285,21 @@ const Incidents = () => {
           {/* Pagination controls */}
           <div className="flex justify-center gap-4 mt-6">
             <Button
-              onClick={() => setPage((prev) => Math.max(prev - 1, 1))}
-              disabled={page === 1} className='bg-blue-500 hover:bg-blue-600'
+              onClick={() => {
+                setCursor(prevCursor);
+                setPage((prev) => Math.max(prev - 1, 1));
+              }}
+              disabled={!prevCursor} className='bg-blue-500 hover:bg-blue-600'
             >
               Previous
             </Button>
             <span>Page {page} of {totalPages}</span>
             <Button
-              onClick={() => setPage((prev) => Math.min(prev + 1, totalPages))}
-              disabled={page === totalPages} className='bg-blue-500 hover:bg-blue-600'
+              onClick={() => {
+                setCursor(nextCursor);
+                setPage((prev) => Math.min(prev + 1, totalPages));
+              }}
+              disabled={!nextCursor} className='bg-blue-500 hover:bg-blue-600'
             >
               Next
             </Button>
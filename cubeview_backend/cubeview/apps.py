@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+
+
+def _ensure_search_extension(sender, using, **kwargs):
+    from .utils.catalog_search import ensure_search_extension
+    ensure_search_extension(using)
 
 
 class CubeviewConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cubeview'
+
+    def ready(self):
+        # The catalog search trigram index needs pg_trgm before its migration runs
+        pre_migrate.connect(_ensure_search_extension, sender=self)
+
+        # Resolve report model/field discovery once, not on every request
+        from .utils.reports import get_report_plan
+        get_report_plan()
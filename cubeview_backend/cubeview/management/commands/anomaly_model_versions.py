@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+# cubeview/management/commands/anomaly_model_versions.py
+from cubeview.ml import registry
+
+
+class Command(BaseCommand):
+    help = "List anomaly model versions or switch the active one"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--activate", type=str, help="Version to make active, e.g. v0003")
+
+    def handle(self, *args, **options):
+        if options["activate"]:
+            try:
+                registry.activate(options["activate"])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"✅ {options['activate']} is now active."))
+            return
+
+        active = registry.active_version()
+        versions = registry.list_versions()
+        if not versions:
+            self.stdout.write(self.style.WARNING("⚠️ No model versions published yet."))
+            return
+
+        for version in versions:
+            training = registry.read_metadata(version).get("training", {})
+            marker = "*" if version == active else " "
+            offline = "" if registry.is_servable(version) else "  (offline only)"
+            self.stdout.write(
+                f"{marker} {version}  trained {training.get('trained_at', '?')}  "
+                f"on {training.get('n_samples', '?')} tables{offline}"
+            )
@@ -0,0 +1,67 @@
+import timeit
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+# cubeview/management/commands/benchmark_serialization.py
+from cubeview.models import DataTable, Incident
+from cubeview.serializers import IncidentSerializer
+from cubeview.utils.fast_serialize import INCIDENT_FIELDS, FastJSONRenderer, orjson
+
+
+def sample_rows(n):
+    """n in-memory incidents, and the same rows as the tuples `.values_list()` would yield."""
+    table = DataTable(id=1, name="orders")
+    start = timezone.now()
+    incidents = [
+        Incident(
+            id=i,
+            title=f"Volume drop #{i}",
+            description="Row count fell below the expected range.",
+            incident_type="volume",
+            severity="medium",
+            status="ongoing" if i % 3 else "resolved",
+            created_at=start - timedelta(minutes=i),
+            resolved_at=None if i % 3 else start,
+            related_table=table,
+        )
+        for i in range(n)
+    ]
+    tuples = [
+        tuple(
+            table.id if path == "related_table_id"
+            else table.name if path == "related_table__name"
+            else getattr(incident, path)
+            for path in INCIDENT_FIELDS.paths
+        )
+        for incident in incidents
+    ]
+    return incidents, tuples
+
+
+class Command(BaseCommand):
+    help = "Compare incident serialization overhead: ModelSerializer + DRF JSON vs FieldMap tuples + FastJSONRenderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        incidents, tuples = sample_rows(rows)
+        drf, fast = JSONRenderer(), FastJSONRenderer()
+
+        cases = [
+            ("ModelSerializer + JSONRenderer", lambda: drf.render(IncidentSerializer(incidents, many=True).data)),
+            ("FieldMap + JSONRenderer", lambda: drf.render(INCIDENT_FIELDS.rows(tuples))),
+            ("FieldMap + FastJSONRenderer", lambda: fast.render(INCIDENT_FIELDS.rows(tuples))),
+        ]
+
+        self.stdout.write(f"📊 {rows} rows, best of {repeat} (orjson {'on' if orjson else 'not installed'})")
+        baseline = None
+        for label, run in cases:
+            best = min(timeit.repeat(run, number=1, repeat=repeat))
+            per_10k = best * 10000 / rows * 1000
+            baseline = baseline or per_10k
+            self.stdout.write(f"  {label:<34} {per_10k:8.1f} ms / 10k rows  ({baseline / per_10k:.1f}x)")
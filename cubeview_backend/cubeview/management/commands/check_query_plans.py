@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+# cubeview/management/commands/check_query_plans.py
+from cubeview.models import DataQualityCheck, DataTable, Incident, MetricHistory
+from cubeview.utils import rollups
+from cubeview.utils.fast_serialize import INCIDENT_LIST_FIELDS
+from cubeview.utils.pagination import KeysetPagination
+from cubeview.views import filter_incidents, recent_incidents_queryset, start_of_day
+
+ROLLUP_INDEXES = ["rollup_table_source_bucket", "rollup_unique_bucket"]
+INCIDENT_TIME_INDEXES = ["incident_table_created_id", "incident_created_id"]
+CHECK_TIME_INDEXES = ["check_table_run", "check_table_type_run"]
+
+
+def hot_queries(table):
+    """
+    (label, queryset, acceptable index names) for the dashboard, trend and
+    check-run paths. The endpoint queries come from the same helpers the
+    views call, so the plans are the ones those endpoints get.
+    """
+    user = table.user
+    since = start_of_day(timezone.now().date() - timedelta(days=7))
+    incident_rolled, incident_raw = rollups.incident_trend_queries(user, since)
+    tables = DataTable.objects.filter(user=user, connection=table.connection)
+    check_rolled, check_raw = rollups.health_score_trend_queries(tables, since)
+
+    paginator = KeysetPagination()
+    incidents = INCIDENT_LIST_FIELDS.values(filter_incidents(user, {}))
+    first_page, _ = paginator.page_queryset(incidents, None, paginator.page_size)
+    cursor = paginator.encode_cursor({"created_at": timezone.now(), "id": 2 ** 31})
+    next_page, _ = paginator.page_queryset(incidents, cursor, paginator.page_size)
+
+    return [
+        (
+            "check run: ongoing incident lookup",
+            Incident.objects.filter(related_table=table, incident_type="volume", status="ongoing"),
+            ["incident_ongoing", "incident_table_type_status"],
+        ),
+        (
+            "table detail: recent incidents",
+            Incident.objects.filter(related_table=table).order_by("-created_at")[:10],
+            ["incident_table_created_id"],
+        ),
+        ("dashboard: recent incidents", recent_incidents_queryset(user, 7), INCIDENT_TIME_INDEXES),
+        ("incident trend: rollups", incident_rolled, ROLLUP_INDEXES),
+        ("incident trend: raw tail", incident_raw, INCIDENT_TIME_INDEXES),
+        ("incident list: first page", first_page, INCIDENT_TIME_INDEXES),
+        ("incident list: cursor page", next_page, INCIDENT_TIME_INDEXES),
+        (
+            "table detail: recent checks",
+            DataQualityCheck.objects.filter(table=table).order_by("-run_time")[:5],
+            CHECK_TIME_INDEXES,
+        ),
+        ("health score trend: rollups", check_rolled, ROLLUP_INDEXES),
+        ("health score trend: raw tail", check_raw, CHECK_TIME_INDEXES),
+        (
+            "latest check per type",
+            DataQualityCheck.objects.filter(table=table, check_type="volume").order_by("-run_time")[:1],
+            ["check_table_type_run"],
+        ),
+        (
+            "metric history window",
+            MetricHistory.objects.filter(table=table, metric_type="volume", timestamp__gte=since),
+            ["metric_table_type_ts"],
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot metadata queries and fail if they don't use their composite indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--table-id", type=int, help="Table to plan against (default: first table)")
+        parser.add_argument(
+            "--actual",
+            action="store_true",
+            help="Use the planner's real choice; by default seq scans are disabled so small "
+                 "dev databases still show whether an index is applicable",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Query plan checks need PostgreSQL.")
+
+        tables = DataTable.objects.select_related("user", "connection").order_by("id")
+        table = tables.filter(id=options["table_id"]).first() if options["table_id"] else tables.first()
+        if table is None:
+            raise CommandError("No table to plan against.")
+        failures = 0
+
+        with transaction.atomic():
+            if not options["actual"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for label, qs, expected in hot_queries(table):
+                plan = qs.explain()
+                used = next((name for name in expected if name in plan), None)
+                if used:
+                    self.stdout.write(self.style.SUCCESS(f"✅ {label}: {used}"))
+                else:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"❌ {label}: expected one of {expected}"))
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{failures} hot queries are not using their indexes.")
@@ -0,0 +1,25 @@
+import os
+
+import joblib
+from django.core.management.base import BaseCommand, CommandError
+# cubeview/management/commands/export_anomaly_scorer.py
+from cubeview.ml.scorer import export_forest
+from cubeview.ml.utils import PICKLE_PATH, SCORER_PATH
+
+
+class Command(BaseCommand):
+    help = "Export the trained IsolationForest pickle into the NumPy scorer format"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", type=str, default=PICKLE_PATH, help="Path to the sklearn pickle")
+        parser.add_argument("--output", type=str, default=SCORER_PATH, help="Path of the .npz to write")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options["source"]):
+            raise CommandError(f"Model not found: {options['source']}")
+
+        model = joblib.load(options["source"])
+        path = export_forest(model, options["output"])
+
+        size_kb = os.path.getsize(path) / 1024
+        self.stdout.write(self.style.SUCCESS(f"✅ Scorer exported to {path} ({size_kb:.0f} KB)."))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+# cubeview/management/commands/manage_history_partitions.py
+from cubeview.utils.partitions import (
+    PARTITIONED_MODELS,
+    convert_to_partitioned,
+    is_partitioned,
+    list_partitions,
+    maintain_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = "Create upcoming history partitions and drop those past retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="First rebuild MetricHistory/DataQualityCheck as partitioned tables (one-off, locks them)",
+        )
+        parser.add_argument("--list", action="store_true", help="Only list the current partitions")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("History partitioning needs PostgreSQL.")
+
+        if options["list"]:
+            for model, _ in PARTITIONED_MODELS:
+                table = model._meta.db_table
+                partitions = list_partitions(table) if is_partitioned(table) else []
+                self.stdout.write(f"{table}: {', '.join(partitions) or 'not partitioned'}")
+            return
+
+        if options["convert"]:
+            for model, field_name in PARTITIONED_MODELS:
+                table = model._meta.db_table
+                if is_partitioned(table):
+                    self.stdout.write(f"⏭️ {table} is already partitioned")
+                    continue
+                self.stdout.write(f"▶️ Converting {table} (partitioned by {field_name})")
+                convert_to_partitioned(model, field_name)
+                self.stdout.write(self.style.SUCCESS(f"✅ {table} converted"))
+
+        result = maintain_partitions()
+        for name in result["created"]:
+            self.stdout.write(f"➕ Created {name}")
+        for name in result["dropped"]:
+            self.stdout.write(f"🗑️ Dropped {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Partitions up to date ({len(result['created'])} created, {len(result['dropped'])} dropped)"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+# cubeview/management/commands/rebuild_catalog_search.py
+from cubeview.models import DataTable
+from cubeview.utils.catalog_search import ensure_search_extension, index_tables
+
+BATCH_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = "Enable pg_trgm and rebuild catalog search entries for every table (or one user's)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild this user's tables")
+
+    def handle(self, *args, **options):
+        ensure_search_extension()
+
+        tables = DataTable.objects.order_by("id")
+        if options["user"]:
+            tables = tables.filter(user_id=options["user"])
+        table_ids = list(tables.values_list("id", flat=True))
+
+        written = 0
+        for start in range(0, len(table_ids), BATCH_SIZE):
+            written += index_tables(table_ids[start:start + BATCH_SIZE])
+        self.stdout.write(self.style.SUCCESS(f"✅ {written} search entries for {len(table_ids)} tables"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+# cubeview/management/commands/refresh_health_snapshots.py
+from cubeview.models import DataTable
+from cubeview.utils.health_snapshot import rebuild_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild every table's health snapshot from the stored check history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild this user's tables")
+
+    def handle(self, *args, **options):
+        tables = DataTable.objects.all()
+        if options["user"]:
+            tables = tables.filter(user_id=options["user"])
+
+        table_ids = list(tables.values_list("id", flat=True))
+        rebuild_snapshots(table_ids)
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt {len(table_ids)} table health snapshots"))
@@ -6,8 +6,14 @@ from cubeview.ml.training.train_isolation_forest import retrain_model
 class Command(BaseCommand):
     help = "Retrain the ML anomaly detection model"
 
-    def handle(self, *args, **kwargs):
-        success = retrain_model()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window", type=int, default=None,
+            help="Add mean/std/trend features over each metric's last N runs",
+        )
+
+    def handle(self, *args, **options):
+        success = retrain_model(window=options["window"])
         if success:
             self.stdout.write(self.style.SUCCESS("✅ Model retrained and saved."))
         else:
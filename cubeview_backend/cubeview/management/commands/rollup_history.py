@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+# cubeview/management/commands/rollup_history.py
+from cubeview.utils.rollups import prune_raw_history, rollup_history
+
+
+class Command(BaseCommand):
+    help = "Roll raw check, metric, rule and incident history into hourly/daily aggregates and prune old raw rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every bucket back to the prune horizon from raw rows")
+        parser.add_argument("--no-prune", action="store_true", help="Skip raw-history retention")
+
+    def handle(self, *args, **options):
+        written = rollup_history(full=options["full"])
+        self.stdout.write(self.style.SUCCESS(f"✅ {written} rollup buckets written"))
+
+        if not options["no_prune"]:
+            deleted = prune_raw_history()
+            for source, count in deleted.items():
+                self.stdout.write(f"🗑️ Pruned {count} raw {source} rows")
@@ -1,8 +1,10 @@
 import psycopg2
-from psycopg2 import sql
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from ...models import DataQualityRule, RuleExecutionHistory, Incident, UserDatabaseConnection
+from ...models import DataQualityRule, UserDatabaseConnection
+from ...utils.cache import invalidate_user
+from ...utils.custom_rule_executor import run_rule_set
+from ...utils.health_snapshot import refresh_ongoing_incidents
+from ...utils.query_cache import RunQueryCache
 
 class Command(BaseCommand):
     help = "Run data quality rules based on schedule"
@@ -14,11 +16,11 @@ class Command(BaseCommand):
         frequency = options["frequency"]
         rules = DataQualityRule.objects.filter(schedule=frequency)
 
-        for rule in rules:
-            user = rule.user
-            db_conn = UserDatabaseConnection.objects.filter(user=user, is_active=True).first()
+        # One connection per user; rules are evaluated together so dependencies resolve
+        for user_id in rules.values_list("user_id", flat=True).distinct():
+            db_conn = UserDatabaseConnection.objects.filter(user_id=user_id, is_active=True).first()
             if not db_conn:
-                self.stdout.write(self.style.WARNING(f"No active DB for user {user.username}"))
+                self.stdout.write(self.style.WARNING(f"No active DB for user {user_id}"))
                 continue
 
             try:
@@ -30,31 +32,17 @@ class Command(BaseCommand):
                     dbname=db_conn.database_name,
                 )
                 cursor = conn.cursor()
-                cursor.execute(rule.rule_logic)
-                result = cursor.fetchone()
-                failed_rows = int(result[0]) if result else 0
 
-                status = "pass" if failed_rows == 0 else "fail"
-
-                # Save execution history
-                RuleExecutionHistory.objects.create(
-                    rule=rule,
-                    status=status,
-                    failed_rows=failed_rows
-                )
-
-                # Create incident if failed and critical
-                if status == "fail" and rule.severity == "critical":
-                    Incident.objects.create(
-                        title=f"Rule Failed: {rule.natural_language or rule.rule_type}",
-                        description=f"{failed_rows} rows failed for rule on {rule.table.name}.{rule.column}",
-                        related_table=rule.table,
-                        incident_type="Custom",
-                        severity="high"
-                    )
+                cache = RunQueryCache(cursor)
+                user_rules = rules.filter(user_id=user_id)
+                summary = run_rule_set(user_rules, cache)
+                refresh_ongoing_incidents(user_rules.values_list("table_id", flat=True).distinct())
+                invalidate_user(user_id)
 
                 self.stdout.write(self.style.SUCCESS(
-                    f"Rule [{rule.id}] {status.upper()} - {failed_rows} failed rows."
+                    f"User {user_id}: {summary['executed']} rules run, "
+                    f"{summary['failed']} failed, {summary['errors']} errored, {summary['skipped']} skipped "
+                    f"(query cache: {cache.hits} hits, {cache.misses} misses)."
                 ))
 
                 cursor.close()
@@ -62,5 +50,5 @@ class Command(BaseCommand):
 
             except Exception as e:
                 self.stdout.write(self.style.ERROR(
-                    f"Error running rule {rule.id}: {e}"
+                    f"Error running rules for user {user_id}: {e}"
                 ))
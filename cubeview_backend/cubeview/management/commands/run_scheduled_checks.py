@@ -3,6 +3,8 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from cubeview.models import DataQualityCheck, DataTable
 from cubeview.utils.check_data_quality import run_data_quality_checks
+from cubeview.utils.partitions import maintain_partitions
+from cubeview.utils.rollups import prune_raw_history, rollup_history
 import datetime
 
 User = get_user_model()
@@ -13,6 +15,12 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         now = timezone.now()
 
+        # Keep history partitions ahead of the writes below and enforce retention
+        try:
+            maintain_partitions()
+        except Exception as e:
+            self.stderr.write(f"❌ Partition maintenance failed: {str(e)}")
+
         for user in User.objects.all():
             freq = getattr(user, "check_frequency", "daily")
 
@@ -40,3 +48,10 @@ class Command(BaseCommand):
                     self.stdout.write(self.style.SUCCESS(f"✅ Checks completed for {user.username}"))
                 except Exception as e:
                     self.stderr.write(f"❌ Failed for {user.username}: {str(e)}")
+
+        # Fold the new rows into the trend rollups, then apply raw-history retention
+        try:
+            rollup_history()
+            prune_raw_history()
+        except Exception as e:
+            self.stderr.write(f"❌ History rollup failed: {str(e)}")
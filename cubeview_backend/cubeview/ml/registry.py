@@ -0,0 +1,131 @@
+# ml/registry.py
+
+import json
+import os
+import re
+import tempfile
+
+import numpy as np
+
+from .scorer import ARRAY_NAMES, ForestScorer, flatten_forest
+
+REGISTRY_DIR = os.path.join(os.path.dirname(__file__), "models", "registry")
+ACTIVE_FILE = os.path.join(REGISTRY_DIR, "ACTIVE")
+
+_VERSION_RE = re.compile(r"^v(\d+)$")
+
+# Per-process view of the active model; refreshed when the ACTIVE stamp changes
+_active = {"stamp": None, "version": None, "scorer": None}
+
+
+def list_versions():
+    if not os.path.isdir(REGISTRY_DIR):
+        return []
+    versions = [name for name in os.listdir(REGISTRY_DIR) if _VERSION_RE.match(name)]
+    return sorted(versions, key=lambda v: int(_VERSION_RE.match(v).group(1)))
+
+
+def read_metadata(version):
+    with open(os.path.join(REGISTRY_DIR, version, "metadata.json")) as f:
+        return json.load(f)
+
+
+def active_version():
+    try:
+        with open(ACTIVE_FILE) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def is_servable(version):
+    """Whether inference can build the version's features: the live FEATURES, or those plus their window aggregates."""
+    from .training.features import windowed_feature_names
+    from .utils import FEATURES  # utils imports this module
+
+    meta = read_metadata(version)
+    schema = set(meta["feature_schema"])
+    if (meta.get("training") or {}).get("window"):
+        return schema == set(windowed_feature_names(FEATURES))
+    return schema == set(FEATURES)
+
+
+def activate(version):
+    """Point ACTIVE at `version`; os.replace makes the switch atomic for readers."""
+    if version not in list_versions():
+        raise ValueError(f"Unknown model version: {version}")
+    if not is_servable(version):
+        raise ValueError(
+            f"{version} was trained on {read_metadata(version)['feature_schema']}, "
+            "which inference can't compute; it can't be activated."
+        )
+    fd, tmp_path = tempfile.mkstemp(dir=REGISTRY_DIR, prefix=".active-")
+    with os.fdopen(fd, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, ACTIVE_FILE)
+
+
+def publish(model, feature_names, training_metadata, activate_now=True):
+    """
+    Store a fitted IsolationForest as a new immutable version.
+    Arrays are written as individual .npy files so workers can memory-map
+    them, next to a metadata.json with the feature schema and training info.
+    The version directory is assembled under a temp name and renamed into
+    place, so readers never see a half-written version.
+    """
+    os.makedirs(REGISTRY_DIR, exist_ok=True)
+    arrays, meta = flatten_forest(model, feature_names)
+
+    tmp_dir = tempfile.mkdtemp(dir=REGISTRY_DIR, prefix=".tmp-")
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+    with open(os.path.join(tmp_dir, "metadata.json"), "w") as f:
+        json.dump({**meta, "feature_schema": list(feature_names), "training": training_metadata}, f, indent=2)
+
+    while True:
+        existing = list_versions()
+        number = int(_VERSION_RE.match(existing[-1]).group(1)) + 1 if existing else 1
+        version = f"v{number:04d}"
+        try:
+            os.rename(tmp_dir, os.path.join(REGISTRY_DIR, version))
+            break
+        except OSError:
+            # Another trainer took this number first; try the next one
+            if not os.path.exists(os.path.join(REGISTRY_DIR, version)):
+                raise
+
+    if activate_now:
+        activate(version)
+    return version
+
+
+def load_version(version):
+    """Load a version with its arrays memory-mapped read-only (shared across processes)."""
+    path = os.path.join(REGISTRY_DIR, version)
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ARRAY_NAMES}
+    return ForestScorer(arrays, read_metadata(version))
+
+
+def _stamp():
+    try:
+        st = os.stat(ACTIVE_FILE)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def get_active_scorer():
+    """
+    Return the scorer for the active version, or None if nothing is published.
+    Costs one stat() per call; a new version is loaded only when ACTIVE changed.
+    """
+    stamp = _stamp()
+    if stamp is None:
+        return None
+    if stamp != _active["stamp"]:
+        version = active_version()
+        if version != _active["version"]:
+            _active["scorer"] = load_version(version)
+            _active["version"] = version
+        _active["stamp"] = stamp
+    return _active["scorer"]
@@ -0,0 +1,168 @@
+# ml/scorer.py
+
+import numpy as np
+
+TREE_LEAF = -1
+
+ARRAY_NAMES = ["feature", "threshold", "left", "right", "path_length", "roots"]
+
+
+def average_path_length(n):
+    """Expected path length of an unsuccessful BST search over `n` points (sklearn's c(n))."""
+    n = np.asarray(n, dtype=np.float64)
+    result = np.zeros_like(n)
+    result[n == 2] = 1.0
+    mask = n > 2
+    result[mask] = 2.0 * (np.log(n[mask] - 1.0) + np.euler_gamma) - 2.0 * (n[mask] - 1.0) / n[mask]
+    return result
+
+
+class ForestScorer:
+    """
+    Pure-NumPy replica of IsolationForest scoring.
+    All trees are flattened into shared node arrays:
+      feature      column of X tested at each internal node (already mapped
+                   through the tree's feature subset)
+      threshold    split value; a sample goes left when x <= threshold
+      left/right   global child node indices, TREE_LEAF at leaves
+      path_length  (depth + 1) + c(n_node_samples) - 1 for every node, i.e.
+                   the contribution of a sample that ends in that node
+      roots        root node index of each tree
+    """
+
+    def __init__(self, arrays, meta):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.path_length = arrays["path_length"]
+        self.roots = arrays["roots"]
+        self.feature_names = list(meta["feature_names"])
+        self.offset = float(meta["offset"])
+        self.max_depth = int(meta["max_depth"])
+        self.denominator = float(meta["denominator"])
+        # Runs per metric the model's mean/std/trend features span (retrain_anomaly_model --window)
+        self.window = (meta.get("training") or {}).get("window")
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in ARRAY_NAMES}
+            meta = {
+                "feature_names": [str(n) for n in data["feature_names"]],
+                "offset": data["offset"][()],
+                "max_depth": data["max_depth"][()],
+                "denominator": data["denominator"][()],
+            }
+        return cls(arrays, meta)
+
+    def _depths(self, X):
+        # sklearn's tree.apply compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_samples, axis=1)
+
+        for _ in range(self.max_depth):
+            left = self.left[nodes]
+            internal = left != TREE_LEAF
+            if not internal.any():
+                break
+            values = X[rows, np.where(internal, self.feature[nodes], 0)]
+            go_left = values <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, left, self.right[nodes]), nodes)
+
+        # Accumulate tree by tree, in sklearn's order, so float sums match exactly
+        depths = np.zeros(n_samples, dtype=np.float64)
+        for contribution in self.path_length[nodes]:
+            depths += contribution
+        return depths
+
+    def score_samples(self, X):
+        """Opposite of the anomaly score, as in IsolationForest.score_samples."""
+        depths = self._depths(X)
+        if self.denominator == 0:
+            return np.full_like(depths, -0.5)
+        return -(2.0 ** (-depths / self.denominator))
+
+    def decision_function(self, X):
+        return self.score_samples(X) - self.offset
+
+    def predict(self, X):
+        """1 for inliers, -1 for outliers."""
+        return np.where(self.decision_function(X) < 0, -1, 1)
+
+
+def flatten_forest(model, feature_names=None):
+    """
+    Flatten a fitted sklearn IsolationForest into the (arrays, meta) pair
+    ForestScorer is built from.
+    """
+    if feature_names is None:
+        feature_names = list(getattr(model, "feature_names_in_", []))
+    if not feature_names:
+        feature_names = [f"x{i}" for i in range(model.n_features_in_)]
+
+    features, thresholds, lefts, rights, path_lengths, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator, subset in zip(model.estimators_, model.estimators_features_):
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        subset = np.asarray(subset)
+
+        # Node depths from a single pass; children always come after parents
+        depth = np.zeros(n_nodes, dtype=np.int64)
+        for node in range(n_nodes):
+            for child in (tree.children_left[node], tree.children_right[node]):
+                if child != TREE_LEAF:
+                    depth[child] = depth[node] + 1
+
+        is_leaf = tree.children_left == TREE_LEAF
+        feature = np.where(is_leaf, 0, subset[np.where(is_leaf, 0, tree.feature)])
+        features.append(feature.astype(np.int32))
+        thresholds.append(tree.threshold.astype(np.float64))
+        lefts.append(np.where(is_leaf, TREE_LEAF, tree.children_left + offset).astype(np.int32))
+        rights.append(np.where(is_leaf, TREE_LEAF, tree.children_right + offset).astype(np.int32))
+        # Same operation order as sklearn: decision path length + c(n) - 1
+        path_lengths.append((depth + 1) + average_path_length(tree.n_node_samples) - 1.0)
+        roots.append(offset)
+
+        max_depth = max(max_depth, int(depth.max()))
+        offset += n_nodes
+
+    denominator = len(model.estimators_) * float(average_path_length([model.max_samples_])[0])
+
+    arrays = {
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "left": np.concatenate(lefts),
+        "right": np.concatenate(rights),
+        "path_length": np.concatenate(path_lengths),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+    meta = {
+        "feature_names": [str(n) for n in feature_names],
+        "offset": float(model.offset_),
+        "max_depth": max_depth,
+        "denominator": denominator,
+    }
+    return arrays, meta
+
+
+def export_forest(model, path, feature_names=None):
+    """
+    Flatten a fitted sklearn IsolationForest and save it as an uncompressed
+    .npz at `path`.
+    """
+    arrays, meta = flatten_forest(model, feature_names)
+    np.savez(
+        path,
+        feature_names=np.asarray(meta["feature_names"]),
+        offset=np.float64(meta["offset"]),
+        max_depth=np.int64(meta["max_depth"]),
+        denominator=np.float64(meta["denominator"]),
+        **arrays,
+    )
+    return path
@@ -0,0 +1,216 @@
+# ml/streaming.py
+
+import io
+import math
+
+import numpy as np
+from django.db import transaction
+
+from cubeview.models import StreamingAnomalyState
+
+Z_THRESHOLD = 3.0
+SCORE_ALPHA = 0.05
+
+_STATE_ARRAYS = ["feature", "split", "ref_mass", "latest_mass"]
+_STATE_SCALARS = ["window_size", "window_count", "n_seen", "score_mean", "score_var"]
+
+
+def scale_features(rows):
+    """
+    Map (null_percent, volume, schema_change) rows into the unit cube that
+    half-space trees partition. Volume is log-scaled so 10^10 rows sits at 1.
+    """
+    X = np.asarray(rows, dtype=np.float64).reshape(-1, 3)
+    scaled = np.empty_like(X)
+    scaled[:, 0] = X[:, 0] / 100.0
+    scaled[:, 1] = np.log10(1.0 + np.maximum(X[:, 1], 0.0)) / 10.0
+    scaled[:, 2] = X[:, 2] > 0
+    return np.clip(scaled, 0.0, 1.0)
+
+
+class HalfSpaceTrees:
+    """
+    Streaming anomaly detector (Tan, Ting & Liu, 2011) on flat NumPy arrays.
+    Each tree is a complete binary tree stored heap-style (children of node i
+    are 2i+1 and 2i+2) with a random split feature and the midpoint of a
+    randomly perturbed workspace at every internal node. Mass profiles are
+    counted over fixed-size windows: `latest_mass` fills up while
+    `ref_mass` (the previous window) is used for scoring. Higher scores mean
+    denser, more normal regions.
+    """
+
+    def __init__(self, n_features=3, n_trees=25, depth=8, window_size=256, seed=None, _arrays=None, _scalars=None):
+        self.n_trees = n_trees
+        self.depth = depth
+        n_nodes = 2 ** (depth + 1) - 1
+
+        if _arrays is not None:
+            for name in _STATE_ARRAYS:
+                setattr(self, name, _arrays[name])
+            for name in _STATE_SCALARS:
+                setattr(self, name, _scalars[name])
+            return
+
+        rng = np.random.default_rng(seed)
+        n_internal = 2 ** depth - 1
+        self.feature = np.zeros((n_trees, n_nodes), dtype=np.int64)
+        self.split = np.zeros((n_trees, n_nodes), dtype=np.float64)
+        for t in range(n_trees):
+            s = rng.random(n_features)
+            span = 2.0 * np.maximum(s, 1.0 - s)
+            node_min = np.zeros((n_nodes, n_features))
+            node_max = np.zeros((n_nodes, n_features))
+            node_min[0], node_max[0] = s - span, s + span
+            for node in range(n_internal):
+                q = rng.integers(n_features)
+                p = (node_min[node, q] + node_max[node, q]) / 2.0
+                self.feature[t, node] = q
+                self.split[t, node] = p
+                for child in (2 * node + 1, 2 * node + 2):
+                    node_min[child], node_max[child] = node_min[node], node_max[node]
+                node_max[2 * node + 1, q] = p
+                node_min[2 * node + 2, q] = p
+
+        self.ref_mass = np.zeros((n_trees, n_nodes), dtype=np.float64)
+        self.latest_mass = np.zeros((n_trees, n_nodes), dtype=np.float64)
+        self.window_size = window_size
+        self.window_count = 0
+        self.n_seen = 0
+        self.score_mean = 0.0
+        self.score_var = 0.0
+
+    @property
+    def is_warm(self):
+        """True once a full reference window exists to score against."""
+        return self.n_seen >= self.window_size
+
+    def _paths(self, X):
+        """Node index per (level, tree, sample) along each sample's path."""
+        n = X.shape[0]
+        rows = np.arange(n)[None, :]
+        trees = np.arange(self.n_trees)[:, None]
+        nodes = np.zeros((self.n_trees, n), dtype=np.int64)
+        paths = [nodes]
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[trees, nodes]] < self.split[trees, nodes]
+            nodes = np.where(go_left, 2 * nodes + 1, 2 * nodes + 2)
+            paths.append(nodes)
+        return paths
+
+    def score(self, X):
+        """Mass-based score per row of scaled features; lower is more anomalous."""
+        X = np.asarray(X, dtype=np.float64)
+        trees = np.arange(self.n_trees)[:, None]
+        size_limit = 0.1 * self.window_size
+        scores = np.zeros(X.shape[0])
+        active = np.ones((self.n_trees, X.shape[0]), dtype=bool)
+
+        for level, nodes in enumerate(self._paths(X)):
+            mass = self.ref_mass[trees, nodes]
+            stop = active & ((level == self.depth) | (mass <= size_limit))
+            scores += np.where(stop, mass * 2.0 ** level, 0.0).sum(axis=0)
+            active &= ~stop
+            if not active.any():
+                break
+        return scores
+
+    def learn(self, X):
+        """Count rows into the latest window, rolling the window when it fills."""
+        X = np.asarray(X, dtype=np.float64)
+        trees = np.arange(self.n_trees)[:, None]
+        start = 0
+        while start < len(X):
+            take = min(self.window_size - self.window_count, len(X) - start)
+            for nodes in self._paths(X[start:start + take]):
+                np.add.at(self.latest_mass, (np.broadcast_to(trees, nodes.shape), nodes), 1.0)
+            self.window_count += take
+            self.n_seen += take
+            start += take
+            if self.window_count >= self.window_size:
+                self.ref_mass = self.latest_mass
+                self.latest_mass = np.zeros_like(self.ref_mass)
+                self.window_count = 0
+
+    def score_and_learn(self, X):
+        """
+        Score a batch against the reference window, flag scores more than
+        Z_THRESHOLD EWMA standard deviations below the running mean, then
+        learn the batch. Returns (is_anomaly, scores); nothing is flagged
+        until the detector is warm.
+        """
+        scores = self.score(X)
+        flags = self.flag(scores)
+        if self.is_warm:
+            for s in scores:
+                diff = s - self.score_mean
+                increment = SCORE_ALPHA * diff
+                self.score_mean += increment
+                self.score_var = (1 - SCORE_ALPHA) * (self.score_var + diff * increment)
+        self.learn(X)
+        return flags, scores
+
+    def flag(self, scores):
+        if not self.is_warm or self.score_var <= 0:
+            return np.zeros(len(scores), dtype=bool)
+        return scores < self.score_mean - Z_THRESHOLD * math.sqrt(self.score_var)
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            **{name: getattr(self, name) for name in _STATE_ARRAYS},
+            **{name: np.asarray(getattr(self, name)) for name in _STATE_SCALARS},
+            shape=np.asarray([self.n_trees, self.depth]),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            n_trees, depth = (int(v) for v in arrays["shape"])
+            return cls(
+                n_trees=n_trees,
+                depth=depth,
+                _arrays={name: arrays[name] for name in _STATE_ARRAYS},
+                _scalars={name: arrays[name][()].item() for name in _STATE_SCALARS},
+            )
+
+
+def load_detector(connection):
+    state = StreamingAnomalyState.objects.filter(connection=connection).first()
+    if state is None:
+        return None
+    return HalfSpaceTrees.from_bytes(bytes(state.state))
+
+
+def learn_from_run(connection, rows):
+    """
+    Score and learn one check run's feature rows, persisting the new state.
+    The state row stays locked from load to save, so concurrent runs for the
+    same connection apply their updates one after the other.
+    """
+    if not rows:
+        return [], []
+    with transaction.atomic():
+        state, created = StreamingAnomalyState.objects.select_for_update().get_or_create(
+            connection=connection,
+            defaults={"state": b"", "n_seen": 0},
+        )
+        detector = HalfSpaceTrees() if created else HalfSpaceTrees.from_bytes(bytes(state.state))
+        flags, scores = detector.score_and_learn(scale_features(rows))
+        state.state = detector.to_bytes()
+        state.n_seen = detector.n_seen
+        state.save(update_fields=["state", "n_seen", "updated_at"])
+    return flags.tolist(), scores.tolist()
+
+
+def score_streaming(connection, rows):
+    """
+    Score feature rows with the connection's current state without learning.
+    Returns None when there is no warm detector yet.
+    """
+    detector = load_detector(connection)
+    if detector is None or not detector.is_warm:
+        return None
+    scores = detector.score(scale_features(rows))
+    return detector.flag(scores).tolist(), scores.tolist()
@@ -0,0 +1,80 @@
+# ml/training/features.py
+
+from itertools import groupby
+
+import numpy as np
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from cubeview.models import MetricHistory
+
+CHUNK_SIZE = 5000
+
+
+def latest_features(metrics):
+    """
+    Yield (table_id, {metric_type: latest value}) for every table.
+    On Postgres the "latest per (table, metric_type)" reduction happens in the
+    database with DISTINCT ON; elsewhere the ordered history is streamed in
+    chunks and only the first row per key is kept. Memory stays O(tables).
+    """
+    qs = (
+        MetricHistory.objects
+        .filter(metric_type__in=metrics)
+        .order_by("table_id", "metric_type", "-timestamp")
+    )
+    if connection.vendor == "postgresql":
+        qs = qs.distinct("table_id", "metric_type")
+
+    rows = qs.values_list("table_id", "metric_type", "value").iterator(chunk_size=CHUNK_SIZE)
+    for table_id, table_rows in groupby(rows, key=lambda r: r[0]):
+        latest = {}
+        for _, metric_type, value in table_rows:
+            latest.setdefault(metric_type, value)
+        yield table_id, latest
+
+
+def windowed_features(metrics, window, table_ids=None):
+    """
+    Yield (table_id, features) with the latest value plus mean, std and trend
+    (least-squares slope per run, oldest to newest) over each metric's last
+    `window` observations. The window is cut in the database with ROW_NUMBER(),
+    so at most `window` rows per (table, metric) ever reach Python. Training
+    reads every table; inference passes the `table_ids` it scores.
+    """
+    history = MetricHistory.objects.filter(metric_type__in=metrics)
+    if table_ids is not None:
+        history = history.filter(table_id__in=list(table_ids))
+    rows = (
+        history
+        .annotate(
+            rn=Window(
+                expression=RowNumber(),
+                partition_by=[F("table_id"), F("metric_type")],
+                order_by=F("timestamp").desc(),
+            )
+        )
+        .filter(rn__lte=window)
+        .order_by("table_id", "metric_type", "-timestamp")
+        .values_list("table_id", "metric_type", "value")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+    for table_id, table_rows in groupby(rows, key=lambda r: r[0]):
+        features = {}
+        for metric_type, metric_rows in groupby(table_rows, key=lambda r: r[1]):
+            values = np.array([r[2] for r in metric_rows], dtype=np.float64)[::-1]
+            features[metric_type] = values[-1]
+            features[f"{metric_type}_mean"] = values.mean()
+            features[f"{metric_type}_std"] = values.std()
+            features[f"{metric_type}_trend"] = (
+                np.polyfit(np.arange(len(values)), values, 1)[0] if len(values) > 1 else 0.0
+            )
+        yield table_id, features
+
+
+def windowed_feature_names(metrics):
+    names = list(metrics)
+    for metric in metrics:
+        names += [f"{metric}_mean", f"{metric}_std", f"{metric}_trend"]
+    return names
@@ -1,27 +1,31 @@
 # ml/training/train_isolation_forest.py
 
-import os
-import joblib
 import pandas as pd
+import sklearn
+from django.utils import timezone
 from sklearn.ensemble import IsolationForest
-from cubeview.models import MetricHistory
-
-def retrain_model(min_records=20):
-    records = (
-        MetricHistory.objects
-        .filter(metric_type__in=["null_percent", "volume", "schema_change"])
-        .order_by("table_id", "metric_type", "-timestamp")  # fix field name
-    )
-
-    data = {}
-    for r in records:
-        tid = r.table_id
-        if tid not in data:
-            data[tid] = {}
-        if r.metric_type not in data[tid]:
-            data[tid][r.metric_type] = r.value
-
-    df = pd.DataFrame.from_dict(data, orient="index").dropna()
+from cubeview.ml import registry
+from cubeview.ml.training.features import latest_features, windowed_features, windowed_feature_names
+from cubeview.ml.utils import FEATURES
+
+def retrain_model(min_records=20, window=None):
+    """
+    Retrain the anomaly model from MetricHistory and publish it to the registry.
+    Features are streamed per table, so memory is bounded by the number of
+    tables rather than the number of history rows. With `window`, each metric
+    also gets mean/std/trend aggregates over its last `window` runs; inference
+    recomputes them from each scored table's history (see score_anomalies).
+    """
+    if window:
+        feature_names = windowed_feature_names(FEATURES)
+        rows = windowed_features(FEATURES, window)
+    else:
+        feature_names = FEATURES
+        rows = latest_features(FEATURES)
+
+    df = pd.DataFrame.from_records(
+        (features for _, features in rows), columns=feature_names
+    ).dropna()
 
     if len(df) < min_records:
         print(f"⚠️ Not enough data to train. Found: {len(df)} records.")
@@ -30,9 +34,20 @@ def retrain_model(min_records=20):
     model = IsolationForest(contamination=0.1, random_state=42)
     model.fit(df)
 
-    path = os.path.join("ml", "models", "isolation_forest_cv.pkl")
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    joblib.dump(model, path)
+    version = registry.publish(
+        model,
+        feature_names=feature_names,
+        training_metadata={
+            "trained_at": timezone.now().isoformat(),
+            "window": window,
+            "n_samples": len(df),
+            "contamination": model.contamination,
+            "n_estimators": model.n_estimators,
+            "max_samples": int(model.max_samples_),
+            "random_state": model.random_state,
+            "sklearn_version": sklearn.__version__,
+        },
+    )
 
-    print(f"✅ Model retrained and saved to: {path}")
+    print(f"✅ Model retrained and published as {version}")
     return True
@@ -1,26 +1,115 @@
 # cv_ml/utils/ml_model.py
 
 import os
-import joblib
-import pandas as pd
 
-_model = None  # Singleton pattern
+import numpy as np
+
+from .registry import get_active_scorer
+from .scorer import ForestScorer
+
+_model = None  # Singleton for the legacy, unversioned artifacts
+
+FEATURES = ["null_percent", "volume", "schema_change"]
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), 'models')
+SCORER_PATH = os.path.join(MODELS_DIR, 'isolation_forest_cv.npz')
+PICKLE_PATH = os.path.join(MODELS_DIR, 'isolation_forest_cv.pkl')
 
 def load_model():
+    """
+    Return the anomaly model. The registry's active version wins and is
+    re-checked on every call, so retrained models reach running workers.
+    Without a registry, falls back to the exported NumPy scorer and then to
+    the sklearn pickle.
+    """
     global _model
+    scorer = get_active_scorer()
+    if scorer is not None:
+        return scorer
     if _model is None:
-        model_path = os.path.join(os.path.dirname(__file__), 'models', 'isolation_forest_cv.pkl')
-        if not os.path.exists(model_path):
+        if os.path.exists(SCORER_PATH):
+            _model = ForestScorer.load(SCORER_PATH)
+        elif os.path.exists(PICKLE_PATH):
+            import joblib  # heavy; only needed until a scorer has been exported
+            _model = joblib.load(PICKLE_PATH)
+        else:
             raise FileNotFoundError("Isolation Forest model not found at expected path.")
-        _model = joblib.load(model_path)
     return _model
 
-def detect_anomalies(null_percent, volume, schema_change):
+def _windowed_rows(rows, table_ids, window):
+    """
+    Extend live (null_percent, volume, schema_change) rows with the mean/std/trend
+    features a windowed model was trained on, computed the same way from each
+    table's last `window` runs. The live values stand in for the latest run;
+    a metric with no history yet gets its live value as mean and no spread.
+    """
+    from .training.features import windowed_feature_names, windowed_features  # needs the ORM
+
+    history = dict(windowed_features(FEATURES, window, table_ids=table_ids))
+    names = windowed_feature_names(FEATURES)
+    extended = []
+    for table_id, row in zip(table_ids, rows):
+        features = history.get(table_id, {})
+        for metric, value in zip(FEATURES, row):
+            features[metric] = value
+            features.setdefault(f"{metric}_mean", value)
+            features.setdefault(f"{metric}_std", 0.0)
+            features.setdefault(f"{metric}_trend", 0.0)
+        extended.append([features[name] for name in names])
+    return extended, names
+
+
+def score_anomalies(rows, table_ids=None):
+    """
+    Score many feature rows in one vectorized call.
+    `rows` is a sequence of (null_percent, volume, schema_change) tuples.
+    A model trained with windowed features (retrain_anomaly_model --window N)
+    also needs `table_ids`, parallel to `rows`, to read their recent history.
+    Returns (is_anomaly, scores) as parallel lists; lower scores are more anomalous.
+    """
+    if not len(rows):
+        return [], []
     model = load_model()
-    X = pd.DataFrame([{
-        "null_percent": null_percent,
-        "volume": volume,
-        "schema_change": schema_change
-    }])
-    result = model.predict(X)
-    return result[0] == -1
+
+    if isinstance(model, ForestScorer):
+        feature_names = model.feature_names
+    else:
+        feature_names = getattr(model, "feature_names_in_", None)
+
+    window = getattr(model, "window", None)
+    if window:
+        if table_ids is None:
+            raise ValueError(f"Active model uses {window}-run windowed features; table ids are required.")
+        rows, columns = _windowed_rows(rows, table_ids, window)
+    else:
+        columns = FEATURES
+    X = np.asarray(rows, dtype=np.float64)
+
+    # Match the column order the model was fitted with
+    if feature_names is not None:
+        if set(feature_names) != set(columns):
+            raise ValueError(f"Active model expects features {list(feature_names)}, not {columns}.")
+        X = X[:, [columns.index(name) for name in feature_names]]
+
+    if not isinstance(model, ForestScorer) and feature_names is not None:
+        import pandas as pd  # sklearn validates feature names against a DataFrame
+        X = pd.DataFrame(X, columns=list(feature_names))
+
+    predictions = model.predict(X)
+    scores = model.score_samples(X)
+    return (predictions == -1).tolist(), scores.tolist()
+
+def detect_anomalies(null_percent, volume, schema_change):
+    is_anomaly, _ = score_anomalies([(null_percent, volume, schema_change)])
+    return is_anomaly[0]
+
+
+def anomaly_root_cause(null_percent, volume, schema_change):
+    """Incident category an ML anomaly is filed under, guessed from its features."""
+    if schema_change:
+        return "schema_drift"
+    if volume < 100:
+        return "volume"
+    if null_percent > 20:
+        return "freshness"
+    return "field_health"
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -69,6 +71,20 @@ class Incident(models.Model):
         null=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["related_table", "incident_type", "status"], name="incident_table_type_status"),
+            models.Index(fields=["related_table", "created_at", "id"], name="incident_table_created_id"),
+            # Keyset paging across all of a user's tables walks this backwards
+            models.Index(fields=["created_at", "id"], name="incident_created_id"),
+            # Ongoing incidents are a small, hot slice of the table
+            models.Index(
+                fields=["related_table", "incident_type"],
+                condition=models.Q(status="ongoing"),
+                name="incident_ongoing",
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -87,6 +103,12 @@ class DataQualityCheck(models.Model):
     ]
     check_type = models.CharField(max_length=50, choices=CHECK_TYPE_CHOICES, default="custom")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["table", "check_type", "run_time"], name="check_table_type_run"),
+            models.Index(fields=["table", "run_time"], name="check_table_run"),
+        ]
+
     def __str__(self):
         return f"{self.table.name} - {self.run_time}"
 
@@ -158,6 +180,75 @@ class MetricHistory(models.Model):
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["table", "metric_type", "timestamp"], name="metric_table_type_ts"),
+        ]
+
+class MetricStreamState(models.Model):
+    """Compact online-detector state for one (table, metric) series."""
+    table = models.ForeignKey("DataTable", on_delete=models.CASCADE, related_name="stream_states")
+    metric_type = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+    ewma_mean = models.FloatField(default=0.0)  # deseasonalized level of log1p(value)
+    ewma_var = models.FloatField(default=0.0)  # EWMA variance of the forecast residuals
+    trend = models.FloatField(default=0.0)  # level change per hour
+    seasonal = models.JSONField(default=list, blank=True)  # log offset per hour-of-week bucket
+    recent = models.JSONField(default=list, blank=True)  # ring buffer of the last N values
+    recent_pos = models.IntegerField(default=0)
+    last_observed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("table", "metric_type")
+
+class TableFeatureVector(models.Model):
+    """Latest ML features for a table, kept current by the check runs."""
+    table = models.OneToOneField(DataTable, on_delete=models.CASCADE, related_name="feature_vector")
+    null_percent = models.FloatField(default=0.0)
+    null_percent_lag = models.FloatField(default=0.0)
+    volume = models.FloatField(default=0.0)
+    volume_lag = models.FloatField(default=0.0)
+    volume_delta = models.FloatField(default=0.0)
+    schema_change = models.BooleanField(default=False)
+    freshness_age_hours = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class TableHealthSnapshot(models.Model):
+    """Latest health of a table, refreshed at the end of each check run."""
+    table = models.OneToOneField(DataTable, on_delete=models.CASCADE, related_name="health_snapshot")
+    # Share of the table's checks per type that passed (>= HEALTH_PASS_THRESHOLD), all time
+    volume_score = models.FloatField(null=True, blank=True)
+    freshness_score = models.FloatField(null=True, blank=True)
+    field_health_score = models.FloatField(null=True, blank=True)
+    schema_drift_score = models.FloatField(null=True, blank=True)
+    job_failure_score = models.FloatField(null=True, blank=True)
+    # Lifetime checks and passes per type; the scores above are passed / checks
+    volume_checks = models.IntegerField(default=0)
+    volume_passed = models.IntegerField(default=0)
+    freshness_checks = models.IntegerField(default=0)
+    freshness_passed = models.IntegerField(default=0)
+    field_health_checks = models.IntegerField(default=0)
+    field_health_passed = models.IntegerField(default=0)
+    schema_drift_checks = models.IntegerField(default=0)
+    schema_drift_passed = models.IntegerField(default=0)
+    job_failure_checks = models.IntegerField(default=0)
+    job_failure_passed = models.IntegerField(default=0)
+    health_score = models.FloatField(null=True, blank=True)  # weighted by HEALTH_SCORE_WEIGHTS
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    ongoing_incidents = models.IntegerField(default=0)
+    # Lifetime totals so the all-time average pass rate needs no history scan
+    check_count = models.IntegerField(default=0)
+    passed_percentage_sum = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+class StreamingAnomalyState(models.Model):
+    """Serialized half-space-trees detector for one source connection."""
+    connection = models.OneToOneField(
+        "UserDatabaseConnection", on_delete=models.CASCADE, related_name="streaming_anomaly_state"
+    )
+    state = models.BinaryField()
+    n_seen = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
 class DataQualityRule(models.Model):
     RULE_TYPES = [
@@ -189,6 +280,9 @@ class DataQualityRule(models.Model):
     severity = models.CharField(max_length=10, choices=SEVERITY_LEVELS)
     created_at = models.DateTimeField(auto_now_add=True)
     is_critical = models.BooleanField(default=False)
+    depends_on = models.ManyToManyField(
+        "self", symmetrical=False, blank=True, related_name="dependents"
+    )
 
 
     def __str__(self):
@@ -199,15 +293,59 @@ class RuleExecutionHistory(models.Model):
     STATUS_CHOICES = [
         ("pass", "Pass"),
         ("fail", "Fail"),
+        ("skipped", "Skipped"),
+        ("error", "Error"),  # the rule's SQL failed; see error_message
     ]
 
     rule = models.ForeignKey(DataQualityRule, on_delete=models.CASCADE, related_name="history")
     timestamp = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES)
     failed_rows = models.IntegerField(default=0)
+    failed_rows_margin = models.IntegerField(null=True, blank=True)  # set when failed_rows is a sampled estimate
+    skip_reason = models.CharField(max_length=255, blank=True, null=True)
+    error_message = models.TextField(blank=True, null=True)  # database error for status="error"
 
     def __str__(self):
         return f"{self.rule} @ {self.timestamp} = {self.status}"
+
+
+class HistoryRollup(models.Model):
+    """Hourly/daily aggregate of raw check, metric, rule and incident rows per table and type."""
+    SOURCE_CHOICES = [
+        ("check", "Data Quality Check"),
+        ("metric", "Metric History"),
+        ("rule", "Rule Execution"),
+        ("incident", "Incident"),
+    ]
+    GRANULARITY_CHOICES = [
+        ("hour", "Hourly"),
+        ("day", "Daily"),
+    ]
+
+    table = models.ForeignKey(DataTable, on_delete=models.CASCADE, related_name="rollups")
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    kind = models.CharField(max_length=50)  # check_type, metric_type, rule_type or incident_type
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    min_value = models.FloatField(null=True, blank=True)
+    max_value = models.FloatField(null=True, blank=True)
+    avg_value = models.FloatField(null=True, blank=True)
+    count = models.IntegerField(default=0)
+    failures = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table", "source", "kind", "granularity", "bucket_start"],
+                name="rollup_unique_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["table", "source", "granularity", "bucket_start"], name="rollup_table_source_bucket"),
+        ]
+
+    def __str__(self):
+        return f"{self.table} {self.source}:{self.kind} {self.granularity} @ {self.bucket_start}"
     
 class RuleEngine(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -267,4 +405,39 @@ class LineageEdge(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ("from_node", "to_node", "source", "detail")
\ No newline at end of file
+        unique_together = ("from_node", "to_node", "source", "detail")
+
+
+class CatalogSearchEntry(models.Model):
+    """
+    Denormalized search document per table and per column, kept current by
+    collect_metadata / generate_docs (see utils/catalog_search.py).
+    """
+    KIND_CHOICES = [("table", "Table"), ("column", "Column")]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    connection = models.ForeignKey(UserDatabaseConnection, on_delete=models.CASCADE, null=True, blank=True)
+    table = models.ForeignKey(DataTable, on_delete=models.CASCADE, related_name="search_entries")
+    column = models.ForeignKey(ColumnMetadata, on_delete=models.CASCADE, null=True, blank=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+
+    name = models.CharField(max_length=255)
+    table_name = models.CharField(max_length=255)
+    data_type = models.CharField(max_length=100, blank=True, default="")
+    description = models.TextField(blank=True, default="")
+    tags = models.TextField(blank=True, default="")
+    documentation = models.TextField(blank=True, default="")  # table entries only
+
+    search_vector = SearchVectorField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="catalog_search_vector"),
+            # Substring / typo matches on identifiers; needs the pg_trgm extension
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="catalog_name_trgm"),
+            models.Index(fields=["user", "connection", "kind"], name="catalog_user_conn_kind"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.table_name}.{self.name}" if self.column_id else f"table: {self.name}"
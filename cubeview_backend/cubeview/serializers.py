@@ -84,11 +84,6 @@ class DataTableTagSerializer(serializers.ModelSerializer):
         model = DataTableTag
         fields = '__all__'
 
-class IncidentSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Incident
-        fields = '__all__'
-
 class DataQualityCheckSerializer(serializers.ModelSerializer):
     class Meta:
         model = DataQualityCheck
@@ -99,17 +94,19 @@ class ExportedMetadataSerializer(serializers.ModelSerializer):
         model = ExportedMetadata
         fields = '__all__'
 
+# Keep in step with fast_serialize.INCIDENT_FIELDS, which list endpoints use
 class IncidentSerializer(serializers.ModelSerializer):
-    table_name = serializers.SerializerMethodField()
+    table_name = serializers.ReadOnlyField(source="related_table.name")
+    type = serializers.SerializerMethodField()
 
-    def get_table_name(self, obj):
-        return obj.related_table.name if obj.related_table else None
+    def get_type(self, obj):
+        return obj.incident_type or "Custom"
 
     class Meta:
         model = Incident
         fields = [
-            "id", "title", "description", "incident_type",
-            "status", "created_at", "resolved_at", "table_name"
+            "id", "title", "description", "incident_type", "type", "severity",
+            "status", "created_at", "resolved_at", "related_table", "table_name"
         ]
 
 
@@ -122,15 +119,23 @@ class DataQualityRuleSerializer(serializers.ModelSerializer):
         fields = [
             "id", "user", "table", "table_name", "column",
             "rule_type", "rule_logic", "natural_language",
-            "schedule", "severity", "created_at"
+            "schedule", "severity", "created_at", "depends_on"
         ]
         read_only_fields = ["user", "created_at"]
 
+    def validate_depends_on(self, value):
+        user = self.context["request"].user
+        if any(rule.user_id != user.id for rule in value):
+            raise serializers.ValidationError("Rules can only depend on your own rules.")
+        if self.instance and any(rule.id == self.instance.id for rule in value):
+            raise serializers.ValidationError("A rule cannot depend on itself.")
+        return value
+
 
 class RuleExecutionHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = RuleExecutionHistory
-        fields = ["id", "rule", "timestamp", "status", "failed_rows"]
+        fields = ["id", "rule", "timestamp", "status", "failed_rows", "failed_rows_margin", "skip_reason", "error_message"]
         
 class LineageNodeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,3 +1,51 @@
-from django.test import TestCase
+import math
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .utils.streaming_detector import WARMUP, observe
+
+
+def stream_state():
+    """Unsaved stand-in for MetricStreamState; observe() only touches these fields."""
+    return SimpleNamespace(
+        count=0, ewma_mean=0.0, ewma_var=0.0, trend=0.0, seasonal=[],
+        recent=[], recent_pos=0, last_observed_at=None,
+    )
+
+
+class StreamingDetectorTests(SimpleTestCase):
+    start = datetime(2026, 1, 5)
+    weeks = 4
+
+    def run_series(self, growth_per_hour, daily_swing=0.0):
+        """Hourly row counts growing steadily with an optional daily cycle; returns the anomaly flags."""
+        state, flags = stream_state(), []
+        for hour in range(self.weeks * 168):
+            value = 100000 * (1 + growth_per_hour) ** hour * (1 + daily_swing * math.sin(2 * math.pi * hour / 24))
+            is_anomaly, _, _ = observe(state, value, self.start + timedelta(hours=hour))
+            flags.append(is_anomaly)
+        return state, flags
+
+    def test_steady_growth_is_not_flagged(self):
+        for growth in (0.0005, 0.002, 0.01):
+            for swing in (0.0, 0.2):
+                with self.subTest(growth=growth, swing=swing):
+                    _, flags = self.run_series(growth, swing)
+                    self.assertEqual(sum(flags[WARMUP:]), 0)
+
+    def test_spike_and_drop_on_growing_table_are_flagged(self):
+        state, _ = self.run_series(0.0005, 0.2)
+        hour = self.weeks * 168
+        at = self.start + timedelta(hours=hour)
+        normal = 100000 * 1.0005 ** hour * (1 + 0.2 * math.sin(2 * math.pi * hour / 24))
+
+        is_anomaly, direction, expected = observe(state, normal * 1.5, at)
+        self.assertTrue(is_anomaly)
+        self.assertEqual(direction, "spike")
+        self.assertAlmostEqual(expected / normal, 1.0, delta=0.05)
+
+        is_anomaly, direction, _ = observe(state, normal * 0.6, at + timedelta(hours=1))
+        self.assertTrue(is_anomaly)
+        self.assertEqual(direction, "drop")
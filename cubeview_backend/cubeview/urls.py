@@ -9,6 +9,9 @@ from .views import (
     connect_db,
     collect_metadata,
     dashboard_data,
+    dashboard_bundle,
+    batch,
+    catalog_search,
     fetch_user_tables,
     RegisterView,
     field_metrics,
@@ -25,6 +28,7 @@ from .views import (
     incident_summary,
     recent_incidents,
     table_detail,
+    table_preview,
     list_incidents,
     list_user_tables,
     resolve_incident,
@@ -42,6 +46,8 @@ urlpatterns = [
     # ✅ Dashboard + Metadata
     path("dashboard-summary/", dashboard_summary, name="dashboard-summary"),
     path("dashboard-data/", dashboard_data, name="dashboard-data"),
+    path("dashboard-bundle/", dashboard_bundle, name="dashboard-bundle"),
+    path("batch/", batch, name="batch"),
     path("collect-metadata/", collect_metadata, name="collect-metadata"),
     path("user-tables/", fetch_user_tables, name="fetch-user-tables"),  # ✅ Only one
     # ✅ User DB Connect
@@ -57,7 +63,9 @@ urlpatterns = [
     path("recent-incidents/", recent_incidents, name="recent-incidents"),
     # ✅ Tables & Incidents
     path("table/<int:table_id>/", table_detail),
+    path("table/<int:table_id>/preview/", table_preview, name="table-preview"),
     path("tables/", list_user_tables),
+    path("search/", catalog_search, name="catalog-search"),
     path("incidents/list/", list_incidents),
     path("incidents/<int:pk>/resolve/", resolve_incident),
     path("incidents/filters/", incident_filter_options),
@@ -72,5 +80,6 @@ urlpatterns = [
     path("rules/", DataQualityRuleListCreateView.as_view(), name="rule-list-create"),
     path("rules/<int:pk>/", DataQualityRuleDetailView.as_view(), name="rule-detail"),
     path("lineage/", lineage.get_lineage_graph, name="lineage-default"),
-    path("report-summary/", reports.ReportSummaryAPIView.as_view(), name = "report-summary")
+    path("report-summary/", reports.ReportSummaryAPIView.as_view(), name = "report-summary"),
+    path("report-export/", reports.ReportExportAPIView.as_view(), name="report-export"),
 ]
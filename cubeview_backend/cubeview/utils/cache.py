@@ -0,0 +1,85 @@
+# cubeview/utils/cache.py
+
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+# Safety net only; entries are normally invalidated by bumping the user's version
+DEFAULT_TIMEOUT = 60 * 60
+
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_is_shared():
+    """False when every process has its own cache, so invalidate_user() elsewhere can't evict it."""
+    return settings.CACHES["default"]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+def _version_key(user_id):
+    return f"cubeview:version:{user_id}"
+
+
+def user_version(user_id):
+    """
+    The user's current version token. Tokens are random and never reused, so
+    if the token itself is evicted (file caches cull at random) the new one
+    can't resurrect entries stored under an old one.
+    """
+    token = cache.get(_version_key(user_id))
+    if token is None:
+        token = uuid.uuid4().hex
+        if not cache.add(_version_key(user_id), token, None):
+            # Another process set one first; use theirs
+            token = cache.get(_version_key(user_id)) or token
+    return token
+
+
+def user_cache_key(user_id, *parts):
+    """Key scoped to the user's current data version; stale versions simply stop being read."""
+    return ":".join(["cubeview", str(user_id), str(user_version(user_id)), *map(str, parts)])
+
+
+def invalidate_user(user_id):
+    """Drop every cached value for a user after a check run or incident change."""
+    cache.set(_version_key(user_id), uuid.uuid4().hex, None)
+
+
+def get_or_compute(key, compute, timeout=DEFAULT_TIMEOUT):
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+def cached_user_view(name, timeout=DEFAULT_TIMEOUT):
+    """
+    Cache a read-only function view's 200 responses per user and query string.
+    Place it under @api_view/@permission_classes; entries are evicted by
+    invalidate_user() when that user's data changes. A no-op unless the
+    cache is shared, as a per-process entry would outlive that eviction.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not cache_is_shared():
+                return view(request, *args, **kwargs)
+            params = urlencode(sorted(request.GET.items()))
+            key = user_cache_key(request.user.id, "view", name, params, *args, *kwargs.values())
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,196 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Count, F, Q
+
+from ..models import CatalogSearchEntry, ColumnMetadata, DataTable, DataTableTag
+from .fast_serialize import FieldMap, group_pairs
+
+# Identifiers aren't English prose, so no stemming or stop words
+SEARCH_CONFIG = "simple"
+BATCH_SIZE = 1000
+
+SEARCH_FIELDS = FieldMap(
+    kind="kind",
+    table_id="table_id",
+    column_id="column_id",
+    name="name",
+    table="table_name",
+    data_type="data_type",
+    description="description",
+    tags="tags",
+    rank="rank",
+)
+
+
+def search_vector():
+    """Name ranks above tags and table, which rank above prose and types."""
+    return (
+        SearchVector("name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("table_name", "tags", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", "documentation", weight="C", config=SEARCH_CONFIG)
+        + SearchVector("data_type", weight="D", config=SEARCH_CONFIG)
+    )
+
+
+def ensure_search_extension(using=DEFAULT_DB_ALIAS):
+    """
+    The trigram index and similarity ranking need pg_trgm. Also run before
+    every `migrate` (pre_migrate, see apps.py), since the migration creating
+    the catalog_name_trgm index fails without it.
+    """
+    db = connections[using]
+    if db.vendor == "postgresql":
+        with db.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+# ---------- Indexing ----------
+
+
+def index_tables(table_ids):
+    """
+    Rebuild the search entries of `table_ids` (table + column entries) from
+    current metadata, keeping stored documentation. Called with only the
+    tables collect_metadata changed, so a sync costs O(changed), not O(catalog).
+    Returns the number of entries written.
+    """
+    table_ids = list(table_ids)
+    if not table_ids:
+        return 0
+
+    docs = dict(
+        CatalogSearchEntry.objects.filter(table_id__in=table_ids, kind="table")
+        .values_list("table_id", "documentation")
+    )
+    tags = group_pairs(
+        DataTableTag.objects.filter(table_id__in=table_ids).values_list("table_id", "tag__name")
+    )
+    tables = {
+        row[0]: row
+        for row in DataTable.objects.filter(id__in=table_ids).values_list(
+            "id", "user_id", "connection_id", "name", "description"
+        )
+    }
+
+    entries = []
+    for table_id, user_id, connection_id, name, description in tables.values():
+        entries.append(CatalogSearchEntry(
+            user_id=user_id,
+            connection_id=connection_id,
+            table_id=table_id,
+            kind="table",
+            name=name,
+            table_name=name,
+            description=description or "",
+            tags=" ".join(tags.get(table_id, [])),
+            documentation=docs.get(table_id, ""),
+        ))
+    columns = ColumnMetadata.objects.filter(table_id__in=table_ids).values_list(
+        "id", "table_id", "name", "data_type"
+    )
+    for column_id, table_id, name, data_type in columns.iterator(chunk_size=BATCH_SIZE):
+        _, user_id, connection_id, table_name, _ = tables[table_id]
+        entries.append(CatalogSearchEntry(
+            user_id=user_id,
+            connection_id=connection_id,
+            table_id=table_id,
+            column_id=column_id,
+            kind="column",
+            name=name,
+            table_name=table_name,
+            data_type=data_type or "",
+            tags=" ".join(tags.get(table_id, [])),
+        ))
+
+    with transaction.atomic():
+        CatalogSearchEntry.objects.filter(table_id__in=table_ids).delete()
+        CatalogSearchEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+        # Vectors are computed by the database in one UPDATE
+        CatalogSearchEntry.objects.filter(table_id__in=table_ids).update(search_vector=search_vector())
+    return len(entries)
+
+
+def sync_columns(table, columns):
+    """
+    Bring the table's ColumnMetadata in line with `columns` ([(name, data_type)])
+    by diffing rather than delete + recreate: unchanged rows keep their ids, so
+    the column search entries pointing at them (CASCADE) survive. Re-indexes
+    the table when anything changed; returns whether it did.
+    """
+    current = {name: data_type for name, data_type in columns}
+    existing = {column.name: column for column in ColumnMetadata.objects.filter(table=table)}
+
+    removed = [column.id for name, column in existing.items() if name not in current]
+    retyped = []
+    for name, data_type in current.items():
+        column = existing.get(name)
+        if column and column.data_type != data_type:
+            column.data_type = data_type
+            retyped.append(column)
+    added = [ColumnMetadata(table=table, name=name, data_type=data_type)
+             for name, data_type in current.items() if name not in existing]
+
+    if removed:
+        ColumnMetadata.objects.filter(id__in=removed).delete()
+    if retyped:
+        ColumnMetadata.objects.bulk_update(retyped, ["data_type"])
+    if added:
+        ColumnMetadata.objects.bulk_create(added)
+
+    changed = bool(removed or retyped or added)
+    if changed or not is_indexed(table.id, len(current)):
+        index_tables([table.id])
+    return changed
+
+
+def is_indexed(table_id, column_count):
+    """The table entry and one entry per column are all present."""
+    entries = CatalogSearchEntry.objects.filter(table_id=table_id).aggregate(
+        tables=Count("id", filter=Q(kind="table")),
+        columns=Count("id", filter=Q(kind="column")),
+    )
+    return entries["tables"] == 1 and entries["columns"] == column_count
+
+
+def set_documentation(table_id, documentation):
+    """Store generated docs on the table's entry so they become searchable."""
+    entry = CatalogSearchEntry.objects.filter(table_id=table_id, kind="table")
+    if not entry.exists():
+        index_tables([table_id])
+    entry.update(documentation=documentation or "")
+    # Separate UPDATE: within one, the vector would be built from the old text
+    entry.update(search_vector=search_vector())
+
+
+# ---------- Querying ----------
+
+
+def parse_terms(text):
+    # Split on underscores too, matching how the parser tokenizes snake_case names
+    return re.findall(r"[^\W_]+", (text or "").lower())
+
+
+def search_catalog(user, conn, text, kind=None, offset=0, limit=20):
+    """
+    Ranked matches for `text`: every term as a prefix against the tsvector
+    (GIN), or the whole text trigram-similar to the name (GIN, pg_trgm).
+    Returns (rows, has_more); no count, so a page is one indexed query.
+    """
+    terms = parse_terms(text)
+    if not terms:
+        return [], False
+
+    query = SearchQuery(" & ".join(f"{term}:*" for term in terms), search_type="raw", config=SEARCH_CONFIG)
+    entries = CatalogSearchEntry.objects.filter(user=user, connection=conn)
+    if kind:
+        entries = entries.filter(kind=kind)
+
+    entries = (
+        entries.filter(Q(search_vector=query) | Q(name__trigram_similar=text))
+        .annotate(rank=SearchRank(F("search_vector"), query) + TrigramSimilarity("name", text))
+        .order_by("-rank", "id")
+    )
+    rows = SEARCH_FIELDS.rows(entries.values_list(*SEARCH_FIELDS.paths)[offset:offset + limit + 1])
+    return rows[:limit], len(rows) > limit
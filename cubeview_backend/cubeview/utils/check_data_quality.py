@@ -1,17 +1,31 @@
 import psycopg2
 from psycopg2 import sql
-import datetime
-from datetime import timedelta
 from django.utils import timezone
 from django.db import transaction
 
+from .cache import invalidate_user
+from .catalog_search import sync_columns
+from .constants import CHECK_DEPENDENCIES
 from .custom_rule_executor import execute_custom_rules
+from .feature_store import update_table_features
+from .health_snapshot import refresh_snapshots
+from ..ml.streaming import learn_from_run
+from ..ml.utils import anomaly_root_cause
+from .query_cache import RunQueryCache
+from .reports import precompute_report_presets
+from .rule_dependencies import probe_table
+from .streaming_detector import observe
 from ..models import (
     UserDatabaseConnection, DataTable, ColumnMetadata,
-    Incident, MetricHistory, DataQualityCheck
+    Incident, MetricHistory, DataQualityCheck, MetricStreamState
 )
 
 
+def _blocked(check_type, failed_checks):
+    """Return True if any prerequisite of `check_type` failed on this table."""
+    return any(dep in failed_checks for dep in CHECK_DEPENDENCIES.get(check_type, []))
+
+
 def run_data_quality_checks(user):
     db_conn = UserDatabaseConnection.objects.filter(user=user).first()
     if not db_conn:
@@ -26,246 +40,321 @@ def run_data_quality_checks(user):
             dbname=db_conn.database_name,
         )
         cursor = conn.cursor()
+        # Shared with the custom rules below so repeated queries hit the source once
+        cache = RunQueryCache(cursor)
 
         tables = DataTable.objects.filter(user=user)
 
         total_checks = 0
         failed_checks = 0
+        skipped_checks = 0
         incidents_created = 0
+        table_failures = {}
+        run_features = []
+        run_tables = []
 
-        execute_custom_rules(user)
         now = timezone.now()
 
         for table in tables:
-            table_name = table.name
-
-            # Fetch columns and types
-            cursor.execute(
-                sql.SQL("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s"),
-                [table_name]
-            )
-            columns = cursor.fetchall()
-            column_names = [col for col, _ in columns]
-
-            # --- Volume Check ---
-            cursor.execute(
-                sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name))
-            )
-            row_count = cursor.fetchone()[0]
-            total_checks += 1
-
-            MetricHistory.objects.create(
-                table=table,
-                metric_type="volume",
-                value=row_count,
-                timestamp=now
-            )
-
-            last_7_days = MetricHistory.objects.filter(
-                table=table,
-                metric_type="volume",
-                timestamp__gte=now - timedelta(days=7)
-            ).exclude(value=0).values_list('value', flat=True)
-
-            passed_volume = True
-            if last_7_days:
-                avg_volume = sum(last_7_days) / len(last_7_days)
-                drop_ratio = (avg_volume - row_count) / avg_volume
-                if drop_ratio > 0.5:
-                    passed_volume = False
-            elif row_count == 0:
-                passed_volume = False
-
-            if not passed_volume:
-                failed_checks += 1
-                if not Incident.objects.filter(
-                    related_table=table,
-                    incident_type="volume",
-                    status="ongoing"
-                ).exists():
-                    Incident.objects.create(
-                        title=f"Volume issue in {table_name}",
-                        description=f"Row count is {row_count}.",
-                        related_table=table,
-                        status="ongoing",
-                        severity="high",
-                        incident_type="volume"
-                    )
-                    incidents_created += 1
-            else:
-                Incident.objects.filter(
-                    related_table=table,
-                    incident_type="volume",
-                    status="ongoing"
-                ).update(status="resolved", resolved_at=now)
-
-            DataQualityCheck.objects.create(
-                table=table,
-                run_time=now,
-                passed_percentage=100 if passed_volume else 0,
-                check_type="volume"
-            )
-
-            # --- Field Health Checks ---
-            for col, dtype in columns:
-                total_checks += 1
+            # Checks and the table's feature vector commit together
+            with transaction.atomic():
+                table_name = table.name
 
-                # Null check
-                cursor.execute(
-                    sql.SQL("SELECT COUNT(*) FROM {} WHERE {} IS NULL").format(
-                        sql.Identifier(table_name), sql.Identifier(col)
-                    )
+                # Fetch columns and types
+                columns = cache.fetchall(
+                    sql.SQL("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = %s"),
+                    [table_name]
                 )
-                null_count = cursor.fetchone()[0]
-                null_ratio = null_count / row_count if row_count > 0 else 0
-                passed_null = null_ratio <= 0.5
-
-                # Constant check
-                cursor.execute(
-                    sql.SQL("SELECT COUNT(DISTINCT {}) FROM {}").format(
-                        sql.Identifier(col), sql.Identifier(table_name)
+                column_names = [col for col, _ in columns]
+
+                # --- Volume Check ---
+                row_count, volume_failure = probe_table(cache, table_name)
+                total_checks += 1
+
+                if row_count is None:
+                    # Table is gone from the source; every other check would error out
+                    table_failures[table.id] = volume_failure
+                    failed_checks += 1
+                    skipped_checks += len(columns) + 2
+                    DataQualityCheck.objects.create(
+                        table=table,
+                        run_time=now,
+                        passed_percentage=0,
+                        check_type="volume"
                     )
+                    continue
+
+                MetricHistory.objects.create(
+                    table=table,
+                    metric_type="volume",
+                    value=row_count,
+                    timestamp=now
                 )
-                distinct_count = cursor.fetchone()[0]
-                passed_constant = distinct_count > 1
 
-                score = 100 if passed_null and passed_constant else 50 if passed_null or passed_constant else 0
-                if score < 100:
+                # Online detector: O(1) state update instead of a 7-day history scan
+                volume_state, _ = MetricStreamState.objects.get_or_create(table=table, metric_type="volume")
+                volume_anomaly, direction, expected = observe(volume_state, row_count, now)
+                volume_state.save()
+
+                passed_volume = row_count > 0 and not volume_anomaly
+
+                # Only an empty table blocks dependent checks; a volume drop alone does not
+                table_checks_failed = set()
+                if volume_failure:
+                    table_checks_failed.add("volume")
+                    table_failures[table.id] = volume_failure
+
+                if not passed_volume:
                     failed_checks += 1
                     if not Incident.objects.filter(
                         related_table=table,
-                        incident_type="field_health",
+                        incident_type="volume",
                         status="ongoing"
                     ).exists():
                         Incident.objects.create(
-                            title=f"Field health issue in {col} of {table_name}",
-                            description="High nulls or constant values detected.",
+                            title=f"Volume issue in {table_name}",
+                            description=(
+                                f"Row count is {row_count} ({direction} from ~{expected:.0f} expected)."
+                                if direction else f"Row count is {row_count}."
+                            ),
                             related_table=table,
                             status="ongoing",
-                            severity="medium",
-                            incident_type="field_health"
+                            severity="high",
+                            incident_type="volume"
                         )
                         incidents_created += 1
                 else:
                     Incident.objects.filter(
                         related_table=table,
-                        incident_type="field_health",
+                        incident_type="volume",
                         status="ongoing"
                     ).update(status="resolved", resolved_at=now)
 
                 DataQualityCheck.objects.create(
                     table=table,
                     run_time=now,
-                    passed_percentage=score,
-                    check_type="field_health"
+                    passed_percentage=100 if passed_volume else 0,
+                    check_type="volume"
                 )
 
-            # --- Freshness ---
-            timestamp_columns = [c for c in column_names if c in ['updated_at', 'created_at', 'event_time', 'timestamp']]
-            for ts_col in timestamp_columns:
-                try:
-                    cursor.execute(
-                        sql.SQL("SELECT MAX({}) FROM {}").format(
-                            sql.Identifier(ts_col), sql.Identifier(table_name)
+                # --- Field Health Checks ---
+                if _blocked("field_health", table_checks_failed):
+                    skipped_checks += len(columns)
+                    columns_to_check = []
+                else:
+                    columns_to_check = columns
+
+                null_ratios = []
+                for col, dtype in columns_to_check:
+                    total_checks += 1
+
+                    # Null check
+                    null_count = cache.fetchone(
+                        sql.SQL("SELECT COUNT(*) FROM {} WHERE {} IS NULL").format(
+                            sql.Identifier(table_name), sql.Identifier(col)
                         )
-                    )
-                    last_update = cursor.fetchone()[0]
-                    if last_update:
-                        time_diff = now - last_update
-                        hours_old = time_diff.total_seconds() / 3600
-                        freshness_score = max(0, 100 - min(hours_old, 48))
-
-                        DataQualityCheck.objects.create(
-                            table=table,
-                            run_time=now,
-                            passed_percentage=freshness_score,
-                            check_type="freshness",
+                    )[0]
+                    null_ratio = null_count / row_count if row_count > 0 else 0
+                    null_ratios.append(null_ratio)
+                    passed_null = null_ratio <= 0.5
+
+                    # Constant check
+                    distinct_count = cache.fetchone(
+                        sql.SQL("SELECT COUNT(DISTINCT {}) FROM {}").format(
+                            sql.Identifier(col), sql.Identifier(table_name)
                         )
+                    )[0]
+                    passed_constant = distinct_count > 1
 
-                        if hours_old > 24:
-                            failed_checks += 1
-                            if not Incident.objects.filter(
+                    score = 100 if passed_null and passed_constant else 50 if passed_null or passed_constant else 0
+                    if score < 100:
+                        failed_checks += 1
+                        if not Incident.objects.filter(
+                            related_table=table,
+                            incident_type="field_health",
+                            status="ongoing"
+                        ).exists():
+                            Incident.objects.create(
+                                title=f"Field health issue in {col} of {table_name}",
+                                description="High nulls or constant values detected.",
                                 related_table=table,
-                                incident_type="freshness",
-                                status="ongoing"
-                            ).exists():
-                                Incident.objects.create(
-                                    title=f"Stale data in {table_name}",
-                                    description=f"Last update was {hours_old:.1f} hours ago via `{ts_col}`.",
+                                status="ongoing",
+                                severity="medium",
+                                incident_type="field_health"
+                            )
+                            incidents_created += 1
+                    else:
+                        Incident.objects.filter(
+                            related_table=table,
+                            incident_type="field_health",
+                            status="ongoing"
+                        ).update(status="resolved", resolved_at=now)
+
+                    DataQualityCheck.objects.create(
+                        table=table,
+                        run_time=now,
+                        passed_percentage=score,
+                        check_type="field_health"
+                    )
+
+                # --- Freshness ---
+                timestamp_columns = [c for c in column_names if c in ['updated_at', 'created_at', 'event_time', 'timestamp']]
+                if timestamp_columns and _blocked("freshness", table_checks_failed):
+                    skipped_checks += 1
+                    timestamp_columns = []
+                freshness_age_hours = None
+                for ts_col in timestamp_columns:
+                    try:
+                        last_update = cache.fetchone(
+                            sql.SQL("SELECT MAX({}) FROM {}").format(
+                                sql.Identifier(ts_col), sql.Identifier(table_name)
+                            )
+                        )[0]
+                        if last_update:
+                            time_diff = now - last_update
+                            hours_old = time_diff.total_seconds() / 3600
+                            freshness_age_hours = hours_old
+                            freshness_score = max(0, 100 - min(hours_old, 48))
+
+                            DataQualityCheck.objects.create(
+                                table=table,
+                                run_time=now,
+                                passed_percentage=freshness_score,
+                                check_type="freshness",
+                            )
+
+                            if hours_old > 24:
+                                failed_checks += 1
+                                if not Incident.objects.filter(
                                     related_table=table,
-                                    status="ongoing",
-                                    severity="medium",
-                                    incident_type="freshness"
-                                )
-                                incidents_created += 1
-                        else:
-                            Incident.objects.filter(
-                                related_table=table,
-                                incident_type="freshness",
-                                status="ongoing"
-                            ).update(status="resolved", resolved_at=now)
-                        break
-                except Exception:
-                    continue
+                                    incident_type="freshness",
+                                    status="ongoing"
+                                ).exists():
+                                    Incident.objects.create(
+                                        title=f"Stale data in {table_name}",
+                                        description=f"Last update was {hours_old:.1f} hours ago via `{ts_col}`.",
+                                        related_table=table,
+                                        status="ongoing",
+                                        severity="medium",
+                                        incident_type="freshness"
+                                    )
+                                    incidents_created += 1
+                            else:
+                                Incident.objects.filter(
+                                    related_table=table,
+                                    incident_type="freshness",
+                                    status="ongoing"
+                                ).update(status="resolved", resolved_at=now)
+                            break
+                    except Exception:
+                        conn.rollback()
+                        continue
 
-            # --- Schema Drift ---
-            prev_columns = ColumnMetadata.objects.filter(table=table)
-            prev_schema = {col.name: col.data_type for col in prev_columns}
-            curr_schema = {col: dtype for col, dtype in columns}
+                # --- Schema Drift ---
+                prev_columns = ColumnMetadata.objects.filter(table=table)
+                prev_schema = {col.name: col.data_type for col in prev_columns}
+                curr_schema = {col: dtype for col, dtype in columns}
 
-            added_cols = set(curr_schema.keys()) - set(prev_schema.keys())
-            removed_cols = set(prev_schema.keys()) - set(curr_schema.keys())
-            changed_types = {
-                col: (prev_schema[col], curr_schema[col])
-                for col in curr_schema
-                if col in prev_schema and curr_schema[col] != prev_schema[col]
-            }
+                added_cols = set(curr_schema.keys()) - set(prev_schema.keys())
+                removed_cols = set(prev_schema.keys()) - set(curr_schema.keys())
+                changed_types = {
+                    col: (prev_schema[col], curr_schema[col])
+                    for col in curr_schema
+                    if col in prev_schema and curr_schema[col] != prev_schema[col]
+                }
 
-            drift_detected = bool(added_cols or removed_cols or changed_types)
+                drift_detected = bool(added_cols or removed_cols or changed_types)
 
-            if drift_detected:
-                failed_checks += 1
-                if not Incident.objects.filter(
-                    related_table=table,
-                    incident_type="schema_drift",
-                    status="ongoing"
-                ).exists():
-                    Incident.objects.create(
-                        title=f"Schema drift in {table_name}",
-                        description=f"Added: {added_cols}, Removed: {removed_cols}, Changed: {changed_types}",
+                if drift_detected:
+                    failed_checks += 1
+                    if not Incident.objects.filter(
                         related_table=table,
-                        status="ongoing",
-                        severity="high",
-                        incident_type="schema_drift"
-                    )
-                    incidents_created += 1
-                score = 0
-            else:
-                Incident.objects.filter(
+                        incident_type="schema_drift",
+                        status="ongoing"
+                    ).exists():
+                        Incident.objects.create(
+                            title=f"Schema drift in {table_name}",
+                            description=f"Added: {added_cols}, Removed: {removed_cols}, Changed: {changed_types}",
+                            related_table=table,
+                            status="ongoing",
+                            severity="high",
+                            incident_type="schema_drift"
+                        )
+                        incidents_created += 1
+                    score = 0
+                else:
+                    Incident.objects.filter(
+                        related_table=table,
+                        incident_type="schema_drift",
+                        status="ongoing"
+                    ).update(status="resolved", resolved_at=now)
+                    score = 100
+
+                DataQualityCheck.objects.create(
+                    table=table,
+                    run_time=now,
+                    passed_percentage=score,
+                    check_type="schema_drift"
+                )
+
+                # Diffed, not recreated, so column search entries survive the run
+                sync_columns(table, columns)
+
+                # --- ML features ---
+                vector = update_table_features(
+                    table,
+                    null_percent=100 * sum(null_ratios) / len(null_ratios) if null_ratios else 0.0,
+                    volume=row_count,
+                    schema_change=drift_detected,
+                    freshness_age_hours=freshness_age_hours,
+                )
+                run_features.append((vector.null_percent, vector.volume, 1 if vector.schema_change else 0))
+                run_tables.append(table)
+
+        # Keep the streaming anomaly detector current without batch retraining
+        flags, scores = learn_from_run(db_conn, run_features)
+        streaming_anomalies = []
+        for table, features, is_anomaly, score in zip(run_tables, run_features, flags, scores):
+            if not is_anomaly:
+                continue
+            incident_type = anomaly_root_cause(*features)
+            streaming_anomalies.append({"table": table.name, "score": round(score, 4), "root_cause": incident_type})
+            # The check that owns this category resolves it once the table recovers
+            if not Incident.objects.filter(
+                related_table=table,
+                incident_type=incident_type,
+                status="ongoing"
+            ).exists():
+                Incident.objects.create(
+                    title=f"ML Anomaly Detected in {table.name}",
+                    description=(
+                        f"Streaming detector flagged table '{table.name}' (score {score:.4f})\n"
+                        f"Root cause: {incident_type.replace('_', ' ').title()}"
+                    ),
                     related_table=table,
-                    incident_type="schema_drift",
-                    status="ongoing"
-                ).update(status="resolved", resolved_at=now)
-                score = 100
-
-            DataQualityCheck.objects.create(
-                table=table,
-                run_time=now,
-                passed_percentage=score,
-                check_type="schema_drift"
-            )
-
-            ColumnMetadata.objects.filter(table=table).delete()
-            ColumnMetadata.objects.bulk_create([
-                ColumnMetadata(table=table, name=col, data_type=dtype)
-                for col, dtype in columns
-            ])
+                    status="ongoing",
+                    severity="high",
+                    incident_type=incident_type
+                )
+                incidents_created += 1
+
+        # Custom rules run last so they can skip tables the checks found broken
+        rule_summary = execute_custom_rules(user, cache=cache, table_failures=table_failures)
+
+        # Dashboards read these instead of aggregating the whole check history
+        refresh_snapshots([table.id for table in tables], now)
+        invalidate_user(user.id)
+        precompute_report_presets(user)
 
         return {
             "status": "completed",
             "total_checks": total_checks,
             "failed_checks": failed_checks,
-            "incidents_created": incidents_created
+            "skipped_checks": skipped_checks,
+            "incidents_created": incidents_created,
+            "streaming_anomalies": streaming_anomalies,
+            "rules": rule_summary,
+            "query_cache": cache.stats(),
         }
 
     finally:
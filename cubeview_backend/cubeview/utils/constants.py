@@ -5,3 +5,14 @@ HEALTH_SCORE_WEIGHTS = {
     "schema_drift": 0.15,
     "job_failure": 0.15,
 }
+
+# A check counts as passed for the health score at or above this percentage
+HEALTH_PASS_THRESHOLD = 95
+
+# Built-in checks that only make sense once the table's volume check passed
+CHECK_DEPENDENCIES = {
+    "volume": [],
+    "field_health": ["volume"],
+    "freshness": ["volume"],
+    "schema_drift": [],
+}
@@ -1,9 +1,109 @@
+import logging
+
 import psycopg2
+from django.conf import settings
 from ..models import DataQualityRule, RuleExecutionHistory, Incident, UserDatabaseConnection
-from datetime import datetime
+from .query_cache import RunQueryCache
+from .regex_sampling import evaluate_regex_rule_sampled
+from .rule_dependencies import order_rules, probe_table, skip_reason
+
+logger = logging.getLogger(__name__)
+
+
+def run_rule_set(rules, cache, table_failures=None):
+    """
+    Evaluate `rules` through the run's query cache in dependency order.
+    Column rules on tables whose volume prerequisite failed, and rules whose
+    prerequisite rules failed, errored or were skipped, are recorded as skipped
+    without touching the source DB. A rule whose SQL errors is recorded as
+    "error" with the database message in error_message; it says nothing about
+    the data, so it never opens an incident.
+    """
+    table_failures = dict(table_failures or {})
+    probed = set(table_failures)
+    statuses = {}
+    summary = {"executed": 0, "failed": 0, "skipped": 0, "errors": 0}
+
+    rules = list(rules.select_related("table").prefetch_related("depends_on"))
+    ordered, cyclic = order_rules(rules)
+
+    for rule in cyclic:
+        RuleExecutionHistory.objects.create(
+            rule=rule,
+            status="skipped",
+            skip_reason="Rule is part of a dependency cycle",
+        )
+        statuses[rule.id] = "skipped"
+        summary["skipped"] += 1
+
+    for rule in ordered:
+        if rule.column and rule.table_id not in probed:
+            _, reason = probe_table(cache, rule.table.name)
+            probed.add(rule.table_id)
+            if reason:
+                table_failures[rule.table_id] = reason
+
+        reason = skip_reason(rule, statuses, table_failures)
+        if reason:
+            RuleExecutionHistory.objects.create(rule=rule, status="skipped", skip_reason=reason)
+            statuses[rule.id] = "skipped"
+            summary["skipped"] += 1
+            continue
+
+        margin = None
+        summary["executed"] += 1
+        try:
+            estimate = None
+            if rule.rule_type == "regex_check" and settings.REGEX_RULE_EVALUATION == "sampled":
+                estimate = evaluate_regex_rule_sampled(rule, cache)
+
+            if estimate is not None:
+                failed_rows = estimate["failed_rows"]
+                margin = estimate["margin"]
+            else:
+                result = cache.fetchone(rule.rule_logic)
+                failed_rows = int(result[0]) if result and result[0] is not None else 0
+        except psycopg2.Error as e:
+            cache.cursor.connection.rollback()
+            logger.warning("Rule %s failed to execute: %s", rule.id, e)
+            RuleExecutionHistory.objects.create(
+                rule=rule,
+                status="error",
+                error_message=str(e).strip(),
+            )
+            statuses[rule.id] = "error"
+            summary["errors"] += 1
+            continue
+
+        status = "pass" if failed_rows == 0 else "fail"
+        statuses[rule.id] = status
+
+        RuleExecutionHistory.objects.create(
+            rule=rule,
+            status=status,
+            failed_rows=failed_rows,
+            failed_rows_margin=margin,
+        )
+
+        if status == "fail":
+            summary["failed"] += 1
+            if rule.severity == "critical":
+                Incident.objects.create(
+                    title=f"Rule Failed: {rule.natural_language or rule.rule_type}",
+                    description=f"{failed_rows} rows failed for rule on {rule.table.name}.{rule.column}",
+                    related_table=rule.table,
+                    incident_type="Custom",
+                    severity="high",
+                )
+
+    return summary
+
+
+def execute_custom_rules(user, cache=None, table_failures=None):
+    # Reuse the caller's run cache (and its source connection) when given one
+    if cache is not None:
+        return run_rule_set(DataQualityRule.objects.filter(user=user), cache, table_failures)
 
-def execute_custom_rules(user):
-    # Get DB connection for the user
     db_conn = UserDatabaseConnection.objects.filter(user=user).first()
     if not db_conn:
         return
@@ -18,47 +118,13 @@ def execute_custom_rules(user):
         )
         cursor = conn.cursor()
 
-        rules = DataQualityRule.objects.filter(user=user)
-        for rule in rules:
-            try:
-                cursor.execute(rule.sql)
-                result = cursor.fetchone()
-                passed = result and result[0]  # Expecting result like [(True,)] or [(False,)]
-
-                # Log execution history
-                RuleExecutionHistory.objects.create(
-                    rule=rule,
-                    executed_at=datetime.now(),
-                    passed=passed
-                )
-
-                # Create incident if failed
-                if not passed:
-                    Incident.objects.create(
-                        user=user,
-                        table=rule.table,
-                        incident_type="Custom",
-                        severity="high",
-                        description=f"Rule failed: {rule.description}"
-                    )
-
-            except Exception as e:
-                RuleExecutionHistory.objects.create(
-                    rule=rule,
-                    executed_at=datetime.now(),
-                    passed=False,
-                    notes=str(e)
-                )
-                Incident.objects.create(
-                    user=user,
-                    table=rule.table,
-                    incident_type="Custom",
-                    severity="high",
-                    description=f"Rule execution error: {e}"
-                )
+        cache = RunQueryCache(cursor)
+        summary = run_rule_set(DataQualityRule.objects.filter(user=user), cache, table_failures)
+        summary["query_cache"] = cache.stats()
 
         cursor.close()
         conn.close()
+        return summary
 
-    except Exception as err:
-        print(f"DB Error in execute_custom_rules: {err}")
+    except Exception:
+        logger.exception("DB error in execute_custom_rules for user %s", user.id)
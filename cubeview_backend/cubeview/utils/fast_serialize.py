@@ -0,0 +1,163 @@
+"""
+Fast serialization path for the high-volume list endpoints.
+
+Rows are read with `.values_list()` (no model instances, no per-row related
+lookups) and turned into dicts through a FieldMap whose keys and ORM paths are
+resolved once at import time. FastJSONRenderer then encodes the result with
+orjson when it is installed.
+"""
+from decimal import Decimal
+
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional; DRF's encoder is used instead
+    orjson = None
+
+
+class FieldMap:
+    """
+    Output key -> ORM path, optionally with a default that replaces falsy values:
+
+        FieldMap(id="id", table=("related_table__name", "N/A"))
+    """
+
+    def __init__(self, **fields):
+        self.keys = tuple(fields)
+        self.paths = tuple(spec[0] if isinstance(spec, tuple) else spec for spec in fields.values())
+        self.defaults = tuple(
+            (index, spec[1]) for index, spec in enumerate(fields.values()) if isinstance(spec, tuple)
+        )
+
+    def row(self, values):
+        if self.defaults:
+            values = list(values)
+            for index, default in self.defaults:
+                values[index] = values[index] or default
+        return dict(zip(self.keys, values))
+
+    def rows(self, tuples):
+        return [self.row(values) for values in tuples]
+
+    def serialize(self, queryset):
+        return self.rows(queryset.values_list(*self.paths))
+
+    def values(self, queryset):
+        """`.values()` rows keyed by ORM path, for paginators that read fields by name."""
+        return queryset.values(*self.paths)
+
+    def from_values(self, dicts):
+        return self.rows([tuple(d[path] for path in self.paths) for d in dicts])
+
+
+def group_pairs(pairs):
+    """[(key, value), ...] -> {key: [value, ...]} for to-many fields read in one query."""
+    grouped = {}
+    for key, value in pairs:
+        grouped.setdefault(key, []).append(value)
+    return grouped
+
+
+# ---------- Field maps ----------
+
+INCIDENT_FIELDS = FieldMap(
+    id="id",
+    title="title",
+    description="description",
+    incident_type="incident_type",
+    type=("incident_type", "Custom"),
+    severity="severity",
+    status="status",
+    created_at="created_at",
+    resolved_at="resolved_at",
+    related_table="related_table_id",
+    table_name="related_table__name",
+)
+
+INCIDENT_LIST_FIELDS = FieldMap(
+    id="id",
+    title="title",
+    status="status",
+    type=("incident_type", "Unknown"),
+    severity="severity",
+    table=("related_table__name", "N/A"),
+    created_at="created_at",
+    description="description",
+    resolved_at="resolved_at",
+)
+
+TABLE_FIELDS = FieldMap(
+    id="id",
+    name="name",
+    source="source",
+    description="description",
+    created_at="created_at",
+    last_updated="last_updated",
+    health_score="health_snapshot__health_score",
+    last_checked="health_snapshot__last_run_at",
+    ongoing_incidents=("health_snapshot__ongoing_incidents", 0),
+)
+
+RULE_FIELDS = FieldMap(
+    id="id",
+    user="user_id",
+    table="table_id",
+    table_name="table__name",
+    column="column",
+    rule_type="rule_type",
+    rule_logic="rule_logic",
+    natural_language="natural_language",
+    schedule="schedule",
+    severity="severity",
+    created_at="created_at",
+)
+
+# Paths refer to annotations added by the lineage view
+LINEAGE_NODE_FIELDS = FieldMap(
+    id="id",
+    label="node_label",
+    type="node_type",
+    table="node_table",
+    column="node_column",
+)
+
+LINEAGE_EDGE_FIELDS = FieldMap(
+    **{"from": "from_node_id", "to": "to_node_id"},
+    source="source",
+    detail="detail",
+)
+
+
+# ---------- Renderer ----------
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "tolist"):  # numpy scalars and arrays from the ML views
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson when available; output matches DRF's for plain data."""
+
+    options = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Indented output (browsable API, ?indent=) is rare; leave it to DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(data, default=_default, option=self.options)
+        except TypeError:
+            # Anything orjson can't encode (timedeltas, ...) goes through DRF's encoder
+            return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,23 @@
+from ..models import TableFeatureVector
+
+
+def update_table_features(table, null_percent, volume, schema_change, freshness_age_hours):
+    """
+    Shift the current features into the lag slots and store the new ones.
+    Call inside the check run's transaction so features and checks agree.
+    """
+    vector, created = TableFeatureVector.objects.select_for_update().get_or_create(table=table)
+    if not created:
+        vector.null_percent_lag = vector.null_percent
+        vector.volume_lag = vector.volume
+    else:
+        vector.null_percent_lag = null_percent
+        vector.volume_lag = volume
+
+    vector.null_percent = null_percent
+    vector.volume = volume
+    vector.volume_delta = volume - vector.volume_lag
+    vector.schema_change = schema_change
+    vector.freshness_age_hours = freshness_age_hours
+    vector.save()
+    return vector
@@ -0,0 +1,144 @@
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from ..models import DataQualityCheck, Incident, TableHealthSnapshot
+from .constants import HEALTH_PASS_THRESHOLD, HEALTH_SCORE_WEIGHTS
+
+SCORE_FIELDS = {check_type: f"{check_type}_score" for check_type in HEALTH_SCORE_WEIGHTS}
+# check type -> (lifetime checks field, lifetime passed field)
+COUNT_FIELDS = {check_type: (f"{check_type}_checks", f"{check_type}_passed") for check_type in HEALTH_SCORE_WEIGHTS}
+UPDATE_FIELDS = [
+    *SCORE_FIELDS.values(),
+    *(field for fields in COUNT_FIELDS.values() for field in fields),
+    "health_score",
+    "last_run_at",
+    "ongoing_incidents",
+    "check_count",
+    "passed_percentage_sum",
+    "updated_at",
+]
+
+
+def pass_share(passed, checks):
+    """Percentage of checks that passed, or None without checks."""
+    return passed / checks * 100 if checks else None
+
+
+def _type_counts(checks):
+    """Per (table, check type): checks, passes, passed_percentage total and last run."""
+    return (
+        checks.values("table_id", "check_type")
+        .annotate(
+            n=Count("id"),
+            passed=Count("id", filter=Q(passed_percentage__gte=HEALTH_PASS_THRESHOLD)),
+            total=Sum("passed_percentage"),
+            last=Max("run_time"),
+        )
+        .order_by()
+    )
+
+
+def _add_counts(snapshot, row):
+    snapshot.check_count += row["n"]
+    snapshot.passed_percentage_sum += row["total"] or 0
+    fields = COUNT_FIELDS.get(row["check_type"])
+    if fields:
+        checks_field, passed_field = fields
+        setattr(snapshot, checks_field, getattr(snapshot, checks_field) + row["n"])
+        setattr(snapshot, passed_field, getattr(snapshot, passed_field) + row["passed"])
+        setattr(
+            snapshot, SCORE_FIELDS[row["check_type"]],
+            pass_share(getattr(snapshot, passed_field), getattr(snapshot, checks_field)),
+        )
+
+
+def weighted_health(scores):
+    """Weighted average of the per-type scores present, normalized by their weights."""
+    total = weight_sum = 0.0
+    for check_type, weight in HEALTH_SCORE_WEIGHTS.items():
+        score = scores.get(check_type)
+        if score is None:
+            continue
+        total += score * weight
+        weight_sum += weight
+    return total / weight_sum if weight_sum else None
+
+
+def _ongoing_counts(table_ids):
+    return dict(
+        Incident.objects.filter(related_table_id__in=table_ids, status="ongoing")
+        .values("related_table_id")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("related_table_id", "n")
+    )
+
+
+def _load(table_ids):
+    """Existing snapshots for `table_ids`, plus unsaved ones for tables without one."""
+    snapshots = {s.table_id: s for s in TableHealthSnapshot.objects.filter(table_id__in=table_ids)}
+    existing = set(snapshots)
+    for table_id in table_ids:
+        snapshots.setdefault(table_id, TableHealthSnapshot(table_id=table_id))
+    return snapshots, existing
+
+
+def _finish(snapshots, existing):
+    ongoing = _ongoing_counts(list(snapshots))
+    now = timezone.now()
+    for table_id, snapshot in snapshots.items():
+        snapshot.health_score = weighted_health(
+            {check_type: getattr(snapshot, field) for check_type, field in SCORE_FIELDS.items()}
+        )
+        snapshot.ongoing_incidents = ongoing.get(table_id, 0)
+        snapshot.updated_at = now
+
+    TableHealthSnapshot.objects.bulk_create([s for t, s in snapshots.items() if t not in existing])
+    TableHealthSnapshot.objects.bulk_update([s for t, s in snapshots.items() if t in existing], UPDATE_FIELDS)
+
+
+def refresh_snapshots(table_ids, run_time):
+    """
+    Fold one run's checks (all stamped `run_time`) into the tables' lifetime
+    counts and recount their ongoing incidents: two aggregate reads and a bulk write.
+    """
+    snapshots, existing = _load(list(table_ids))
+
+    run = _type_counts(DataQualityCheck.objects.filter(table_id__in=list(snapshots), run_time=run_time))
+    for row in run:
+        snapshot = snapshots[row["table_id"]]
+        snapshot.last_run_at = run_time
+        _add_counts(snapshot, row)
+
+    _finish(snapshots, existing)
+
+
+def refresh_ongoing_incidents(table_ids):
+    """Recount ongoing incidents after incidents were opened or resolved outside a check run."""
+    table_ids = list(table_ids)
+    ongoing = _ongoing_counts(table_ids)
+    snapshots = list(TableHealthSnapshot.objects.filter(table_id__in=table_ids))
+    now = timezone.now()
+    for snapshot in snapshots:
+        snapshot.ongoing_incidents = ongoing.get(snapshot.table_id, 0)
+        snapshot.updated_at = now
+    TableHealthSnapshot.objects.bulk_update(snapshots, ["ongoing_incidents", "updated_at"])
+
+
+def rebuild_snapshots(table_ids):
+    """Recompute snapshots from the stored check history (backfill or repair)."""
+    table_ids = list(table_ids)
+    snapshots, existing = _load(table_ids)
+    for snapshot in snapshots.values():
+        snapshot.check_count, snapshot.passed_percentage_sum, snapshot.last_run_at = 0, 0.0, None
+        for check_type, (checks_field, passed_field) in COUNT_FIELDS.items():
+            setattr(snapshot, checks_field, 0)
+            setattr(snapshot, passed_field, 0)
+            setattr(snapshot, SCORE_FIELDS[check_type], None)
+
+    for row in _type_counts(DataQualityCheck.objects.filter(table_id__in=table_ids)):
+        snapshot = snapshots[row["table_id"]]
+        snapshot.last_run_at = max(filter(None, [snapshot.last_run_at, row["last"]]))
+        _add_counts(snapshot, row)
+
+    _finish(snapshots, existing)
@@ -1,4 +1,6 @@
 from django.db import connection, transaction
+from django.db.models import Case, Value, When
+from django.db.models.functions import Coalesce, Concat
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,6 +12,7 @@ from ..models import (
     LineageNode,
     LineageEdge,
 )
+from .fast_serialize import LINEAGE_EDGE_FIELDS, LINEAGE_NODE_FIELDS
 
 @transaction.atomic
 def sync_lineage_from_foreign_keys(user):
@@ -135,28 +138,22 @@ def get_lineage_graph(request):
     if not connection:
         return Response({"nodes": [], "edges": []})
 
-    nodes_qs = LineageNode.objects.filter(user=user, connection=connection)
+    # Same values as LineageNode.label() and the FK-or-fallback names, computed in SQL
+    label_table = Coalesce("table_name", "table__name", Value(""))
+    nodes_qs = LineageNode.objects.filter(user=user, connection=connection).annotate(
+        node_table=Coalesce("table__name", "table_name"),
+        node_column=Coalesce("column__name", "column_name"),
+        node_label=Case(
+            When(
+                node_type=LineageNode.FIELD,
+                then=Concat(label_table, Value("."), Coalesce("column_name", "column__name", Value(""))),
+            ),
+            default=label_table,
+        ),
+    )
     edges_qs = LineageEdge.objects.filter(from_node__user=user, from_node__connection=connection)
 
-    nodes = [
-        {
-            "id": node.id,
-            "label": node.label(),
-            "type": node.node_type,
-            "table": node.table.name if node.table else node.table_name,
-            "column": node.column.name if node.column else node.column_name,
-        }
-        for node in nodes_qs
-    ]
-
-    edges = [
-        {
-            "from": edge.from_node.id,
-            "to": edge.to_node.id,
-            "source": edge.source,
-            "detail": edge.detail,
-        }
-        for edge in edges_qs
-    ]
+    nodes = LINEAGE_NODE_FIELDS.serialize(nodes_qs)
+    edges = LINEAGE_EDGE_FIELDS.serialize(edges_qs)
 
     return Response({"nodes": nodes, "edges": edges})
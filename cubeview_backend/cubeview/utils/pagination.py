@@ -0,0 +1,118 @@
+import base64
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first cursor pagination on (time_field, id).
+
+    Each page is a range scan starting right after the last row seen, so deep
+    pages cost the same as the first and rows inserted meanwhile never shift
+    or duplicate entries; id breaks ties between equal timestamps. The cursor
+    is an opaque base64 token; the total count is only computed for the first
+    page.
+    """
+
+    time_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def __init__(self, time_field=None, page_size=None, max_page_size=None):
+        self.time_field = time_field or self.time_field
+        self.page_size = page_size or settings.INCIDENT_PAGE_SIZE
+        self.max_page_size = max_page_size or settings.INCIDENT_MAX_PAGE_SIZE
+
+    # ---------- cursor encoding ----------
+
+    def encode_cursor(self, row, reverse=False):
+        # Rows are model instances or `.values()` dicts from the fast serialization path
+        if isinstance(row, dict):
+            at, pk = row[self.time_field], row["id"]
+        else:
+            at, pk = getattr(row, self.time_field), row.pk
+        payload = {"t": at.isoformat(), "id": pk}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, token):
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            return datetime.fromisoformat(payload["t"]), int(payload["id"]), bool(payload.get("r"))
+        except (ValueError, KeyError, TypeError):
+            raise NotFound("Invalid cursor.")
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ---------- paging ----------
+
+    def page_queryset(self, queryset, token, size):
+        """
+        (queryset, reverse): the filtered, ordered slice one page reads, size + 1
+        rows to detect a next page. Split out so check_query_plans can EXPLAIN it.
+        """
+        field = self.time_field
+        if not token:
+            return queryset.order_by(f"-{field}", "-pk")[: size + 1], False
+        at, pk, reverse = self.decode_cursor(token)
+        if reverse:
+            after = Q(**{f"{field}__gt": at}) | Q(**{field: at, "pk__gt": pk})
+            queryset = queryset.filter(after).order_by(field, "pk")
+        else:
+            before = Q(**{f"{field}__lt": at}) | Q(**{field: at, "pk__lt": pk})
+            queryset = queryset.filter(before).order_by(f"-{field}", "-pk")
+        return queryset[: size + 1], reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        size = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+
+        self.count = None if token else queryset.count()
+        page, reverse = self.page_queryset(queryset, token, size)
+
+        rows = list(page)
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        # Going forward there is a previous page iff we came from one; backward, the reverse
+        has_next = has_more if not reverse else True
+        has_previous = bool(token) if not reverse else has_more
+        self.next_cursor = self.encode_cursor(rows[-1]) if rows and has_next else None
+        self.previous_cursor = self.encode_cursor(rows[0], reverse=True) if rows and has_previous else None
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self._link(self.next_cursor),
+                "previous": self._link(self.previous_cursor),
+                "next_cursor": self.next_cursor,
+                "previous_cursor": self.previous_cursor,
+                "results": data,
+            }
+        )
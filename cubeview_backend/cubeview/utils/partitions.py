@@ -0,0 +1,209 @@
+import datetime
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from ..models import DataQualityCheck, MetricHistory
+from .rollups import latest_daily_bucket
+
+# History models stored as range-partitioned tables, with their partition key
+PARTITIONED_MODELS = [(MetricHistory, "timestamp"), (DataQualityCheck, "run_time")]
+
+_SUFFIX_RE = re.compile(r"_p(\d{8}|\d{6})$")
+
+
+def _floor(day, interval):
+    return day if interval == "day" else day.replace(day=1)
+
+
+def _next(start, interval):
+    if interval == "day":
+        return start + datetime.timedelta(days=1)
+    return (start.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _starts(first, last, interval):
+    start = _floor(first, interval)
+    while start <= last:
+        yield start
+        start = _next(start, interval)
+
+
+def _utc_date(value):
+    return value.astimezone(datetime.timezone.utc).date()
+
+
+def partition_name(table, start, interval):
+    return f"{table}_p{start:%Y%m%d}" if interval == "day" else f"{table}_p{start:%Y%m}"
+
+
+def partition_bounds(name):
+    """(start, end) dates encoded in a partition's name, or None for the default partition."""
+    match = _SUFFIX_RE.search(name)
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 8:
+        start = datetime.date(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+        return start, _next(start, "day")
+    start = datetime.date(int(digits[:4]), int(digits[4:6]), 1)
+    return start, _next(start, "month")
+
+
+def is_partitioned(table):
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [table])
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_partition(cursor, table, start, interval):
+    """Create the partition covering [start, next interval) in UTC; no-op if it exists."""
+    qn = connection.ops.quote_name
+    name = partition_name(table, start, interval)
+    cursor.execute(
+        f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+        f"FOR VALUES FROM (%s) TO (%s)",
+        [f"{start.isoformat()} 00:00:00+00", f"{_next(start, interval).isoformat()} 00:00:00+00"],
+    )
+    return name
+
+
+def ensure_partitions(today=None):
+    """Create partitions from the current interval through HISTORY_PARTITIONS_AHEAD more."""
+    interval = settings.HISTORY_PARTITION_INTERVAL
+    today = today or _utc_date(timezone.now())
+    created = []
+    for model, _ in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table):
+            continue
+        existing = set(list_partitions(table))
+        last = _floor(today, interval)
+        for _ in range(settings.HISTORY_PARTITIONS_AHEAD):
+            last = _next(last, interval)
+        with connection.cursor() as cursor:
+            for start in _starts(today, last, interval):
+                if partition_name(table, start, interval) not in existing:
+                    created.append(create_partition(cursor, table, start, interval))
+    return created
+
+
+def drop_expired_partitions(today=None):
+    """
+    Enforce HISTORY_RETENTION_DAYS by detaching and dropping whole partitions
+    whose range ends before the cutoff; a metadata-only operation per partition
+    instead of a DELETE over millions of rows. Partitions still holding rows
+    newer than the last completed daily rollup are kept, so history is never
+    dropped before it has been rolled up.
+    """
+    if settings.HISTORY_RETENTION_DAYS <= 0:
+        return []
+    rolled_through = latest_daily_bucket()
+    if rolled_through is None:
+        return []
+    qn = connection.ops.quote_name
+    today = today or _utc_date(timezone.now())
+    cutoff = today - datetime.timedelta(days=settings.HISTORY_RETENTION_DAYS)
+    dropped = []
+    for model, _ in PARTITIONED_MODELS:
+        table = model._meta.db_table
+        if not is_partitioned(table):
+            continue
+        for name in list_partitions(table):
+            bounds = partition_bounds(name)
+            if bounds is None or bounds[1] > cutoff:
+                continue
+            # Bounds are UTC midnights; the newest daily bucket may still be filling up
+            upper = datetime.datetime.combine(bounds[1], datetime.time.min, tzinfo=datetime.timezone.utc)
+            if upper > rolled_through:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                cursor.execute(f"DROP TABLE {qn(name)}")
+            dropped.append(name)
+    return dropped
+
+
+def maintain_partitions():
+    if connection.vendor != "postgresql":
+        return {"created": [], "dropped": []}
+    return {"created": ensure_partitions(), "dropped": drop_expired_partitions()}
+
+
+def convert_to_partitioned(model, field_name):
+    """
+    Rebuild a plain history table as a range-partitioned one, in one transaction.
+    Rows are copied into per-interval partitions (plus a DEFAULT partition for
+    stragglers), the id sequence continues where it left off, and the original
+    secondary indexes and foreign keys are recreated on the partitioned parent.
+    The primary key becomes (id, partition key), as Postgres requires.
+    """
+    qn = connection.ops.quote_name
+    interval = settings.HISTORY_PARTITION_INTERVAL
+    table = model._meta.db_table
+    column = model._meta.get_field(field_name).column
+    legacy = f"{table}_legacy"
+    sequence = f"{table}_id_part_seq"
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(
+            "SELECT pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = %s::regclass AND NOT indisprimary",
+            [table],
+        )
+        index_defs = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT MIN({qn(column)}), MAX({qn(column)}), MAX(id) FROM {qn(table)}")
+        oldest, newest, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(
+            f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({qn(column)})"
+        )
+        # A sequence owned by the new table, so dropping the old one can't take ids with it
+        cursor.execute(f"CREATE SEQUENCE {qn(sequence)}")
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval(%s::regclass)", [sequence])
+        cursor.execute(f"ALTER SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+        cursor.execute("SELECT setval(%s::regclass, %s, false)", [sequence, (max_id or 0) + 1])
+
+        today = _utc_date(timezone.now())
+        last = _floor(max(_utc_date(newest), today) if newest else today, interval)
+        for _ in range(settings.HISTORY_PARTITIONS_AHEAD):
+            last = _next(last, interval)
+        for start in _starts(_utc_date(oldest) if oldest else today, last, interval):
+            create_partition(cursor, table, start, interval)
+        cursor.execute(f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(legacy)}")
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+
+        # Names are free again now that the old table is gone
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD PRIMARY KEY (id, {qn(column)})")
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        # Definitions were read before the rename, so they already target the new parent
+        for definition in index_defs:
+            cursor.execute(definition)
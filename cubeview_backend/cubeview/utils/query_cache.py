@@ -0,0 +1,76 @@
+import re
+
+from psycopg2 import sql
+
+# Quoted literals/identifiers are kept verbatim; everything else is case-folded
+_TOKEN_RE = re.compile(r"""('(?:[^']|'')*')|("(?:[^"]|"")*")|(\s+)|([^'"\s]+)""")
+_SIMPLE_IDENT_RE = re.compile(r'^"([a-z_][a-z0-9_]*)"$')
+
+
+def normalize_sql(query):
+    """
+    Normalize SQL so equivalent statements share a cache key.
+    Collapses whitespace, drops a trailing semicolon, lowercases unquoted text
+    and unquotes identifiers that Postgres would fold to the same name anyway,
+    so `SELECT COUNT(*) FROM "orders"` and `select count(*) from orders;` match.
+    """
+    query = query.strip().rstrip(";").strip()
+    if "$" in query:
+        # Dollar-quoted bodies can't be case-folded safely; only collapse whitespace
+        return " ".join(query.split())
+
+    parts = []
+    for literal, ident, space, word in _TOKEN_RE.findall(query):
+        if literal:
+            parts.append(literal)
+        elif ident:
+            match = _SIMPLE_IDENT_RE.match(ident)
+            parts.append(match.group(1) if match else ident)
+        elif space:
+            parts.append(" ")
+        else:
+            parts.append(word.lower())
+    return "".join(parts).strip()
+
+
+class RunQueryCache:
+    """
+    Memoizes read-only query results on one source-DB cursor for a single run.
+    Checks and rules go through `fetchone`/`fetchall` so identical statements
+    (the volume COUNT(*), a rule's COUNT(*), MAX(updated_at), ...) hit the
+    source DB once per run.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.hits = 0
+        self.misses = 0
+        self._results = {}
+
+    def _key(self, query, params):
+        if isinstance(query, sql.Composable):
+            query = query.as_string(self.cursor)
+        normalized = normalize_sql(query)
+        if not normalized.startswith(("select", "with")):
+            return None
+        return normalized, tuple(params or ())
+
+    def fetchall(self, query, params=None):
+        key = self._key(query, params)
+        if key is not None and key in self._results:
+            self.hits += 1
+            return self._results[key]
+
+        self.misses += 1
+        self.cursor.execute(query, params)
+        rows = self.cursor.fetchall()
+        if key is not None:
+            self._results[key] = rows
+        return rows
+
+    def fetchone(self, query, params=None):
+        rows = self.fetchall(query, params)
+        return rows[0] if rows else None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
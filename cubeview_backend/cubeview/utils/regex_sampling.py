@@ -0,0 +1,234 @@
+import math
+import multiprocessing
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from psycopg2 import sql
+
+_IDENT = r'"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_.]*'
+
+# The shape generated regex rules take: a bare count over one `!~` predicate
+_REGEX_RULE_RE = re.compile(
+    rf"""^\s*SELECT\s+COUNT\(\*\)\s+FROM\s+({_IDENT})\s+WHERE\s+({_IDENT})\s*!~(\*?)\s*'((?:[^']|'')*)'\s*;?\s*$""",
+    re.IGNORECASE,
+)
+
+
+# Escapes that mean the same in a Postgres ARE and Python `re` (letters only;
+# escaped punctuation is always literal in both)
+_SAFE_ESCAPES = set("dDsSwWntr")
+# Group openers both dialects read alike
+_SAFE_GROUPS = ("(?:", "(?=", "(?!", "(?<=", "(?<!")
+
+
+def _unquote(name):
+    if name.startswith('"'):
+        return name[1:-1].replace('""', '"')
+    # Postgres folds unquoted identifiers to lower case
+    return name.lower()
+
+
+def _table_parts(name):
+    """('schema', 'table') or ('table',) from a possibly qualified, possibly quoted name."""
+    if name.startswith('"'):
+        return (_unquote(name),)
+    return tuple(_unquote(part) for part in name.split("."))
+
+
+def extract_regex_predicate(rule_logic):
+    """
+    Pull (table, column, pattern, case_insensitive) out of a regex rule's SQL;
+    `table` is a tuple of name parts for sql.Identifier. Returns None unless
+    the SQL is a bare `SELECT COUNT(*) FROM t WHERE col !~ '...'`, since any
+    extra predicate would change what counts as a violation.
+    """
+    match = _REGEX_RULE_RE.match(rule_logic or "")
+    if not match:
+        return None
+    table, column, insensitive, pattern = match.groups()
+    return _table_parts(table), _unquote(column), pattern.replace("''", "'"), bool(insensitive)
+
+
+def to_python_regex(pattern):
+    """
+    The Python `re` equivalent of a Postgres ARE, or None when the pattern
+    uses syntax the two read differently: POSIX bracket classes ([[:alpha:]],
+    [[.x.]], [[=x=]]), letter escapes such as \\m, \\y or \\b (a backspace in
+    an ARE), `***` directors and embedded options. `$` becomes \\Z, since an
+    ARE's `$` never matches before a trailing newline. Compile the result with
+    re.DOTALL: an ARE's `.` matches newlines.
+    """
+    if pattern.startswith("***"):
+        return None
+    out = []
+    i, n = 0, len(pattern)
+    in_bracket = False
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\":
+            if i + 1 >= n:
+                return None
+            escaped = pattern[i + 1]
+            if escaped.isalnum() and escaped not in _SAFE_ESCAPES and (in_bracket or escaped not in "123456789"):
+                return None
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_bracket:
+            if ch == "[":
+                if pattern[i + 1:i + 2] in (":", ".", "="):
+                    return None
+                out.append("\\[")
+            else:
+                out.append(ch)
+                in_bracket = ch != "]"
+            i += 1
+            continue
+        if ch == "[":
+            in_bracket = True
+            out.append(ch)
+            i += 1
+            if pattern[i:i + 1] == "^":
+                out.append("^")
+                i += 1
+            if pattern[i:i + 1] == "]":
+                # A leading ] is a literal in both, but say so explicitly
+                out.append("\\]")
+                i += 1
+            continue
+        if ch == "(" and pattern[i + 1:i + 2] == "?":
+            if not pattern.startswith(_SAFE_GROUPS, i):
+                return None
+        if ch == "$":
+            out.append("\\Z")
+        else:
+            out.append(ch)
+        i += 1
+    if in_bracket:
+        return None
+
+    translated = "".join(out)
+    try:
+        re.compile(translated)
+    except re.error:
+        return None
+    return translated
+
+
+def _count_violations(pattern, case_insensitive, values):
+    """Vectorized `value !~ pattern` over one batch; NULLs never violate."""
+    import pandas as pd  # only needed when sampled evaluation is enabled
+
+    series = pd.Series(values, dtype="object").dropna().astype(str)
+    if series.empty:
+        return 0
+    matched = series.str.contains(pattern, case=not case_insensitive, flags=re.DOTALL, regex=True)
+    return int((~matched).sum())
+
+
+def _estimate_total_rows(cache, table):
+    # Planner estimate first; fall back to an exact count for never-analyzed tables
+    row = cache.fetchone(
+        "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+        [table.as_string(cache.cursor)],
+    )
+    if row and row[0] and row[0] > 0:
+        return int(row[0])
+    count = cache.fetchone(sql.SQL("SELECT COUNT(*) FROM {}").format(table))
+    return int(count[0])
+
+
+def _wilson_interval(violations, n, z=1.96):
+    """95% Wilson score interval for the violation rate."""
+    if n == 0:
+        return 0.0, 0.0
+    p = violations / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def evaluate_regex_rule_sampled(rule, cache):
+    """
+    Estimate the violation count of a regex rule from a bounded sample.
+    Streams the target column through a server-side cursor, evaluates the
+    pattern locally in batches and extrapolates to the whole table.
+    Returns a dict with `failed_rows`, `margin`, `sampled_rows` and
+    `total_rows`, or None when the rule's SQL can't be evaluated locally,
+    including patterns Python would read differently from Postgres.
+    """
+    predicate = extract_regex_predicate(rule.rule_logic)
+    if predicate is None:
+        return None
+    table_parts, column, pattern, case_insensitive = predicate
+    pattern = to_python_regex(pattern)
+    if pattern is None:
+        return None
+    table = sql.Identifier(*table_parts)
+
+    sample_size = settings.REGEX_RULE_SAMPLE_SIZE
+    fetch_size = settings.REGEX_RULE_FETCH_SIZE
+    # Daemonic processes (multiprocessing or prefork pool workers) can't have children
+    workers = 1 if multiprocessing.current_process().daemon else settings.REGEX_RULE_WORKERS
+
+    total_rows = _estimate_total_rows(cache, table)
+    full_scan = total_rows <= sample_size
+
+    if full_scan:
+        # Still bounded, in case the planner estimate is stale
+        query = sql.SQL("SELECT {} FROM {} LIMIT %s").format(sql.Identifier(column), table)
+        params = [sample_size]
+    else:
+        # Oversample slightly so the LIMIT, not BERNOULLI variance, bounds the
+        # sample; ORDER BY random() over the ~1.1n sampled rows keeps the LIMIT
+        # from favouring the first heap pages scanned
+        percent = min(100.0, sample_size * 110.0 / total_rows)
+        query = sql.SQL("SELECT {} FROM {} TABLESAMPLE BERNOULLI (%s) ORDER BY random() LIMIT %s").format(
+            sql.Identifier(column), table
+        )
+        params = [percent, sample_size]
+
+    stream = cache.cursor.connection.cursor(name=f"regex_sample_{uuid.uuid4().hex}")
+    stream.itersize = fetch_size
+    sampled = 0
+    violations = 0
+    try:
+        stream.execute(query, params)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = []
+                while True:
+                    batch = stream.fetchmany(fetch_size)
+                    if not batch:
+                        break
+                    sampled += len(batch)
+                    futures.append(pool.submit(
+                        _count_violations, pattern, case_insensitive, [r[0] for r in batch]
+                    ))
+                violations = sum(f.result() for f in futures)
+        else:
+            while True:
+                batch = stream.fetchmany(fetch_size)
+                if not batch:
+                    break
+                sampled += len(batch)
+                violations += _count_violations(pattern, case_insensitive, [r[0] for r in batch])
+    finally:
+        stream.close()
+
+    if full_scan and sampled < sample_size:
+        # The whole table was read, so the count is exact
+        return {"failed_rows": violations, "margin": 0, "sampled_rows": sampled, "total_rows": sampled}
+
+    population = max(total_rows, sampled)
+    rate = violations / sampled if sampled else 0.0
+    low, high = _wilson_interval(violations, sampled)
+    return {
+        "failed_rows": int(round(rate * population)),
+        "margin": int(math.ceil(max(rate - low, high - rate) * population)),
+        "sampled_rows": sampled,
+        "total_rows": population,
+    }
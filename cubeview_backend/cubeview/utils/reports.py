@@ -1,16 +1,46 @@
+import csv
+import hashlib
+import json
 import logging
 from datetime import datetime, time, timedelta
 from django.utils import timezone
 from django.apps import apps
-from django.db.models import Count
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.db.models import CharField, Count, DateTimeField, Max, OuterRef, Q, Subquery, Value
 from django.db.models.functions import TruncDate
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
+from .cache import cache_is_shared, get_or_compute, user_cache_key, user_version
+
 logger = logging.getLogger(__name__)
 
+# Ranges precomputed after each check run (the Reports page defaults to 7d)
+REPORT_PRESETS = ('7d', '30d')
+
+# Export: dataset -> (plan attribute, {output column: lookup}); every dataset shares the CSV header
+EXPORT_COLUMNS = ['record_type', 'id', 'table', 'timestamp', 'type', 'status', 'value', 'detail', 'error']
+EXPORT_DATASETS = {
+    'incidents': ('incidents', {
+        'id': 'pk', 'table': 'related_table__name', 'timestamp': 'created_at', 'type': 'incident_type',
+        'status': 'status', 'value': 'severity', 'detail': 'title',
+    }),
+    'checks': ('checks', {
+        'id': 'pk', 'table': 'table__name', 'timestamp': 'run_time', 'type': 'check_type',
+        'value': 'passed_percentage',
+    }),
+    'rule_executions': ('rule_executions', {
+        'id': 'pk', 'table': 'rule__table__name', 'timestamp': 'timestamp', 'type': 'rule__rule_type',
+        'status': 'status', 'value': 'failed_rows', 'detail': 'skip_reason', 'error': 'error_message',
+    }),
+}
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+EXPORT_CHUNK_SIZE = 2000
+
 # ---------- Helpers (dynamic model/field discovery) ----------
 
 def get_model_by_name(name):
@@ -109,21 +139,353 @@ def parse_date_params(params):
             make_aware(datetime.combine(end_date, time.max)))
 
 
-def apply_user_and_connection_filters(qs, model, user, connection):
-    if model is None:
+def get_date_field_name(model):
+    return find_field(model, ['created_at', 'timestamp', 'run_at', 'executed_at', 'date', 'created', 'created_on', 'checked_at', 'started_at'])
+
+
+USER_FIELDS = ['user', 'owner', 'created_by']
+CONNECTION_FIELDS = ['connection', 'db_connection', 'user_database_connection']
+
+
+SCOPE_DEPTH = 2
+
+
+class ScopeUnavailable(Exception):
+    """A requested user/connection scope can't be expressed on a model; never fall back to unscoped rows."""
+
+
+def find_scope_path(model, candidates, depth=SCOPE_DEPTH):
+    """
+    Lookup path from `model` to a user/connection field: a direct field if the
+    model has one, otherwise through its table-like (then any) foreign keys, up
+    to `depth` hops, e.g. 'related_table__user' for Incident and
+    'rule__table__connection' for RuleExecutionHistory.
+    """
+    direct = find_field(model, candidates)
+    if direct or model is None or depth == 0:
+        return direct
+
+    relations = [f for f in model._meta.get_fields() if getattr(f, 'many_to_one', False) and f.related_model]
+    table_field = sniff_table_field(model)
+    relations.sort(key=lambda f: f.name != table_field)
+    # Breadth first, so the shortest path wins
+    for hops in range(depth):
+        for f in relations:
+            related = find_scope_path(f.related_model, candidates, depth=hops)
+            if related:
+                return f"{f.name}__{related}"
+    return None
+
+
+# ---------- Report plan (discovery resolved once per process) ----------
+
+class ModelPlan:
+    """A discovered model plus the field names the report reads from it."""
+
+    def __init__(self, name, date_field=None, **fields):
+        self.model = get_model_by_name(name)
+        self.user_path = find_scope_path(self.model, USER_FIELDS)
+        self.conn_path = find_scope_path(self.model, CONNECTION_FIELDS)
+        # Declared where known; guessing missed e.g. DataQualityCheck.run_time
+        self.date_field = find_field(self.model, [date_field]) if date_field else get_date_field_name(self.model)
+        for attr, candidates in fields.items():
+            setattr(self, attr, find_field(self.model, candidates))
+
+    def __bool__(self):
+        return self.model is not None
+
+    def scoped(self, user, connection=None):
+        if not self.user_path:
+            raise ScopeUnavailable(f"{self.model.__name__} can't be scoped to a user.")
+        qs = self.model.objects.filter(**{self.user_path: user})
+        if connection is not None:
+            if not self.conn_path:
+                raise ScopeUnavailable(f"{self.model.__name__} can't be scoped to a connection.")
+            qs = qs.filter(**{self.conn_path: connection})
         return qs
-    user_field = find_field(model, ['user', 'owner', 'created_by'])
-    if user_field:
-        qs = qs.filter(**{user_field: user})
-    if connection is not None:
-        conn_field = find_field(model, ['connection', 'db_connection', 'user_database_connection'])
-        if conn_field:
-            qs = qs.filter(**{conn_field: connection})
-    return qs
 
 
-def get_date_field_name(model):
-    return find_field(model, ['created_at', 'timestamp', 'run_at', 'executed_at', 'date', 'created', 'created_on', 'checked_at', 'started_at'])
+class ReportPlan:
+    """
+    Everything ReportSummaryAPIView used to rediscover per request: which
+    models exist and which of their fields hold users, connections, dates,
+    statuses and table references.
+    """
+
+    def __init__(self):
+        self.connections = ModelPlan('UserDatabaseConnection')
+        self.tables = ModelPlan('DataTable')
+        self.rules = ModelPlan('DataQualityRule', enabled_field=['enabled', 'is_active', 'active'])
+        self.rule_executions = ModelPlan(
+            'RuleExecutionHistory',
+            date_field='timestamp',
+            rule_field=['rule', 'data_quality_rule', 'dataqualityrule', 'rule_id'],
+            result_field=['result', 'status', 'passed', 'is_success'],
+        )
+        self.incidents = ModelPlan(
+            'Incident',
+            date_field='created_at',
+            resolved_field=['resolved', 'is_resolved', 'is_resolved_by_user', 'status', 'state'],
+            resolved_at_field=['resolved_at', 'closed_at'],
+            type_field=['incident_type', 'type', 'kind'],
+        )
+        self.checks = ModelPlan('DataQualityCheck', date_field='run_time')
+        self.exports = ModelPlan('ExportedMetadata')
+        self.lineage_nodes = ModelPlan('LineageNode')
+        self.lineage_edges = ModelPlan(
+            'LineageEdge',
+            source_field=['from_node', 'source_node', 'source'],
+            target_field=['to_node', 'target_node', 'target'],
+        )
+
+        # Relations read by str(node) / str(rule), fetched up front to avoid N+1 lookups
+        self.node_relations = [
+            f for f in ('table', 'column')
+            if self.lineage_nodes and find_field(self.lineage_nodes.model, [f])
+        ]
+        self.rule_table_field = sniff_table_field(self.rules.model) if self.rules else None
+        if self.rule_table_field and not self.rules.model._meta.get_field(self.rule_table_field).is_relation:
+            self.rule_table_field = None
+
+        # Incidents: resolved filter and "top tables" grouping
+        incidents = self.incidents
+        self.resolved_filter = None
+        if incidents.resolved_field in ('status', 'state'):
+            self.resolved_filter = Q(**{f"{incidents.resolved_field}__in": ['resolved', 'closed']})
+        elif incidents.resolved_field:
+            self.resolved_filter = Q(**{incidents.resolved_field: True})
+
+        self.top_table_path, self.top_table_key = None, None
+        table_field = sniff_table_field(incidents.model)
+        if table_field:
+            try:
+                related = getattr(incidents.model._meta.get_field(table_field), 'related_model', None)
+            except Exception:
+                related = None
+            name_field = find_field(related, ['name', 'table_name', 'display_name', 'label']) if related else None
+            if related and name_field:
+                self.top_table_path, self.top_table_key = f"{table_field}__{name_field}", 'table'
+            elif related:
+                self.top_table_path, self.top_table_key = table_field, 'table_id'
+            else:
+                self.top_table_path, self.top_table_key = table_field, 'table'
+
+
+_report_plan = None
+
+
+def get_report_plan():
+    """Build the plan on first use (warmed in CubeviewConfig.ready) and reuse it."""
+    global _report_plan
+    if _report_plan is None:
+        _report_plan = ReportPlan()
+    return _report_plan
+
+
+def latest_rule_executions(plan, rules):
+    """
+    Rules annotated with their latest execution's time and result, in one query
+    (correlated subqueries) instead of one lookup per rule.
+    """
+    executions = plan.rule_executions
+    if plan.rule_table_field:
+        rules = rules.select_related(plan.rule_table_field)
+    if not executions or not executions.rule_field:
+        return rules.annotate(last_run=Value(None, output_field=DateTimeField()), last_result=Value(None, output_field=CharField()))
+
+    latest = executions.model.objects.filter(**{executions.rule_field: OuterRef('pk')})
+    latest = latest.order_by(f"-{executions.date_field}" if executions.date_field else '-pk')
+    return rules.annotate(
+        last_run=Subquery(latest.values(executions.date_field)[:1]) if executions.date_field
+        else Value(None, output_field=DateTimeField()),
+        last_result=Subquery(latest.values(executions.result_field)[:1]) if executions.result_field
+        else Value(None, output_field=CharField()),
+    )
+
+
+def build_report_summary(user, connection, start_dt, end_dt):
+    """Report payload for `user` (optionally one connection) over [start_dt, end_dt]."""
+    plan = get_report_plan()
+
+    # Tables monitored
+    tables_monitored = plan.tables.scoped(user, connection).count() if plan.tables else 0
+
+    # Rules active
+    rules_active = 0
+    if plan.rules:
+        rq_qs = plan.rules.scoped(user, connection)
+        if plan.rules.enabled_field:
+            rq_qs = rq_qs.filter(**{plan.rules.enabled_field: True})
+        rules_active = rq_qs.count()
+
+    # Incidents and breakdowns
+    total_incidents = 0
+    resolved_incidents = 0
+    incident_breakdown = {}
+    incident_trend = []
+    top_tables = []
+    if plan.incidents:
+        date_field = plan.incidents.date_field
+        inc_qs = plan.incidents.scoped(user, connection)
+        if date_field:
+            inc_qs = inc_qs.filter(**{f"{date_field}__range": (start_dt, end_dt)})
+
+        counts = {'total': Count('pk')}
+        if plan.resolved_filter is not None:
+            counts['resolved'] = Count('pk', filter=plan.resolved_filter)
+        counts = inc_qs.aggregate(**counts)
+        total_incidents = counts['total']
+        resolved_incidents = counts.get('resolved', 0)
+
+        # breakdown by type
+        type_field = plan.incidents.type_field
+        if type_field:
+            breakdown_qs = inc_qs.values(type_field).annotate(count=Count('pk')).order_by('-count')
+            incident_breakdown = {str(item[type_field]): item['count'] for item in breakdown_qs}
+        else:
+            incident_breakdown = {'unknown': total_incidents}
+
+        # trend by day
+        if date_field:
+            day_qs = inc_qs.annotate(day=TruncDate(date_field)).values('day').annotate(count=Count('pk')).order_by('day')
+            incident_trend = [{'day': item['day'].isoformat(), 'count': item['count']} for item in day_qs]
+
+        # top tables by incident count
+        if plan.top_table_path:
+            path, key = plan.top_table_path, plan.top_table_key
+            top_qs = inc_qs.values(path).annotate(count=Count('pk')).order_by('-count')[:5]
+            top_tables = [{key: item[path], 'count': item['count']} for item in top_qs if item[path] is not None]
+
+    # Health score & trend heuristic
+    # ---- Fix: replace the previous linear clamp (which forced 0 for high rates)
+    # Use incidents_per_table -> score = 100 * (1 / (1 + incidents_per_table))
+    health_score = 100
+    health_score_trend = []
+    if tables_monitored > 0:
+        incidents_per_table = total_incidents / float(max(1, tables_monitored))
+        # smoother non-linear mapping, output in 0..100
+        health_score = max(0, min(100, int(100 * (1.0 / (1.0 + incidents_per_table)))))
+        # compute per-day health using incident_trend (if available)
+        for item in incident_trend:
+            day_count = item['count']
+            day_inc_per_table = day_count / float(max(1, tables_monitored))
+            day_health = max(0, min(100, int(100 * (1.0 / (1.0 + day_inc_per_table)))))
+            health_score_trend.append({'day': item['day'], 'health_score': day_health})
+    else:
+        # no tables monitored -> define health as 0 so UI knows nothing is monitored
+        health_score = 0
+
+    # Rule compliance: one query with the latest execution per rule
+    rule_compliance = []
+    if plan.rules:
+        rules = latest_rule_executions(plan, plan.rules.scoped(user, connection))
+        for r in rules:
+            rule_compliance.append({
+                'rule_id': getattr(r, 'id', None),
+                'rule_name': getattr(r, 'name', None) or str(r),
+                'last_run': r.last_run.isoformat() if r.last_run else None,
+                'last_result': r.last_result,
+            })
+
+    # Exported metadata
+    metadata_export_info = {'last_export': None}
+    if plan.exports:
+        qs = plan.exports.scoped(user, connection)
+        date_field = plan.exports.date_field
+        if date_field:
+            val = qs.order_by(f"-{date_field}").values_list(date_field, flat=True).first()
+            metadata_export_info['last_export'] = val.isoformat() if val else None
+        else:
+            last = qs.order_by('-pk').first()
+            if last:
+                # prefer created_at if exists
+                created = getattr(last, 'created_at', None) or getattr(last, 'created', None)
+                metadata_export_info['last_export'] = created.isoformat() if created else None
+
+    # Lineage snapshot
+    lineage_data = {'nodes': [], 'edges': []}
+    if plan.lineage_nodes and plan.lineage_edges:
+        node_qs = plan.lineage_nodes.scoped(user, connection).select_related(*plan.node_relations)
+        edge_qs = plan.lineage_edges.scoped(user, connection)
+        for n in node_qs:
+            lineage_data['nodes'].append({
+                'id': getattr(n, 'id', None),
+                'type': getattr(n, 'node_type', getattr(n, 'type', None)),
+                'label': getattr(n, 'name', None) or getattr(n, 'table_name', None) or str(n)
+            })
+        source_field = plan.lineage_edges.source_field
+        target_field = plan.lineage_edges.target_field
+        if source_field and target_field:
+            for e in edge_qs.values('id', source_field, target_field):
+                lineage_data['edges'].append({'id': e['id'], 'source': e[source_field], 'target': e[target_field]})
+
+    payload = {
+        'health_score': health_score,
+        'total_incidents': total_incidents,
+        'resolved_incidents': resolved_incidents,
+        'unresolved_incidents': total_incidents - resolved_incidents,
+        'tables_monitored': tables_monitored,
+        'rules_active': rules_active,
+        'incident_breakdown': incident_breakdown,
+        'health_score_trend': health_score_trend,
+        'incident_trend': incident_trend,
+        'top_tables': top_tables,
+        'lineage_data': lineage_data,
+        'rule_compliance': rule_compliance,
+        'metadata_export_info': metadata_export_info,
+    }
+
+    return payload
+
+
+def report_state(user):
+    """
+    Newest check, incident, resolution and rule-execution markers for a user;
+    any new row or resolution changes it. Each is one indexed lookup.
+    """
+    plan = get_report_plan()
+    state = [user_version(user.id)]
+    for model_plan in (plan.checks, plan.incidents, plan.rule_executions):
+        state.append(
+            model_plan.scoped(user).order_by('-pk').values_list('pk', flat=True).first()
+            if model_plan else None
+        )
+    if plan.incidents and plan.incidents.resolved_at_field:
+        state.append(plan.incidents.scoped(user).aggregate(latest=Max(plan.incidents.resolved_at_field))['latest'])
+    return state
+
+
+def report_etag(user, connection, start_dt, end_dt):
+    parts = [user.id, connection.pk if connection else None, start_dt.isoformat(), end_dt.isoformat(), *report_state(user)]
+    return '"%s"' % hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def get_report_summary(user, connection, start_dt, end_dt, etag=None):
+    """(etag, payload), with the payload cached under its ETag so stale entries are never served."""
+    etag = etag or report_etag(user, connection, start_dt, end_dt)
+    key = user_cache_key(user.id, 'report_summary', etag.strip('"'))
+    return etag, get_or_compute(key, lambda: build_report_summary(user, connection, start_dt, end_dt))
+
+
+def precompute_report_presets(user, presets=REPORT_PRESETS):
+    """Warm the cache for the common ranges right after a check run."""
+    if not cache_is_shared():
+        # The run's process cache isn't the one web workers read
+        return
+    for preset in presets:
+        try:
+            start_dt, end_dt = parse_date_params({'preset': preset})
+            get_report_summary(user, None, start_dt, end_dt)
+        except Exception:
+            logger.exception('Failed to precompute %s report summary', preset)
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(',')]
+    return '*' in candidates or etag in candidates
 
 
 # ---------- API View ----------
@@ -135,235 +497,133 @@ class ReportSummaryAPIView(APIView):
         try:
             start_dt, end_dt = parse_date_params(request.GET)
             connection_id = request.GET.get('connection_id')
-
-            # dynamically find models
-            DataTable = get_model_by_name('DataTable')
-            Incident = get_model_by_name('Incident')
-            DataQualityRule = get_model_by_name('DataQualityRule')
-            RuleExecutionHistory = get_model_by_name('RuleExecutionHistory')
-            ExportedMetadata = get_model_by_name('ExportedMetadata')
-            LineageNode = get_model_by_name('LineageNode')
-            LineageEdge = get_model_by_name('LineageEdge')
-            UserDatabaseConnection = get_model_by_name('UserDatabaseConnection')
+            plan = get_report_plan()
 
             # fetch connection instance if provided
             connection = None
-            if connection_id and UserDatabaseConnection:
-                try:
-                    connection = UserDatabaseConnection.objects.get(pk=connection_id, user=request.user)
-                except Exception:
-                    connection = None
-
-            # Tables monitored
-            tables_monitored = 0
-            if DataTable:
-                dt_qs = DataTable.objects.filter(user=request.user) if find_field(DataTable, ['user', 'owner']) else DataTable.objects.all()
-                if connection and find_field(DataTable, ['connection', 'db_connection', 'user_database_connection']):
-                    conn_field = find_field(DataTable, ['connection', 'db_connection', 'user_database_connection'])
-                    dt_qs = dt_qs.filter(**{conn_field: connection})
-                tables_monitored = dt_qs.count()
-
-            # Rules active
-            rules_active = 0
-            if DataQualityRule:
-                rq_qs = DataQualityRule.objects.filter(user=request.user) if find_field(DataQualityRule, ['user', 'owner', 'created_by']) else DataQualityRule.objects.all()
-                enabled_field = find_field(DataQualityRule, ['enabled', 'is_active', 'active'])
-                if enabled_field:
-                    rq_qs = rq_qs.filter(**{enabled_field: True})
-                if connection and find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection']):
-                    conn_field = find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection'])
-                    rq_qs = rq_qs.filter(**{conn_field: connection})
-                rules_active = rq_qs.count()
-
-            # Incidents and breakdowns
-            total_incidents = 0
-            resolved_incidents = 0
-            incident_breakdown = {}
-            incident_trend = []
-            top_tables = []
-            if Incident:
-                inc_qs = Incident.objects.all()
-                inc_qs = apply_user_and_connection_filters(inc_qs, Incident, request.user, connection)
-                date_field = get_date_field_name(Incident)
-                if date_field:
-                    inc_qs = inc_qs.filter(**{f"{date_field}__range": (start_dt, end_dt)})
-                total_incidents = inc_qs.count()
-
-                # resolved counting
-                resolved_field = find_field(Incident, ['resolved', 'is_resolved', 'is_resolved_by_user', 'status', 'state'])
-                if resolved_field:
-                    if resolved_field in ['status', 'state']:
-                        resolved_incidents = inc_qs.filter(**{f"{resolved_field}__in": ['resolved', 'closed']}).count()
-                    else:
-                        resolved_incidents = inc_qs.filter(**{f"{resolved_field}": True}).count()
-
-                # breakdown by type
-                type_field = find_field(Incident, ['incident_type', 'type', 'kind'])
-                if type_field:
-                    breakdown_qs = inc_qs.values(type_field).annotate(count=Count('pk')).order_by('-count')
-                    incident_breakdown = {str(item[type_field]): item['count'] for item in breakdown_qs}
-                else:
-                    incident_breakdown = {'unknown': total_incidents}
-
-                # trend by day
-                if date_field:
-                    day_qs = inc_qs.annotate(day=TruncDate(date_field)).values('day').annotate(count=Count('pk')).order_by('day')
-                    incident_trend = [{'day': item['day'].isoformat(), 'count': item['count']} for item in day_qs]
-
-                # top tables by incident count (robust detection)
-                table_field = sniff_table_field(Incident)
-                if table_field:
-                    # if it's a FK to another model, prefer the related object's 'name' or similar
-                    try:
-                        fld = Incident._meta.get_field(table_field)
-                        related = getattr(fld, 'related_model', None)
-                    except Exception:
-                        related = None
-
-                    if related:
-                        # find a name-like field on related model
-                        name_field = find_field(related, ['name', 'table_name', 'display_name', 'label'])
-                        if name_field:
-                            top_qs = inc_qs.values(f"{table_field}__{name_field}").annotate(count=Count('pk')).order_by('-count')[:5]
-                            top_tables = [{'table': item[f"{table_field}__{name_field}"], 'count': item['count']} for item in top_qs]
-                        else:
-                            # fallback to reporting by related pk
-                            top_qs = inc_qs.values(f"{table_field}").annotate(count=Count('pk')).order_by('-count')[:5]
-                            top_tables = [{'table_id': item[f"{table_field}"], 'count': item['count']} for item in top_qs]
-                    else:
-                        # not a relation; assume string/char field contains table name
-                        top_qs = inc_qs.values(table_field).annotate(count=Count('pk')).order_by('-count')[:5]
-                        top_tables = [{'table': item[table_field], 'count': item['count']} for item in top_qs if item[table_field] is not None]
-
-            # Health score & trend heuristic
-            # ---- Fix: replace the previous linear clamp (which forced 0 for high rates)
-            # Use incidents_per_table -> score = 100 * (1 / (1 + incidents_per_table))
-            health_score = 100
-            health_score_trend = []
-            if tables_monitored > 0:
-                incidents_per_table = total_incidents / float(max(1, tables_monitored))
-                # smoother non-linear mapping, output in 0..100
-                health_score = max(0, min(100, int(100 * (1.0 / (1.0 + incidents_per_table)))))
-                # compute per-day health using incident_trend (if available)
-                for item in incident_trend:
-                    day_count = item['count']
-                    day_inc_per_table = day_count / float(max(1, tables_monitored))
-                    day_health = max(0, min(100, int(100 * (1.0 / (1.0 + day_inc_per_table)))))
-                    health_score_trend.append({'day': item['day'], 'health_score': day_health})
-            else:
-                # no tables monitored -> define health as 0 so UI knows nothing is monitored
-                health_score = 0
-
-            # Rule compliance (uses RuleExecutionHistory if present)
-            rule_compliance = []
-            if DataQualityRule:
-                if RuleExecutionHistory:
-                    # try to find FK to rule and execution timestamp / result fields
-                    rule_fk_field = None
-                    for candidate in ['rule', 'data_quality_rule', 'dataqualityrule', 'rule_id']:
-                        try:
-                            if RuleExecutionHistory._meta.get_field(candidate):
-                                rule_fk_field = candidate
-                                break
-                        except Exception:
-                            continue
-                    exec_date_field = get_date_field_name(RuleExecutionHistory)
-                    result_field = find_field(RuleExecutionHistory, ['result', 'status', 'passed', 'is_success'])
-
-                    rules = DataQualityRule.objects.filter(user=request.user) if find_field(DataQualityRule, ['user', 'owner']) else DataQualityRule.objects.all()
-                    if find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection']) and connection:
-                        conn_field = find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection'])
-                        rules = rules.filter(**{conn_field: connection})
-
-                    for r in rules:
-                        q = RuleExecutionHistory.objects
-                        if rule_fk_field:
-                            q = q.filter(**{rule_fk_field: r})
-                        if exec_date_field:
-                            last = q.order_by(f"-{exec_date_field}").first()
-                        else:
-                            last = q.order_by('-pk').first()
-                        if last:
-                            last_run_val = getattr(last, exec_date_field) if exec_date_field and getattr(last, exec_date_field) else None
-                            last_run_iso = last_run_val.isoformat() if last_run_val else None
-                            res = {
-                                'rule_id': getattr(r, 'id', None),
-                                'rule_name': getattr(r, 'name', None) or str(r),
-                                'last_run': last_run_iso,
-                                'last_result': getattr(last, result_field) if result_field else None,
-                            }
-                            rule_compliance.append(res)
-                        else:
-                            rule_compliance.append({'rule_id': getattr(r, 'id', None), 'rule_name': getattr(r, 'name', None) or str(r), 'last_run': None, 'last_result': None})
-                else:
-                    rules = DataQualityRule.objects.filter(user=request.user) if find_field(DataQualityRule, ['user', 'owner']) else DataQualityRule.objects.all()
-                    if find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection']) and connection:
-                        conn_field = find_field(DataQualityRule, ['connection', 'db_connection', 'user_database_connection'])
-                        rules = rules.filter(**{conn_field: connection})
-                    for r in rules:
-                        rule_compliance.append({'rule_id': getattr(r, 'id', None), 'rule_name': getattr(r, 'name', None) or str(r), 'last_run': None, 'last_result': None})
-
-            # Exported metadata
-            metadata_export_info = {'last_export': None}
-            if ExportedMetadata:
-                date_field = get_date_field_name(ExportedMetadata)
-                qs = ExportedMetadata.objects.filter(user=request.user) if find_field(ExportedMetadata, ['user', 'owner']) else ExportedMetadata.objects.all()
-                if find_field(ExportedMetadata, ['connection', 'db_connection', 'user_database_connection']) and connection:
-                    conn_field = find_field(ExportedMetadata, ['connection', 'db_connection', 'user_database_connection'])
-                    qs = qs.filter(**{conn_field: connection})
-                if date_field:
-                    last = qs.order_by(f"-{date_field}").first()
-                    if last:
-                        val = getattr(last, date_field)
-                        metadata_export_info['last_export'] = val.isoformat() if val else None
-                else:
-                    last = qs.order_by('-pk').first()
-                    if last:
-                        # prefer created_at if exists
-                        created = getattr(last, 'created_at', None) or getattr(last, 'created', None)
-                        metadata_export_info['last_export'] = created.isoformat() if created else None
-
-            # Lineage snapshot
-            lineage_data = {'nodes': [], 'edges': []}
-            if LineageNode and LineageEdge:
-                node_qs = LineageNode.objects.filter(user=request.user) if find_field(LineageNode, ['user', 'owner']) else LineageNode.objects.all()
-                edge_qs = LineageEdge.objects.filter(user=request.user) if find_field(LineageEdge, ['user', 'owner']) else LineageEdge.objects.all()
-                if connection:
-                    if find_field(LineageNode, ['connection', 'db_connection', 'user_database_connection']):
-                        conn_field = find_field(LineageNode, ['connection', 'db_connection', 'user_database_connection'])
-                        node_qs = node_qs.filter(**{conn_field: connection})
-                    if find_field(LineageEdge, ['connection', 'db_connection', 'user_database_connection']):
-                        conn_field = find_field(LineageEdge, ['connection', 'db_connection', 'user_database_connection'])
-                        edge_qs = edge_qs.filter(**{conn_field: connection})
-                for n in node_qs:
-                    lineage_data['nodes'].append({
-                        'id': getattr(n, 'id', None),
-                        'type': getattr(n, 'node_type', getattr(n, 'type', None)),
-                        'label': getattr(n, 'name', None) or getattr(n, 'table_name', None) or str(n)
-                    })
-                for e in edge_qs:
-                    src = getattr(e, 'source_id', None) or getattr(e, 'source', None)
-                    tgt = getattr(e, 'target_id', None) or getattr(e, 'target', None)
-                    lineage_data['edges'].append({'id': getattr(e, 'id', None), 'source': src, 'target': tgt})
-
-            payload = {
-                'health_score': health_score,
-                'total_incidents': total_incidents,
-                'resolved_incidents': resolved_incidents,
-                'unresolved_incidents': total_incidents - resolved_incidents,
-                'tables_monitored': tables_monitored,
-                'rules_active': rules_active,
-                'incident_breakdown': incident_breakdown,
-                'health_score_trend': health_score_trend,
-                'incident_trend': incident_trend,
-                'top_tables': top_tables,
-                'lineage_data': lineage_data,
-                'rule_compliance': rule_compliance,
-                'metadata_export_info': metadata_export_info,
-            }
-
-            return Response(payload, status=status.HTTP_200_OK)
+            if connection_id and plan.connections:
+                # An unknown id must not widen the report to every connection
+                connection = plan.connections.model.objects.filter(pk=connection_id, user=request.user).first()
+                if connection is None:
+                    return Response({'detail': 'Connection not found.'}, status=status.HTTP_404_NOT_FOUND)
 
+            etag = report_etag(request.user, connection, start_dt, end_dt)
+            if etag_matches(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+            etag, payload = get_report_summary(request.user, connection, start_dt, end_dt, etag=etag)
+            return Response(payload, status=status.HTTP_200_OK, headers={'ETag': etag, 'Cache-Control': 'private, no-cache'})
+
+        except ScopeUnavailable as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception:
             logger.exception('Error building report summary')
             return Response({'detail': 'Internal server error building report summary'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# ---------- Export ----------
+
+class _Echo:
+    """File-like object whose write() hands the line back, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def export_querysets(user, connection, start_dt, end_dt, datasets):
+    """
+    [(dataset, queryset, columns)] for an export, built up front so a dataset
+    without a date field or scope fails before streaming starts instead of
+    exporting its whole history.
+    """
+    plan = get_report_plan()
+    querysets = []
+    for name in datasets:
+        attr, columns = EXPORT_DATASETS[name]
+        model_plan = getattr(plan, attr)
+        if not model_plan:
+            continue
+        if not model_plan.date_field:
+            raise ImproperlyConfigured(f"Export dataset '{name}' has no date field to filter on.")
+        qs = (
+            model_plan.scoped(user, connection)
+            .filter(**{f"{model_plan.date_field}__range": (start_dt, end_dt)})
+            .order_by(model_plan.date_field, 'pk')
+        )
+        querysets.append((name, qs, columns))
+    return querysets
+
+
+def iter_export_rows(querysets):
+    """Yield one dict per exported row, dataset by dataset, from chunked server-side iterators."""
+    for name, qs, columns in querysets:
+        names = list(columns)
+        for values in qs.values_list(*columns.values()).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield {'record_type': name, **dict(zip(names, values))}
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in (row.get(column) for column in EXPORT_COLUMNS)
+        ])
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class ReportExportAPIView(APIView):
+    """
+    Stream incidents, check results and rule executions for any date range as
+    CSV or NDJSON. Query params match report-summary, plus `export_format`
+    (csv|ndjson) and `datasets` (comma-separated, default all). Rows are never
+    held in memory all at once; each table in scope gets an ExportedMetadata record.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        export_format = request.GET.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'detail': f"export_format must be one of {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        datasets = [d.strip() for d in request.GET.get('datasets', ','.join(EXPORT_DATASETS)).split(',') if d.strip()]
+        unknown = [d for d in datasets if d not in EXPORT_DATASETS]
+        if unknown:
+            return Response({'detail': f"Unknown datasets: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        start_dt, end_dt = parse_date_params(request.GET)
+        plan = get_report_plan()
+        connection = None
+        connection_id = request.GET.get('connection_id')
+        if connection_id and plan.connections:
+            connection = plan.connections.model.objects.filter(pk=connection_id, user=request.user).first()
+            if connection is None:
+                return Response({'detail': 'Connection not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            querysets = export_querysets(request.user, connection, start_dt, end_dt, datasets)
+        except ScopeUnavailable as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ImproperlyConfigured as e:
+            logger.error('Report export misconfigured: %s', e)
+            return Response({'detail': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        # Record the export against every table it covers
+        if plan.exports and plan.tables:
+            table_ids = plan.tables.scoped(request.user, connection).values_list('pk', flat=True)
+            plan.exports.model.objects.bulk_create([
+                plan.exports.model(user=request.user, table_id=table_id, format=export_format)
+                for table_id in table_ids
+            ])
+
+        rows = iter_export_rows(querysets)
+        body = stream_csv(rows) if export_format == 'csv' else stream_ndjson(rows)
+        response = StreamingHttpResponse(body, content_type=EXPORT_FORMATS[export_format])
+        filename = f"cubeview_report_{start_dt:%Y%m%d}_{end_dt:%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
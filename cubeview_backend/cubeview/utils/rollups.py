@@ -0,0 +1,216 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate, TruncDay, TruncHour
+from django.utils import timezone
+
+from ..models import DataQualityCheck, HistoryRollup, Incident, MetricHistory, RuleExecutionHistory
+
+# source -> (model, time field, table field, kind field, value field, failure filter)
+ROLLUP_SOURCES = {
+    "check": (DataQualityCheck, "run_time", "table_id", "check_type", "passed_percentage", Q(passed_percentage__lt=100)),
+    "metric": (MetricHistory, "timestamp", "table_id", "metric_type", "value", None),
+    "rule": (RuleExecutionHistory, "timestamp", "rule__table_id", "rule__rule_type", "failed_rows", Q(status="fail")),
+    "incident": (Incident, "created_at", "related_table_id", "incident_type", None, None),
+}
+
+# Incidents are records users act on, not samples, so they are never pruned
+PRUNABLE_SOURCES = ["check", "metric", "rule"]
+
+GRANULARITIES = {"hour": TruncHour, "day": TruncDay}
+UNIQUE_FIELDS = ["table", "source", "kind", "granularity", "bucket_start"]
+UPDATE_FIELDS = ["min_value", "max_value", "avg_value", "count", "failures"]
+BATCH_SIZE = 1000
+PRUNE_BATCH_SIZE = 10000
+
+
+def latest_daily_bucket():
+    """Start of the newest daily rollup; that bucket may still be filling up."""
+    return HistoryRollup.objects.filter(granularity="day").aggregate(latest=Max("bucket_start"))["latest"]
+
+
+def prune_horizon(now=None):
+    """
+    Start of the oldest day raw rows are kept for, or None when pruning is off.
+    Day-aligned like the daily buckets, so pruning never leaves a partial day.
+    """
+    days = settings.RAW_HISTORY_RETENTION_DAYS
+    if days <= 0:
+        return None
+    cutoff = timezone.localtime((now or timezone.now()) - timedelta(days=days))
+    return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _upsert(batch):
+    if batch:
+        HistoryRollup.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=UNIQUE_FIELDS, update_fields=UPDATE_FIELDS
+        )
+    return len(batch)
+
+
+def rollup_history(full=False):
+    """
+    Aggregate raw rows into hourly and daily HistoryRollup buckets per table
+    and type. Buckets are recomputed from raw rows and upserted, so reruns are
+    idempotent; unless `full`, only the newest daily bucket onwards is redone.
+    A full rebuild still leaves buckets before the prune horizon alone: their
+    raw rows may be gone, and recomputing would overwrite them with less.
+    Returns the number of buckets written.
+    """
+    since = latest_daily_bucket()
+    if full and since is not None:
+        since = prune_horizon()
+
+    written = 0
+    for source, (model, time_field, table_field, kind_field, value_field, failure_filter) in ROLLUP_SOURCES.items():
+        qs = model.objects.all()
+        if since is not None:
+            qs = qs.filter(**{f"{time_field}__gte": since})
+
+        aggregates = {"n": Count("id")}
+        if value_field:
+            aggregates.update(lo=Min(value_field), hi=Max(value_field), mean=Avg(value_field))
+        if failure_filter is not None:
+            aggregates["failed"] = Count("id", filter=failure_filter)
+
+        for granularity, trunc in GRANULARITIES.items():
+            rows = (
+                qs.annotate(bucket=trunc(time_field))
+                .values(table_field, kind_field, "bucket")
+                .annotate(**aggregates)
+                .order_by()
+            )
+            batch = []
+            for row in rows.iterator(chunk_size=BATCH_SIZE):
+                batch.append(HistoryRollup(
+                    table_id=row[table_field],
+                    source=source,
+                    kind=row[kind_field] or "",
+                    granularity=granularity,
+                    bucket_start=row["bucket"],
+                    min_value=row.get("lo"),
+                    max_value=row.get("hi"),
+                    avg_value=row.get("mean"),
+                    count=row["n"],
+                    failures=row.get("failed", 0),
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    written += _upsert(batch)
+                    batch = []
+            written += _upsert(batch)
+    return written
+
+
+def prune_raw_history(now=None):
+    """
+    Delete raw check, metric and rule rows from before the prune horizon
+    (whole days past RAW_HISTORY_RETENTION_DAYS), in id batches, but never
+    rows newer than the last completed rollup. Returns {source: rows deleted}.
+    """
+    horizon = prune_horizon(now)
+    rolled_through = latest_daily_bucket()
+    if horizon is None or rolled_through is None:
+        return {}
+    cutoff = min(horizon, rolled_through)
+
+    deleted = {}
+    for source in PRUNABLE_SOURCES:
+        model, time_field = ROLLUP_SOURCES[source][:2]
+        old = model.objects.filter(**{f"{time_field}__lt": cutoff})
+        deleted[source] = 0
+        while True:
+            ids = list(old.values_list("id", flat=True)[:PRUNE_BATCH_SIZE])
+            if not ids:
+                break
+            deleted[source] += model.objects.filter(id__in=ids).delete()[0]
+    return deleted
+
+
+# ---------- Trend reads ----------
+
+
+def _raw_boundary(since):
+    """Days before this come from daily rollups; it and everything after from raw rows."""
+    latest = latest_daily_bucket()
+    return since if latest is None or latest < since else latest
+
+
+def health_score_trend_queries(tables, since):
+    """(rolled, raw) querysets behind health_score_trend; check_query_plans EXPLAINs these."""
+    boundary = _raw_boundary(since)
+    rolled = (
+        HistoryRollup.objects.filter(
+            table__in=tables, source="check", granularity="day",
+            bucket_start__gte=since, bucket_start__lt=boundary,
+        )
+        .values("bucket_start")
+        .annotate(total=Sum(F("avg_value") * F("count")), n=Sum("count"))
+    )
+    raw = (
+        DataQualityCheck.objects.filter(table__in=tables, run_time__gte=boundary)
+        .annotate(day=TruncDate("run_time"))
+        .values("day")
+        .annotate(total=Sum("passed_percentage"), n=Count("id"))
+    )
+    return rolled, raw
+
+
+def health_score_trend(tables, since):
+    """[{"day", "avg_score"}] per day since `since` for checks on `tables`."""
+    rolled, raw = health_score_trend_queries(tables, since)
+    totals = {}
+
+    for row in rolled:
+        day = timezone.localtime(row["bucket_start"]).date()
+        total, n = totals.get(day, (0.0, 0))
+        totals[day] = (total + (row["total"] or 0), n + row["n"])
+
+    for row in raw:
+        total, n = totals.get(row["day"], (0.0, 0))
+        totals[row["day"]] = (total + (row["total"] or 0), n + row["n"])
+
+    return [
+        {"day": day, "avg_score": total / n if n else None}
+        for day, (total, n) in sorted(totals.items())
+    ]
+
+
+def incident_trend_queries(user, since):
+    """(rolled, raw) querysets behind incident_trend; check_query_plans EXPLAINs these."""
+    boundary = _raw_boundary(since)
+    rolled = (
+        HistoryRollup.objects.filter(
+            table__user=user, source="incident", granularity="day",
+            bucket_start__gte=since, bucket_start__lt=boundary,
+        )
+        .values("bucket_start", "kind")
+        .annotate(n=Sum("count"))
+    )
+    raw = (
+        Incident.objects.filter(related_table__user=user, created_at__gte=boundary)
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "incident_type")
+        .annotate(n=Count("id"))
+    )
+    return rolled, raw
+
+
+def incident_trend(user, since):
+    """[{"day", "incident_type", "count"}] of incidents created since `since`."""
+    rolled, raw = incident_trend_queries(user, since)
+    counts = {}
+
+    for row in rolled:
+        key = (timezone.localtime(row["bucket_start"]).date(), row["kind"])
+        counts[key] = counts.get(key, 0) + row["n"]
+
+    for row in raw:
+        key = (row["day"], row["incident_type"] or "")
+        counts[key] = counts.get(key, 0) + row["n"]
+
+    return [
+        {"day": day, "incident_type": kind, "count": n}
+        for (day, kind), n in sorted(counts.items())
+    ]
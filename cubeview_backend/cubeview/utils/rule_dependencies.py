@@ -0,0 +1,80 @@
+from collections import deque
+
+import psycopg2
+from psycopg2 import sql
+
+
+def order_rules(rules):
+    """
+    Sort rules so every rule comes after the rules it depends on.
+    Returns (ordered, cyclic) where `cyclic` holds rules that sit on a dependency
+    cycle (or depend on one) and therefore can never be evaluated.
+    Dependencies on rules outside `rules` are ignored here; they are treated as
+    already settled by whoever runs the batch.
+    """
+    by_id = {rule.id: rule for rule in rules}
+    deps = {
+        rule.id: [d.id for d in rule.depends_on.all() if d.id in by_id]
+        for rule in rules
+    }
+
+    pending = {rid: len(d) for rid, d in deps.items()}
+    dependents = {rid: [] for rid in by_id}
+    for rid, d in deps.items():
+        for dep_id in d:
+            dependents[dep_id].append(rid)
+
+    # Kahn's algorithm; keep the incoming order for rules at the same depth
+    queue = deque(rule.id for rule in rules if pending[rule.id] == 0)
+    ordered = []
+    while queue:
+        rid = queue.popleft()
+        ordered.append(by_id[rid])
+        for child in dependents[rid]:
+            pending[child] -= 1
+            if pending[child] == 0:
+                queue.append(child)
+
+    done = {rule.id for rule in ordered}
+    cyclic = [rule for rule in rules if rule.id not in done]
+    return ordered, cyclic
+
+
+def probe_table(cache, table_name):
+    """
+    Run the volume prerequisite for a table through the run's query cache.
+    Returns (row_count, failure_reason); the reason is None when the table
+    exists and has rows.
+    """
+    try:
+        row_count = cache.fetchone(
+            sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table_name))
+        )[0]
+    except psycopg2.Error:
+        cache.cursor.connection.rollback()
+        return None, f"Table {table_name} is missing"
+
+    if row_count == 0:
+        return 0, f"Table {table_name} is empty"
+    return row_count, None
+
+
+def skip_reason(rule, statuses, table_failures):
+    """
+    Return why `rule` should not run in this batch, or None if it should run.
+    `statuses` maps already-evaluated rule ids to their status and
+    `table_failures` maps table ids to a failed volume prerequisite.
+    """
+    # Column rules are meaningless on a missing or empty table
+    if rule.column and table_failures.get(rule.table_id):
+        return table_failures[rule.table_id]
+
+    for dep in rule.depends_on.all():
+        dep_status = statuses.get(dep.id)
+        if dep_status == "fail":
+            return f"Prerequisite rule {dep.id} failed"
+        if dep_status == "error":
+            return f"Prerequisite rule {dep.id} could not be executed"
+        if dep_status == "skipped":
+            return f"Prerequisite rule {dep.id} was skipped"
+    return None
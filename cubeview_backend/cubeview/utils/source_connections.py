@@ -0,0 +1,91 @@
+# cubeview/utils/source_connections.py
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from psycopg2 import pool
+
+# One pool per source connection (and credentials) per worker process
+_POOLS = {}
+# id(borrowed connection) -> the pool it came from, so it always goes back there
+_BORROWED = {}
+# Pools replaced after a credentials change, closed once their last borrower returns
+_RETIRED = set()
+_LOCK = threading.Lock()
+
+
+def _key(db_conn):
+    return (db_conn.id, db_conn.host, db_conn.port, db_conn.database_name, db_conn.username, db_conn.password)
+
+
+def _in_use(source_pool):
+    return any(owner is source_pool for owner in _BORROWED.values())
+
+
+def get_pool(db_conn):
+    """
+    The worker's pool for `db_conn`; editing the connection's credentials
+    starts a fresh one. The old pool is retired, not closed, while streams
+    still hold its connections.
+    """
+    key = _key(db_conn)
+    with _LOCK:
+        current = _POOLS.get(db_conn.id)
+        if current and current[0] == key:
+            return current[1]
+        if current:
+            if _in_use(current[1]):
+                _RETIRED.add(current[1])
+            else:
+                current[1].closeall()
+        source_pool = pool.ThreadedConnectionPool(
+            0,
+            settings.SOURCE_POOL_MAX_CONNECTIONS,
+            host=db_conn.host,
+            port=db_conn.port,
+            user=db_conn.username,
+            password=db_conn.password,
+            dbname=db_conn.database_name,
+            connect_timeout=5,
+        )
+        _POOLS[db_conn.id] = (key, source_pool)
+        return source_pool
+
+
+def acquire(db_conn):
+    """Borrow a connection; raises psycopg2.pool.PoolError when the pool is exhausted."""
+    source_pool = get_pool(db_conn)
+    conn = source_pool.getconn()
+    with _LOCK:
+        _BORROWED[id(conn)] = source_pool
+    return conn
+
+
+def release(conn):
+    """
+    Return a borrowed connection to the pool it came from, with no
+    transaction left open; broken ones are discarded. Safe to call twice.
+    """
+    with _LOCK:
+        source_pool = _BORROWED.pop(id(conn), None)
+    if source_pool is None:
+        return
+    if not conn.closed:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+    source_pool.putconn(conn, close=bool(conn.closed))
+    with _LOCK:
+        if source_pool in _RETIRED and not _in_use(source_pool):
+            _RETIRED.discard(source_pool)
+            source_pool.closeall()
+
+
+@contextmanager
+def source_connection(db_conn):
+    conn = acquire(db_conn)
+    try:
+        yield conn
+    finally:
+        release(conn)
@@ -0,0 +1,101 @@
+import math
+
+# The series is modelled in log space: growth becomes a linear trend and the
+# hour-of-week pattern an additive offset (a seasonal ratio on raw counts).
+LEVEL_ALPHA = 0.2  # weight of the newest point in the deseasonalized level
+TREND_BETA = 0.05  # weight of the newest level change in the per-hour trend
+SEASONAL_ALPHA = 0.3  # weight of the newest point in its hour-of-week offset
+VAR_ALPHA = 0.1  # weight of the newest residual in the residual variance
+Z_THRESHOLD = 3.0
+WARMUP = 24  # observations before z-scores are trusted
+MIN_LOG_STD = 0.005  # numeric floor only (~0.5%); the spread comes from the residuals
+WARMUP_DROP_RATIO = 0.5
+RING_SIZE = 48
+HOURS_PER_WEEK = 168
+
+
+def _bucket(at):
+    return at.weekday() * 24 + at.hour
+
+
+def _reset(state):
+    state.count = 0
+    state.ewma_mean = state.ewma_var = state.trend = 0.0
+    state.seasonal = []
+    state.last_observed_at = None
+
+
+def observe(state, value, at):
+    """
+    Score `value` against a MetricStreamState, then fold it into the state.
+    O(1) per observation, Holt-Winters style on log1p(value): the forecast is
+    level + trend * hours since the last point + the hour-of-week offset, so a
+    steadily growing table is tracked by the level and trend instead of
+    lagging behind week-old seasonal values. The z-score uses the EWMA
+    variance of the forecast residuals. Until WARMUP points have been seen
+    only drops of more than 50% are flagged, matching the old 7-day-average
+    rule. Returns (is_anomaly, direction, expected) where direction is
+    "spike", "drop" or None and expected is in raw units. The caller saves
+    the state.
+    """
+    if state.count and state.last_observed_at is None:
+        # State written by the old raw-unit detector; relearn from scratch
+        _reset(state)
+
+    value = float(value)
+    y = math.log1p(max(value, 0.0))
+    bucket = _bucket(at)
+    seasonal = list(state.seasonal) if len(state.seasonal) == HOURS_PER_WEEK else [None] * HOURS_PER_WEEK
+    offset = seasonal[bucket] or 0.0
+    hours = 0.0
+    if state.last_observed_at is not None:
+        hours = max((at - state.last_observed_at).total_seconds() / 3600, 0.0)
+
+    level = state.ewma_mean + state.trend * hours
+    forecast = level + offset
+    expected = math.expm1(forecast)
+
+    is_anomaly = False
+    learned = y
+    if state.count >= WARMUP:
+        std = max(math.sqrt(state.ewma_var), MIN_LOG_STD)
+        is_anomaly = abs(y - forecast) / std > Z_THRESHOLD
+        # Learn from a clipped value so one outlier doesn't mask the next
+        learned = min(max(y, forecast - Z_THRESHOLD * std), forecast + Z_THRESHOLD * std)
+    elif state.count > 0 and expected > 0:
+        is_anomaly = (expected - value) / expected > WARMUP_DROP_RATIO
+
+    direction = None
+    if is_anomaly:
+        direction = "spike" if value > expected else "drop"
+
+    # --- Update ---
+    if state.count == 0:
+        state.ewma_mean = learned
+        state.trend = 0.0
+        state.ewma_var = 0.0
+    else:
+        residual = learned - forecast
+        state.ewma_var = (1 - VAR_ALPHA) * state.ewma_var + VAR_ALPHA * residual * residual
+        new_level = level + LEVEL_ALPHA * (learned - offset - level)
+        if hours > 0:
+            state.trend += TREND_BETA * ((new_level - state.ewma_mean) / hours - state.trend)
+        state.ewma_mean = new_level
+
+    if seasonal[bucket] is None:
+        seasonal[bucket] = 0.0
+    seasonal[bucket] += SEASONAL_ALPHA * (learned - state.ewma_mean - seasonal[bucket])
+    state.seasonal = seasonal
+
+    recent = list(state.recent)
+    if len(recent) < RING_SIZE:
+        recent.append(value)
+        state.recent_pos = len(recent) % RING_SIZE
+    else:
+        recent[state.recent_pos] = value
+        state.recent_pos = (state.recent_pos + 1) % RING_SIZE
+    state.recent = recent
+
+    state.last_observed_at = at
+    state.count += 1
+    return is_anomaly, direction, expected
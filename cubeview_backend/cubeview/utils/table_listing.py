@@ -0,0 +1,136 @@
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, Q, Subquery, Window
+
+from ..models import DataTable, DataTableTag
+from .fast_serialize import TABLE_FIELDS, group_pairs
+
+# ?sort= values -> ordering; tables never checked sort after checked ones
+SORTS = {
+    "name": F("name").asc(),
+    "-name": F("name").desc(),
+    "health_score": F("health_snapshot__health_score").asc(nulls_last=True),
+    "-health_score": F("health_snapshot__health_score").desc(nulls_last=True),
+    "last_checked": F("health_snapshot__last_run_at").asc(nulls_last=True),
+    "-last_checked": F("health_snapshot__last_run_at").desc(nulls_last=True),
+    "last_updated": F("last_updated").asc(),
+    "-last_updated": F("last_updated").desc(),
+    "ongoing_incidents": F("health_snapshot__ongoing_incidents").asc(nulls_last=True),
+    "-ongoing_incidents": F("health_snapshot__ongoing_incidents").desc(nulls_last=True),
+}
+DEFAULT_SORT = "name"
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def filter_tables(tables, params):
+    """
+    Narrow by ?q= (name/description), ?tag=, ?source=, ?min_health=,
+    ?max_health= and ?has_incidents=true. The tag filter is a subquery so the
+    aggregated tag list still holds every tag of a matching table.
+    """
+    q = params.get("q", "").strip()
+    if q:
+        tables = tables.filter(Q(name__icontains=q) | Q(description__icontains=q))
+    tag = params.get("tag")
+    if tag:
+        tables = tables.filter(id__in=Subquery(DataTableTag.objects.filter(tag__name=tag).values("table_id")))
+    source = params.get("source")
+    if source:
+        tables = tables.filter(source__iexact=source)
+    min_health = _float(params.get("min_health"))
+    if min_health is not None:
+        tables = tables.filter(health_snapshot__health_score__gte=min_health)
+    max_health = _float(params.get("max_health"))
+    if max_health is not None:
+        tables = tables.filter(health_snapshot__health_score__lte=max_health)
+    if params.get("has_incidents") in ("1", "true", "True"):
+        tables = tables.filter(health_snapshot__ongoing_incidents__gt=0)
+    return tables
+
+
+def _page(params):
+    """(offset, limit) when ?page= / ?page_size= ask for a page, else None."""
+    if "page" not in params and "page_size" not in params:
+        return None
+    try:
+        size = int(params.get("page_size", settings.TABLE_PAGE_SIZE))
+        page = int(params.get("page", 1))
+    except (TypeError, ValueError):
+        size, page = settings.TABLE_PAGE_SIZE, 1
+    size = max(1, min(size, settings.TABLE_MAX_PAGE_SIZE))
+    page = max(page, 1)
+    return (page - 1) * size, size
+
+
+def list_tables(user, conn, params):
+    """
+    Table listing rows (TABLE_FIELDS plus "tags") for a connection.
+
+    On PostgreSQL this is a single query: tags are folded in with ArrayAgg,
+    health comes from the joined snapshot, and the total for a page is a
+    COUNT(*) OVER () window on the same statement. Returns (rows, total);
+    total is None when no page was requested.
+    """
+    matching = filter_tables(DataTable.objects.filter(user=user, connection=conn), params)
+    ordering = SORTS.get(params.get("sort"), SORTS[DEFAULT_SORT])
+    tables = matching.order_by(ordering, "id")
+    page = _page(params)
+
+    if connection.vendor != "postgresql":
+        return _list_tables_fallback(tables, page)
+
+    from django.contrib.postgres.aggregates import ArrayAgg
+
+    tables = tables.annotate(
+        tag_names=ArrayAgg(
+            "datatabletag__tag__name",
+            distinct=True,
+            ordering="datatabletag__tag__name",
+            filter=Q(datatabletag__isnull=False),
+        )
+    )
+    paths = [*TABLE_FIELDS.paths, "tag_names"]
+    if page:
+        tables = tables.annotate(total=Window(Count("id")))
+        paths.append("total")
+    values_list = tables.values_list(*paths)
+    if page:
+        offset, limit = page
+        values_list = values_list[offset:offset + limit]
+
+    rows, total = [], None
+    for values in values_list:
+        row = TABLE_FIELDS.row(values[: len(TABLE_FIELDS.paths)])
+        row["tags"] = values[len(TABLE_FIELDS.paths)] or []
+        if page:
+            total = values[-1]
+        rows.append(row)
+
+    if page and total is None:
+        # Past the last page (or nothing matched); the window had no row to ride on
+        total = matching.count() if offset else 0
+    return rows, total
+
+
+def _list_tables_fallback(tables, page):
+    """Two flat queries for databases without ArrayAgg (local SQLite)."""
+    total = None
+    if page:
+        offset, limit = page
+        total = tables.count()
+        tables = tables[offset:offset + limit]
+    rows = TABLE_FIELDS.serialize(tables)
+    tags = group_pairs(
+        DataTableTag.objects.filter(table_id__in=[row["id"] for row in rows])
+        .order_by("tag__name")
+        .values_list("table_id", "tag__name")
+    )
+    for row in rows:
+        row["tags"] = tags.get(row["id"], [])
+    return rows, total
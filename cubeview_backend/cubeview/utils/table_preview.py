@@ -0,0 +1,154 @@
+import json
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from psycopg2 import sql
+
+from .source_connections import acquire, release
+
+# ?filter=<column>:<op>:<value> operators; values are always bound parameters
+FILTER_OPS = {
+    "eq": "=",
+    "ne": "<>",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+    "like": "LIKE",
+    "ilike": "ILIKE",
+    "in": "IN",
+    "is_null": "IS NULL",
+    "not_null": "IS NOT NULL",
+}
+NO_VALUE_OPS = {"is_null", "not_null"}
+TEXT_OPS = {"like", "ilike"}
+
+
+class PreviewEncoder(DjangoJSONEncoder):
+    """Source rows can hold anything; bytes become hex and unknown types their text form."""
+
+    def default(self, o):
+        if isinstance(o, (bytes, memoryview)):
+            return bytes(o).hex()
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def parse_filters(raw_filters, known_columns):
+    """[(column, op, value)] from `column:op:value` strings, checked against known columns."""
+    filters = []
+    for raw in raw_filters:
+        parts = raw.split(":", 2)
+        if len(parts) < 2:
+            raise ValueError(f"Bad filter '{raw}', expected column:op:value.")
+        column, op = parts[0], parts[1]
+        value = parts[2] if len(parts) == 3 else None
+        if column not in known_columns:
+            raise ValueError(f"Unknown column '{column}'.")
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unknown operator '{op}'; use one of {', '.join(FILTER_OPS)}.")
+        if op not in NO_VALUE_OPS and value is None:
+            raise ValueError(f"Operator '{op}' needs a value.")
+        filters.append((column, op, value))
+    return filters
+
+
+def build_preview_query(table_name, columns, filters, limit):
+    """SELECT with projection, filters and LIMIT pushed down to the source; limit + 1 detects truncation."""
+    conditions, params = [], []
+    for column, op, value in filters:
+        target = sql.Identifier(column)
+        if op in TEXT_OPS:
+            target = sql.SQL("{}::text").format(target)
+        if op in NO_VALUE_OPS:
+            conditions.append(sql.SQL("{} " + FILTER_OPS[op]).format(target))
+        elif op == "in":
+            conditions.append(sql.SQL("{} IN %s").format(target))
+            params.append(tuple(value.split(",")))
+        else:
+            conditions.append(sql.SQL("{} " + FILTER_OPS[op] + " %s").format(target))
+            params.append(value)
+
+    query = sql.SQL("SELECT {} FROM {}").format(
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+        sql.Identifier("public", table_name),
+    )
+    if conditions:
+        query = sql.SQL("{} WHERE {}").format(query, sql.SQL(" AND ").join(conditions))
+    query = sql.SQL("{} LIMIT %s").format(query)
+    params.append(limit + 1)
+    return query, params
+
+
+def open_preview(db_conn, table_name, columns, filters, limit):
+    """
+    Borrow a pooled source connection and declare a server-side (named) cursor
+    for the preview in a read-only transaction. Done eagerly so bad filters
+    fail before the response starts; returns (conn, cursor).
+    """
+    conn = acquire(db_conn)
+    try:
+        with conn.cursor() as setup:
+            setup.execute("SET TRANSACTION READ ONLY")
+            setup.execute("SET LOCAL statement_timeout = %s", [settings.PREVIEW_STATEMENT_TIMEOUT_MS])
+        cursor = conn.cursor(name=f"preview_{uuid.uuid4().hex}")
+        cursor.itersize = settings.PREVIEW_FETCH_SIZE
+        query, params = build_preview_query(table_name, columns, filters, limit)
+        cursor.execute(query, params)
+        return conn, cursor
+    except Exception:
+        release(conn)
+        raise
+
+
+class PreviewStream:
+    """
+    NDJSON lines, one object per row, fetched `itersize` rows at a time,
+    stopping at `limit` rows or before `max_bytes`. The last line is
+    {"_meta": {...}} saying how many rows were sent and why it stopped.
+
+    StreamingHttpResponse calls close() when the response is closed, even if
+    iteration never started (client gone before the first byte), so the
+    cursor and pooled connection are always released there.
+    """
+
+    def __init__(self, conn, cursor, columns, limit, max_bytes):
+        self.conn = conn
+        self.cursor = cursor
+        self.columns = columns
+        self.limit = limit
+        self.max_bytes = max_bytes
+        self.closed = False
+
+    def __iter__(self):
+        sent = size = 0
+        stopped = None
+        try:
+            for record in self.cursor:
+                if sent >= self.limit:
+                    stopped = "row_limit"
+                    break
+                line = json.dumps(dict(zip(self.columns, record)), cls=PreviewEncoder) + "\n"
+                line_bytes = len(line.encode())
+                if size + line_bytes > self.max_bytes:
+                    stopped = "byte_limit"
+                    break
+                size += line_bytes
+                sent += 1
+                yield line
+            yield json.dumps({"_meta": {"rows": sent, "bytes": size, "truncated": stopped is not None, "stopped_by": stopped}}) + "\n"
+        finally:
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.cursor.close()
+        except Exception:
+            pass
+        release(self.conn)
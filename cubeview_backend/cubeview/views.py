@@ -5,29 +5,35 @@ import os
 import re
 import traceback
 from datetime import timedelta
+from urllib.parse import urlsplit
 
 # Django
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Avg, Count, Q
-from django.db.models.functions import TruncDate
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Q, Subquery, Sum
+from django.http import HttpRequest, QueryDict, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import Resolver404, resolve
 from django.utils import timezone
 from django.utils.timezone import now
 import requests
-from .ml.utils import detect_anomalies  # ✅ Import from updated utils
-from .utils.constants import HEALTH_SCORE_WEIGHTS
+from .ml.streaming import score_streaming
+from .ml.utils import anomaly_root_cause, score_anomalies  # ✅ Import from updated utils
+from .utils import rollups
+from .utils.constants import HEALTH_PASS_THRESHOLD, HEALTH_SCORE_WEIGHTS
 
 
 # REST Framework
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 # Third-Party
 import psycopg2
+from psycopg2.pool import PoolError
 
 # Local App: Models
 from .models import (
@@ -45,6 +51,7 @@ from .models import (
     Tag,
     DataTableTag,
     DataQualityRule,
+    TableHealthSnapshot,
 )
 
 # Local App: Serializers
@@ -63,14 +70,24 @@ from .serializers import (
 
 # Local App: Utils
 
+from .utils.cache import cached_user_view, invalidate_user
+from .utils.catalog_search import search_catalog, set_documentation, sync_columns
 from .utils.check_data_quality import run_data_quality_checks
+from .utils.health_snapshot import COUNT_FIELDS, pass_share, refresh_ongoing_incidents
+from .utils.fast_serialize import (
+    INCIDENT_FIELDS,
+    INCIDENT_LIST_FIELDS,
+    RULE_FIELDS,
+    group_pairs,
+)
+from .utils.pagination import KeysetPagination
+from .utils.source_connections import source_connection
+from .utils.table_listing import list_tables
+from .utils.table_preview import PreviewStream, open_preview, parse_filters
 from .utils.generate_documentation import (
     generate_table_documentation as generate_doc_for_table,
 )
 
-# ML
-from .ml.utils import detect_anomalies
-
 
 User = get_user_model()
 
@@ -80,8 +97,9 @@ def get_active_connection(user):
     return UserDatabaseConnection.objects.filter(user=user, is_active=True).first()
 
 
-class IncidentPagination(PageNumberPagination):
-    page_size = 20
+def start_of_day(day):
+    # Compare raw timestamps rather than `__date` so the (table, time) indexes apply
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
 
 
 # ---------------- AUTH ----------------
@@ -114,11 +132,11 @@ class CreateUserView(generics.CreateAPIView):
 @permission_classes([IsAuthenticated])
 def get_user_incidents(request):
     user = request.user
-    incidents = Incident.objects.filter(related_table__user=user).order_by(
-        "-created_at"
-    )
-    serializer = IncidentSerializer(incidents, many=True)
-    return Response(serializer.data)
+    incidents = Incident.objects.filter(related_table__user=user)
+
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(INCIDENT_FIELDS.values(incidents), request)
+    return paginator.get_paginated_response(INCIDENT_FIELDS.from_values(page))
 
 
 @api_view(["POST"])
@@ -132,14 +150,7 @@ def run_quality_checks(request):
 # ---------------- DASHBOARD ----------------
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def dashboard_data(request):
-    user = request.user
-    conn = get_active_connection(user)
-    if not conn:
-        return Response({"error": "No active connection found."}, status=404)
-
+def build_dashboard_data(user, conn, summary=None):
     total_tables = DataTable.objects.filter(user=user, connection=conn).count()
     total_fields = ColumnMetadata.objects.filter(
         table__user=user, table__connection=conn
@@ -147,11 +158,9 @@ def dashboard_data(request):
     total_sources = UserDatabaseConnection.objects.filter(user=user).count()
     total_jobs = 0  # Future: add job tracking
 
-    checks = DataQualityCheck.objects.filter(table__user=user, table__connection=conn)
-    last_check = checks.order_by("-run_time").first()
-    avg_pass = (
-        checks.aggregate(Avg("passed_percentage")).get("passed_percentage__avg", 0) or 0
-    )
+    # One row per table instead of the whole check history
+    quality = summary or _snapshot_summary(user, conn)
+    avg_pass = quality["passed"] / quality["checks"] if quality["checks"] else 0
 
     recent_tags = (
         Tag.objects.filter(
@@ -161,20 +170,60 @@ def dashboard_data(request):
         .distinct()[:5]
     )
 
+    return {
+        "connected_tables": total_tables,
+        "data_overview": {
+            "sources": total_sources,
+            "tables": total_tables,
+            "fields": total_fields,
+            "jobs": total_jobs,
+        },
+        "data_quality": {
+            "last_check": quality["last_check"],
+            "avg_pass": avg_pass,
+        },
+        "recent_tags": list(recent_tags),
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@cached_user_view("dashboard_data")
+def dashboard_data(request):
+    user = request.user
+    conn = get_active_connection(user)
+    if not conn:
+        return Response({"error": "No active connection found."}, status=404)
+
+    return Response(build_dashboard_data(user, conn))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@cached_user_view("dashboard_bundle")
+def dashboard_bundle(request):
+    """
+    Everything the dashboard page shows in one round trip: the connection is
+    resolved once and the snapshot aggregate is shared by the overview and the
+    health score.
+    """
+    user = request.user
+    conn = get_active_connection(user)
+    if not conn:
+        return Response({"error": "No active connection found."}, status=404)
+
+    try:
+        days = _days_param(request, default=7)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    summary = _snapshot_summary(user, conn)
+
     return Response(
         {
-            "connected_tables": total_tables,
-            "data_overview": {
-                "sources": total_sources,
-                "tables": total_tables,
-                "fields": total_fields,
-                "jobs": total_jobs,
-            },
-            "data_quality": {
-                "last_check": last_check.run_time if last_check else None,
-                "avg_pass": avg_pass,
-            },
-            "recent_tags": list(recent_tags),
+            "dashboard_data": build_dashboard_data(user, conn, summary),
+            "health_score": compute_health_score(user, conn, summary=summary),
+            "incident_summary": build_incident_summary(user, conn),
+            "recent_incidents": build_recent_incidents(user, days),
         }
     )
 
@@ -225,6 +274,9 @@ def connect_db(request):
             },
         )
 
+        # The active connection scopes every cached dashboard payload
+        invalidate_user(user.id)
+
         return Response(
             {"message": "Database connected and saved successfully!"}, status=200
         )
@@ -291,7 +343,6 @@ def collect_metadata(request):
                 dt.last_updated = timezone.now()
                 dt.save()
 
-            ColumnMetadata.objects.filter(table=dt).delete()
             cursor.execute(
                 """
                 SELECT column_name, data_type
@@ -302,13 +353,12 @@ def collect_metadata(request):
             )
             columns = cursor.fetchall()
 
-            for column_name, data_type in columns:
-                ColumnMetadata.objects.create(
-                    table=dt, name=column_name, data_type=data_type
-                )
+            # Re-indexes for search only when the columns changed
+            sync_columns(dt, columns)
 
         cursor.close()
         conn.close()
+        invalidate_user(user.id)
         return Response({"message": "Metadata synced with DB."})
 
     except UserDatabaseConnection.DoesNotExist:
@@ -359,50 +409,115 @@ def dashboard_overview(request):
     )
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def health_score(request):
-    user = request.user
-    conn = get_active_connection(user)
+def _days_param(request, default=None):
+    """?days= as a positive int (or `default` when absent); ValueError otherwise."""
+    raw = request.GET.get("days")
+    if raw in (None, ""):
+        return default
+    try:
+        days = int(raw)
+    except ValueError:
+        raise ValueError("days must be a whole number.")
+    if days < 1:
+        raise ValueError("days must be at least 1.")
+    return days
+
+
+def _snapshot_summary(user, conn):
+    """
+    Per-type pass shares (checks >= HEALTH_PASS_THRESHOLD, all time) from the
+    table snapshots' lifetime counts, plus check totals, in one query; feeds
+    both the health score and the dashboard overview.
+    """
+    counts = {}
+    for check_type, (checks_field, passed_field) in COUNT_FIELDS.items():
+        counts[f"{check_type}_checks"] = Sum(checks_field)
+        counts[f"{check_type}_passed"] = Sum(passed_field)
+
+    summary = TableHealthSnapshot.objects.filter(
+        table__user=user, table__connection=conn
+    ).aggregate(
+        checked=Count("id", filter=Q(last_run_at__isnull=False)),
+        ongoing=Sum("ongoing_incidents", filter=Q(last_run_at__isnull=False)),
+        last_check=Max("last_run_at"),
+        checks=Sum("check_count"),
+        passed=Sum("passed_percentage_sum"),
+        **counts,
+    )
+    for check_type in HEALTH_SCORE_WEIGHTS:
+        summary[check_type] = pass_share(summary[f"{check_type}_passed"] or 0, summary[f"{check_type}_checks"] or 0)
+    return summary
+
+
+def _windowed_type_scores(user, conn, since):
+    """
+    Per-type share of checks scoring >= HEALTH_PASS_THRESHOLD since `since`
+    (the snapshot metric, over the window), plus the ongoing incident count,
+    in one conditional-aggregation query.
+    """
+    counts = {}
+    for check_type in HEALTH_SCORE_WEIGHTS:
+        counts[f"{check_type}_passed"] = Count(
+            "id", filter=Q(check_type=check_type, passed_percentage__gte=HEALTH_PASS_THRESHOLD)
+        )
+        counts[f"{check_type}_total"] = Count("id", filter=Q(check_type=check_type))
 
-    if not conn:
-        return Response({"error": "No active DB connection."}, status=404)
+    ongoing = (
+        Incident.objects.filter(
+            related_table__user=user, related_table__connection=conn, status="ongoing"
+        )
+        .order_by()
+        .values("related_table__user")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    rows = list(
+        DataQualityCheck.objects.filter(
+            table__user=user, table__connection=conn, run_time__gte=since
+        )
+        .order_by()
+        .values("table__user")
+        .annotate(checked=Count("id"), ongoing=Subquery(ongoing), **counts)[:1]
+    )
+    if not rows:
+        return {"checked": 0}
 
-    # Fetch all checks for current user and connection
-    checks = DataQualityCheck.objects.filter(table__user=user, table__connection=conn)
+    row = rows[0]
+    summary = {"checked": row["checked"], "ongoing": row["ongoing"]}
+    for check_type in HEALTH_SCORE_WEIGHTS:
+        summary[check_type] = pass_share(row[f"{check_type}_passed"], row[f"{check_type}_total"])
+    return summary
 
-    if not checks.exists():
-        return Response({"score": 100, "status": "No checks run yet."})
+
+def compute_health_score(user, conn, days=None, summary=None):
+    """
+    Weighted health for a connection: the share of checks per type that
+    passed, over all time (from the snapshots) or the last `days`. Pass an existing `_snapshot_summary` to skip the query.
+    """
+    if days:
+        summary = _windowed_type_scores(user, conn, timezone.now() - timedelta(days=days))
+    elif summary is None:
+        summary = _snapshot_summary(user, conn)
+
+    if not summary["checked"]:
+        return {"score": 100, "status": "No checks run yet."}
 
     total_score = 0
     total_weight = 0
 
     for check_type, weight in HEALTH_SCORE_WEIGHTS.items():
-        check_group = checks.filter(check_type=check_type)
-        if not check_group.exists():
+        type_score = summary[check_type]
+        if type_score is None:
             continue
 
-        passed = check_group.filter(passed_percentage__gte=95).count()
-        total = check_group.count()
-
-        if total == 0:
-            continue  # Avoid divide-by-zero
-
-        type_score = (passed / total) * 100
-        weighted_score = type_score * weight
-
-        total_score += weighted_score
+        total_score += type_score * weight
         total_weight += weight
 
     # Normalize score by total weight to avoid underestimation
     final_score = round(total_score / total_weight) if total_weight else 0
 
     # Optional penalty for unresolved incidents
-    ongoing = Incident.objects.filter(
-        related_table__user=user,
-        related_table__connection=conn,
-        status="ongoing"
-    ).count()
+    ongoing = summary["ongoing"] or 0
 
     if ongoing:
         final_score = max(final_score - 5, 0)  # Deduct 5 points for unresolved issues
@@ -417,63 +532,76 @@ def health_score(request):
     else:
         message = "Critical data health issues detected."
 
-    return Response({
+    return {
         "score": final_score,
         "status": message,
         "ongoing_incidents": ongoing
-    })
-
-
-# ------------------ INCIDENTS ------------------
+    }
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def incident_summary(request):
+@cached_user_view("health_score")
+def health_score(request):
     user = request.user
     conn = get_active_connection(user)
-    
-    incidents = Incident.objects.filter(
-    related_table__user=user,
-    related_table__connection=conn, 
-    ).exclude(status="resolved")
 
+    if not conn:
+        return Response({"error": "No active DB connection."}, status=404)
 
-    categories = [
-        "volume",
-        "freshness",
-        "schema_drift",
-        "field_health",
-        "job_failure",
-        "custom",
-    ]
-    counts = {cat: 0 for cat in categories}
+    try:
+        days = _days_param(request)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response(compute_health_score(user, conn, days))
 
-    for i in incidents:
-        itype = (i.incident_type or "custom").strip().lower().replace(" ", "_")
 
-        if itype in counts:
-            counts[itype] += 1
-        else:
-            counts["custom"] += 1
+# ------------------ INCIDENTS ------------------
 
-    return Response(counts)
 
+INCIDENT_CATEGORIES = [
+    "volume",
+    "freshness",
+    "schema_drift",
+    "field_health",
+    "job_failure",
+    "custom",
+]
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def recent_incidents(request):
-    user = request.user
-    days = int(request.GET.get("days", 7))
-    since = timezone.now() - timedelta(days=days)
 
-    incidents = (
+def build_incident_summary(user, conn):
+    """Open incidents per category, counted by the database rather than row by row."""
+    rows = (
+        Incident.objects.filter(
+            related_table__user=user,
+            related_table__connection=conn,
+        )
+        .exclude(status="resolved")
+        .values("incident_type")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+
+    counts = {cat: 0 for cat in INCIDENT_CATEGORIES}
+    for row in rows:
+        itype = (row["incident_type"] or "custom").strip().lower().replace(" ", "_")
+        counts[itype if itype in counts else "custom"] += row["n"]
+    return counts
+
+
+def recent_incidents_queryset(user, days=7):
+    since = timezone.now() - timedelta(days=days)
+    return (
         Incident.objects.filter(related_table__user=user, created_at__gte=since)
         .select_related("related_table")
         .order_by("-created_at")[:10]
     )
 
-    data = [
+
+def build_recent_incidents(user, days=7):
+    incidents = recent_incidents_queryset(user, days)
+
+    return [
         {
             "table": i.related_table.name if i.related_table else "N/A",
             "type": i.incident_type or "Custom",
@@ -483,48 +611,49 @@ def recent_incidents(request):
         for i in incidents
     ]
 
-    return Response(data)
-
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def list_incidents(request):
+@cached_user_view("incident_summary")
+def incident_summary(request):
     user = request.user
-    status_filter = request.GET.get("status")
-    table_filter = request.GET.get("table")
-    type_filter = request.GET.get("type")
+    conn = get_active_connection(user)
+    return Response(build_incident_summary(user, conn))
 
-    incidents = Incident.objects.filter(related_table__user=user).select_related("related_table")
 
-    if status_filter:
-        incidents = incidents.filter(status=status_filter)
-    if table_filter:
-        incidents = incidents.filter(related_table__name=table_filter)
-    if type_filter:
-        incidents = incidents.filter(incident_type=type_filter)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@cached_user_view("recent_incidents")
+def recent_incidents(request):
+    try:
+        days = _days_param(request, default=7)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+    return Response(build_recent_incidents(request.user, days))
 
-    incidents = incidents.order_by("-created_at")
 
-    paginator = PageNumberPagination()
-    paginator.page_size = 10
-    result_page = paginator.paginate_queryset(incidents, request)
+def filter_incidents(user, params):
+    """The user's incidents narrowed by ?status=, ?table= and ?type=."""
+    incidents = Incident.objects.filter(related_table__user=user)
 
-    data = [
-        {
-            "id": i.id,
-            "title": i.title,
-            "status": i.status,
-            "type": i.incident_type or "Unknown",
-            "severity": i.severity,
-            "table": i.related_table.name if i.related_table else "N/A",
-            "created_at": i.created_at,
-            "description": i.description,
-            "resolved_at": i.resolved_at,
-        }
-        for i in result_page
-    ]
+    if params.get("status"):
+        incidents = incidents.filter(status=params["status"])
+    if params.get("table"):
+        incidents = incidents.filter(related_table__name=params["table"])
+    if params.get("type"):
+        incidents = incidents.filter(incident_type=params["type"])
+    return incidents
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def list_incidents(request):
+    incidents = filter_incidents(request.user, request.GET)
 
-    return paginator.get_paginated_response(data)
+    # Keyset pages on (created_at, id): constant cost however deep the user pages
+    paginator = KeysetPagination()
+    result_page = paginator.paginate_queryset(INCIDENT_LIST_FIELDS.values(incidents), request)
+    return paginator.get_paginated_response(INCIDENT_LIST_FIELDS.from_values(result_page))
 
 
 
@@ -534,7 +663,10 @@ def resolve_incident(request, pk):
     try:
         incident = Incident.objects.get(id=pk, related_table__user=request.user)
         incident.status = "resolved"
+        incident.resolved_at = timezone.now()
         incident.save()
+        refresh_ongoing_incidents([incident.related_table_id])
+        invalidate_user(request.user.id)
         return Response({"message": "Incident resolved."}, status=200)
     except Incident.DoesNotExist:
         return Response({"error": "Incident not found."}, status=404)
@@ -559,55 +691,61 @@ def incident_filter_options(request):
 
 # ------------------ TABLE VIEWS ------------------
 
+def _table_listing_response(request, keys=None):
+    """
+    Shared by both table listings: filters/sort/page come from the query string
+    (see utils.table_listing). Without ?page/?page_size the plain list is returned.
+    """
+    user = request.user
+    conn = get_active_connection(user)
+    rows, total = list_tables(user, conn, request.GET)
+    if keys:
+        rows = [{key: row[key] for key in keys} for row in rows]
+    if total is None:
+        return Response(rows)
+    return Response({"count": total, "results": rows})
+
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def fetch_user_tables(request):
-    user = request.user
-    conn = get_active_connection(user)
-    tables = DataTable.objects.filter(user=user, connection=conn).prefetch_related(
-        "datatabletag_set", "columns"
-    )
+    return _table_listing_response(request)
 
-    data = []
-    for t in tables:
-        tags = t.datatabletag_set.select_related("tag").values_list(
-            "tag__name", flat=True
-        )
-        data.append(
-            {
-                "id": t.id,
-                "name": t.name,
-                "source": t.source,
-                "description": t.description,
-                "created_at": t.created_at,
-                "last_updated": t.last_updated,
-                "tags": list(tags),
-            }
-        )
-    return Response(data)
+
+LIST_TABLE_KEYS = ("id", "name", "description", "last_updated", "tags", "health_score", "last_checked", "ongoing_incidents")
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_user_tables(request):
+    return _table_listing_response(request, LIST_TABLE_KEYS)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def catalog_search(request):
+    """
+    Ranked search over table and column names, types, descriptions, tags and
+    generated docs. ?q=, optional ?kind=table|column, ?page=, ?page_size=.
+    """
     user = request.user
     conn = get_active_connection(user)
-    tables = DataTable.objects.filter(user=user, connection=conn)
+    kind = request.GET.get("kind")
+    if kind not in (None, "", "table", "column"):
+        return Response({"error": "kind must be 'table' or 'column'."}, status=400)
 
-    data = []
-    for t in tables:
-        tags = t.datatabletag_set.values_list("tag__name", flat=True)
-        data.append(
-            {
-                "id": t.id,
-                "name": t.name,
-                "description": t.description,
-                "last_updated": t.last_updated,
-                "tags": list(tags),
-            }
-        )
-    return Response(data)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        page_size = int(request.GET.get("page_size", settings.SEARCH_PAGE_SIZE))
+    except ValueError:
+        return Response({"error": "page and page_size must be integers."}, status=400)
+    page_size = max(1, min(page_size, settings.SEARCH_MAX_PAGE_SIZE))
+
+    rows, has_more = search_catalog(
+        user, conn, request.GET.get("q", ""), kind or None,
+        offset=(page - 1) * page_size, limit=page_size,
+    )
+    return Response({"page": page, "has_more": has_more, "results": rows})
 
 
 @api_view(["GET"])
@@ -643,6 +781,53 @@ def table_detail(request, table_id):
     )
 
 
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def table_preview(request, table_id):
+    """
+    Stream sample rows from the source table as NDJSON through a server-side
+    cursor on a pooled connection. ?columns=a,b projects, repeated
+    ?filter=col:op:value filters (see FILTER_OPS), ?limit= and ?max_bytes=
+    are capped by the PREVIEW_* settings.
+    """
+    user = request.user
+    table = get_object_or_404(DataTable, id=table_id, user=user)
+    db_conn = table.connection or get_active_connection(user)
+    if not db_conn:
+        return Response({"error": "No active DB connection."}, status=404)
+
+    known = list(ColumnMetadata.objects.filter(table=table).order_by("id").values_list("name", flat=True))
+    if not known:
+        return Response({"error": "No column metadata; collect metadata first."}, status=400)
+
+    requested = [c.strip() for c in request.GET.get("columns", "").split(",") if c.strip()]
+    unknown = [c for c in requested if c not in known]
+    if unknown:
+        return Response({"error": f"Unknown columns: {', '.join(unknown)}"}, status=400)
+    columns = requested or known
+
+    try:
+        filters = parse_filters(request.GET.getlist("filter"), set(known))
+        limit = min(int(request.GET.get("limit", settings.PREVIEW_DEFAULT_ROWS)), settings.PREVIEW_MAX_ROWS)
+        max_bytes = min(int(request.GET.get("max_bytes", settings.PREVIEW_MAX_BYTES)), settings.PREVIEW_MAX_BYTES)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
+
+    try:
+        conn, cursor = open_preview(db_conn, table.name, columns, filters, max(limit, 1))
+    except PoolError:
+        return Response({"error": "Source connection pool is busy, try again."}, status=503)
+    except psycopg2.Error as e:
+        return Response({"error": str(e).strip()}, status=400)
+
+    response = StreamingHttpResponse(
+        PreviewStream(conn, cursor, columns, max(limit, 1), max_bytes),
+        content_type="application/x-ndjson",
+    )
+    response["Cache-Control"] = "no-store"
+    return response
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def table_detail_view(request, id):
@@ -687,24 +872,14 @@ def table_detail_view(request, id):
 # ------------------ DOC GENERATION ------------------
 
 
-def generate_table_documentation(table_id):
-    table = get_object_or_404(DataTable, id=table_id)
+def generate_table_documentation(table):
     db_conn = get_active_connection(table.user)
     if not db_conn:
         raise Exception("Active DB connection not found.")
 
-    conn = psycopg2.connect(
-        host=db_conn.host,
-        port=db_conn.port,
-        user=db_conn.username,
-        password=db_conn.password,
-        dbname=db_conn.database_name,
-    )
-
-    cursor = conn.cursor()
-    cursor.execute(f'SELECT * FROM "{table.name}" LIMIT 0')
-    column_names = [desc[0] for desc in cursor.description]
-    conn.close()
+    with source_connection(db_conn) as conn, conn.cursor() as cursor:
+        cursor.execute(f'SELECT * FROM "{table.name}" LIMIT 0')
+        column_names = [desc[0] for desc in cursor.description]
 
     return generate_doc_for_table(table, column_names)
 
@@ -712,8 +887,11 @@ def generate_table_documentation(table_id):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def generate_docs(request, table_id):
+    # Scoped to the caller: the docs are written into their search index
+    table = get_object_or_404(DataTable, id=table_id, user=request.user)
     try:
-        doc = generate_table_documentation(table_id)
+        doc = generate_table_documentation(table)
+        set_documentation(table.id, doc)
         return Response({"documentation": doc}, status=200)
     except Exception as e:
         traceback.print_exc()
@@ -806,9 +984,13 @@ def field_metrics(request, table_id):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@cached_user_view("incident_trend")
 def incident_trend(request):
     user = request.user
-    days = int(request.GET.get("days", 7))
+    try:
+        days = _days_param(request, default=7)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
     start_date = now().date() - timedelta(days=days)
 
     category_keys = [
@@ -820,16 +1002,8 @@ def incident_trend(request):
         "field_health",
     ]
 
-    incidents = (
-        Incident.objects.filter(
-            created_at__date__gte=start_date,
-            related_table__user=user,
-        )
-        .annotate(day=TruncDate("created_at"))
-        .values("day", "incident_type")
-        .annotate(count=Count("id"))
-        .order_by("day")
-    )
+    # Closed days come from the daily rollups, so longer windows cost the same
+    incidents = rollups.incident_trend(user, start_of_day(start_date))
 
     trend_map = {}
 
@@ -864,9 +1038,13 @@ def incident_trend(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@cached_user_view("health_score_trend")
 def health_score_trend(request):
     user = request.user
-    days = int(request.GET.get("days", 7))
+    try:
+        days = _days_param(request, default=7)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=400)
     start_date = now().date() - timedelta(days=days)
 
     db_conn = get_active_connection(user)
@@ -876,16 +1054,8 @@ def health_score_trend(request):
     # Get all tables for this user and connection
     tables = DataTable.objects.filter(user=user, connection=db_conn)
 
-    # Filter health scores from checks on these tables
-    checks = (
-        DataQualityCheck.objects.filter(
-            table__in=tables, run_time__date__gte=start_date
-        )
-        .annotate(day=TruncDate("run_time"))
-        .values("day")
-        .annotate(avg_score=Avg("passed_percentage"))
-        .order_by("day")
-    )
+    # Daily health scores: rollups for closed days, raw checks for the rest
+    checks = rollups.health_score_trend(tables, start_of_day(start_date))
 
     response_data = [
         {
@@ -907,81 +1077,94 @@ def health_score_trend(request):
 @permission_classes([IsAuthenticated])
 def run_bulk_anomaly_check(request):
     user = request.user
-    tables = DataTable.objects.filter(user=user)
+    # Features are maintained by the check runs; tables never checked score as zeros
+    tables = list(
+        DataTable.objects.filter(user=user).values_list(
+            "id",
+            "name",
+            "feature_vector__null_percent",
+            "feature_vector__volume",
+            "feature_vector__schema_change",
+        )
+    )
+
+    # One feature matrix, one vectorized predict for every table
+    features = [
+        (null_percent or 0, volume or 0, 1 if schema_changed else 0)
+        for _, _, null_percent, volume, schema_changed in tables
+    ]
+    try:
+        streamed = None
+        if settings.ANOMALY_DETECTOR == "half_space_trees":
+            streamed = score_streaming(get_active_connection(user), features)
+        # Fall back to the batch model until the streaming detector is warm
+        table_ids = [table_id for table_id, *_ in tables]
+        flags, scores = streamed if streamed is not None else score_anomalies(features, table_ids=table_ids)
+    except Exception as e:
+        return Response(
+            {"error": f"⚠️ ML model failed to load or predict: {str(e)}"}, status=500
+        )
+
+    history = []
+    incidents = []
     results = []
     anomalies = 0
 
-    for table in tables:
-        # Extract feature values
-        null_percent = getattr(table, "null_percent", 0)
-        volume = getattr(table, "row_count", 0)
-        schema_change = 1 if getattr(table, "schema_changed_recently", False) else 0
-
-        # Save metrics to MetricHistory
+    for (table_id, name, _, _, _), (null_percent, volume, schema_change), is_anomaly, score in zip(
+        tables, features, flags, scores
+    ):
         for metric_type, value in [
             ("null_percent", null_percent),
             ("volume", volume),
             ("schema_change", schema_change),
+            ("ml_anomaly", float(is_anomaly)),
         ]:
-            MetricHistory.objects.create(
-                table=table,
-                column=None,
-                metric_type=metric_type,
-                value=value,
-            )
-
-        try:
-            is_anomaly = detect_anomalies(null_percent, volume, schema_change)
-        except Exception as e:
-            return Response(
-                {"error": f"⚠️ ML model failed to load or predict: {str(e)}"}, status=500
+            history.append(
+                MetricHistory(
+                    table_id=table_id,
+                    column=None,
+                    metric_type=metric_type,
+                    value=value,
+                )
             )
 
-        # Save anomaly result
-        MetricHistory.objects.create(
-            table=table,
-            column=None,
-            metric_type="ml_anomaly",
-            value=float(is_anomaly),
-        )
-
         # If anomaly, create Incident
         if is_anomaly:
             anomalies += 1
 
-            # Determine root cause
-            if schema_change:
-                incident_type = "schema_drift"
-            elif volume < 100:
-                incident_type = "volume"
-            elif null_percent > 20:
-                incident_type = "freshness"
-            else:
-                incident_type = "field_health"
-
-            Incident.objects.create(
-                related_table=table,
-                incident_type=incident_type,
-                severity="high",
-                status="ongoing",
-                title=f"ML Anomaly Detected in {table.name}",
-                description=(
-                    f"Anomaly detected in table '{table.name}'\n"
-                    f"Root cause: {incident_type.replace('_', ' ').title()}"
-                ),
+            incident_type = anomaly_root_cause(null_percent, volume, schema_change)
+
+            incidents.append(
+                Incident(
+                    related_table_id=table_id,
+                    incident_type=incident_type,
+                    severity="high",
+                    status="ongoing",
+                    title=f"ML Anomaly Detected in {name}",
+                    description=(
+                        f"Anomaly detected in table '{name}'\n"
+                        f"Root cause: {incident_type.replace('_', ' ').title()}"
+                    ),
+                )
             )
 
-        # Collect result
         results.append(
             {
-                "table_name": table.name,
+                "table_name": name,
                 "anomaly": is_anomaly,
+                "score": score,
                 "null_percent": null_percent,
                 "volume": volume,
                 "schema_change": schema_change,
             }
         )
 
+    with transaction.atomic():
+        MetricHistory.objects.bulk_create(history, batch_size=1000)
+        Incident.objects.bulk_create(incidents, batch_size=1000)
+        refresh_ongoing_incidents({incident.related_table_id for incident in incidents})
+    invalidate_user(user.id)
+
     return Response(
         {
             "total_checked": len(tables),
@@ -1013,8 +1196,22 @@ class DataQualityRuleListCreateView(generics.ListCreateAPIView):
             "-created_at"
         )
 
+    def list(self, request, *args, **kwargs):
+        # Fast path: flat rows plus depends_on ids from the M2M table in one query
+        rules = self.get_queryset()
+        depends_on = group_pairs(
+            DataQualityRule.depends_on.through.objects.filter(
+                from_dataqualityrule__in=rules
+            ).values_list("from_dataqualityrule_id", "to_dataqualityrule_id")
+        )
+        data = RULE_FIELDS.serialize(rules)
+        for row in data:
+            row["depends_on"] = depends_on.get(row["id"], [])
+        return Response(data)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+        invalidate_user(self.request.user.id)
 
 
 class DataQualityRuleDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -1024,6 +1221,14 @@ class DataQualityRuleDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return DataQualityRule.objects.filter(user=self.request.user)
 
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_user(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_user(self.request.user.id)
+
 
 GEMINI_API_KEY = os.getenv("API_KEY")
 MODEL = "gemini-2.5-pro"
@@ -1116,3 +1321,75 @@ Rules:
             },
         }
     )
+
+
+# ------------------ BATCH ------------------
+
+# Read-only routes (by URL name) that may be bundled into one /batch/ call
+BATCH_VIEWS = {
+    "dashboard-data",
+    "dashboard-bundle",
+    "health-score",
+    "incident-summary",
+    "recent-incidents",
+    "incident-trend",
+    "health-score-trend",
+    "fetch-user-tables",
+    "list-incidents",
+    "report-summary",
+}
+MAX_BATCH_SIZE = 20
+CONDITIONAL_HEADERS = {"HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE", "HTTP_IF_MATCH", "HTTP_IF_UNMODIFIED_SINCE"}
+
+
+def _sub_request(request, path, query):
+    """
+    A GET request for `path` that reuses the caller's already-authenticated
+    user. Conditional headers are dropped: they were meant for the batch
+    POST, and a 304 would leave the sub-response without data.
+    """
+    sub = HttpRequest()
+    sub.method = "GET"
+    sub.path = sub.path_info = path
+    sub.META = {
+        key: value for key, value in request.META.items()
+        if key not in CONDITIONAL_HEADERS
+    }
+    sub.META.update(REQUEST_METHOD="GET", QUERY_STRING=query)
+    sub.GET = QueryDict(query)
+    # DRF skips its authenticators for forced users, so JWT is only checked once
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def batch(request):
+    """
+    Run several read endpoints in one round trip.
+    Body: {"requests": ["/api/health-score/", "/api/incident-trend/?days=30", ...]}
+    Returns {path: {"status": ..., "data": ...}} in request order.
+    """
+    paths = request.data.get("requests")
+    if not isinstance(paths, list) or not paths:
+        return Response({"error": "requests must be a non-empty list of paths."}, status=400)
+    if len(paths) > MAX_BATCH_SIZE:
+        return Response({"error": f"At most {MAX_BATCH_SIZE} requests per batch."}, status=400)
+
+    results = {}
+    for raw in paths:
+        url = urlsplit(str(raw))
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            results[raw] = {"status": 404, "data": {"error": "Not found."}}
+            continue
+        if match.url_name not in BATCH_VIEWS:
+            results[raw] = {"status": 400, "data": {"error": "Endpoint not allowed in a batch."}}
+            continue
+
+        response = match.func(_sub_request(request, url.path, url.query), *match.args, **match.kwargs)
+        results[raw] = {"status": response.status_code, "data": getattr(response, "data", None)}
+
+    return Response(results)
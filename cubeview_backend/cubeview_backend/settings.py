@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # catalog search (tsvector + pg_trgm indexes)
 
     'rest_framework',
     'rest_framework.authtoken',
@@ -67,7 +68,12 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # orjson-backed when `orjson` is installed, plain DRF JSON otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'cubeview.utils.fast_serialize.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 SIMPLE_JWT = {
@@ -113,6 +119,34 @@ DATABASES = {
     )
 }
 
+# ========================
+# CACHE
+# ========================
+
+# "file" (shared by the workers and cron jobs of one host), "redis" (shared
+# across hosts; use it when running more than one) or "locmem" (per process;
+# view caching and report precompute are then switched off, since
+# invalidation from another process could never reach it)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "cubeview",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv("CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "3600")),
+    }
+}
+
 # ========================
 # PASSWORD VALIDATION
 # ========================
@@ -140,6 +174,61 @@ USE_TZ = True
 STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ========================
+# DATA QUALITY RULES
+# ========================
+
+# "database" pushes regex rules to the source DB; "sampled" evaluates them locally
+REGEX_RULE_EVALUATION = os.getenv("REGEX_RULE_EVALUATION", "database")
+REGEX_RULE_SAMPLE_SIZE = int(os.getenv("REGEX_RULE_SAMPLE_SIZE", "100000"))
+REGEX_RULE_FETCH_SIZE = int(os.getenv("REGEX_RULE_FETCH_SIZE", "10000"))
+REGEX_RULE_WORKERS = int(os.getenv("REGEX_RULE_WORKERS", "1"))
+
+# ========================
+# ANOMALY DETECTION
+# ========================
+
+# "isolation_forest" uses the registry model; "half_space_trees" the streaming detector
+ANOMALY_DETECTOR = os.getenv("ANOMALY_DETECTOR", "isolation_forest")
+
+# ========================
+# HISTORY STORAGE
+# ========================
+
+# MetricHistory / DataQualityCheck range partitions: "month" or "day"
+HISTORY_PARTITION_INTERVAL = os.getenv("HISTORY_PARTITION_INTERVAL", "month")
+HISTORY_PARTITIONS_AHEAD = int(os.getenv("HISTORY_PARTITIONS_AHEAD", "2"))
+# 0 keeps history forever; otherwise whole partitions older than this are dropped
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "0"))
+# Raw check/metric/rule rows older than this are pruned once rolled up (0 keeps them)
+RAW_HISTORY_RETENTION_DAYS = int(os.getenv("RAW_HISTORY_RETENTION_DAYS", "0"))
+
+# ========================
+# PAGINATION
+# ========================
+
+# Incident lists page by a (created_at, id) cursor; ?page_size= is capped at the max
+INCIDENT_PAGE_SIZE = int(os.getenv("INCIDENT_PAGE_SIZE", "10"))
+INCIDENT_MAX_PAGE_SIZE = int(os.getenv("INCIDENT_MAX_PAGE_SIZE", "100"))
+# Table listings page only when ?page= or ?page_size= is given
+TABLE_PAGE_SIZE = int(os.getenv("TABLE_PAGE_SIZE", "50"))
+TABLE_MAX_PAGE_SIZE = int(os.getenv("TABLE_MAX_PAGE_SIZE", "500"))
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "20"))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "50"))
+
+# ========================
+# SOURCE DATABASES
+# ========================
+
+# Pooled connections per source DB, per worker process
+SOURCE_POOL_MAX_CONNECTIONS = int(os.getenv("SOURCE_POOL_MAX_CONNECTIONS", "4"))
+# Table preview: rows stream through a server-side cursor within these budgets
+PREVIEW_DEFAULT_ROWS = int(os.getenv("PREVIEW_DEFAULT_ROWS", "100"))
+PREVIEW_MAX_ROWS = int(os.getenv("PREVIEW_MAX_ROWS", "5000"))
+PREVIEW_MAX_BYTES = int(os.getenv("PREVIEW_MAX_BYTES", str(2 * 1024 * 1024)))
+PREVIEW_FETCH_SIZE = int(os.getenv("PREVIEW_FETCH_SIZE", "500"))
+PREVIEW_STATEMENT_TIMEOUT_MS = int(os.getenv("PREVIEW_STATEMENT_TIMEOUT_MS", "5000"))
+
 # ========================
 # CORS (CONTROL THIS IN PROD)
 # ========================